@@ -9,26 +9,339 @@ Revisions:
 
 '''
 import requests
+from requests.adapters import HTTPAdapter
 import datetime
 import json
 import logging
-import ruamel.yaml as yaml
+import random
 import re
+import sys
+import time
+from collections import OrderedDict
+from Report_Writer import ReportWriter, dumps
 
 __version__ = '1.0'
 __author__ = 'A10 Networks'
 
 
+# seconds a cached response stays fresh, anything not listed here uses DEFAULT_CACHE_TTL
+CACHE_TTLS = {
+    # sampled on purpose, every call has to reach the device
+    'slb/perf/stats': 0,
+    'system/data-cpu/stats': 0,
+    'system/control-cpu/stats': 0,
+    # clideploy commands are keyed as clideploy:<command>
+    'clideploy:show cpu history': 0,
+}
+DEFAULT_CACHE_TTL = 300
+
+# endpoints that only exist in the shared partition, so the active partition is left out of their cache key
+SHARED_ONLY_ENDPOINTS = ('ip/anomaly-drop/stats', 'system/session/stats')
+
+SHARED_PARTITION = {'active-partition': {'curr_part_name': 'shared'}}
+
+# responses that mean the device is busy or restarting its API service, worth another try
+RETRY_STATUSES = (502, 503, 504)
+
+
+class AcosError(Exception):
+    """Raised instead of exiting when a call to a device fails, so only that device is given up on"""
+    def __init__(self, device, message):
+        Exception.__init__(self, message)
+        self.device = device
+
+
+class AcosConnectionError(AcosError):
+    """The device could not be reached, or its API service kept failing, after every retry"""
+
+
+class AcosTimeoutError(AcosConnectionError):
+    """The device accepted the connection but did not answer within the read timeout"""
+
+
+class AcosAuthError(AcosError):
+    """The device refused the credentials"""
+
+
+class DeviceDegraded(AcosError):
+    """The circuit breaker of the device is open, calls are skipped without reaching the device"""
+
+
+class EndpointDegraded(AcosError):
+    """The endpoint failed on every retry earlier in the run and is skipped from now on"""
+
+
+class RetryPolicy(object):
+    """How often a failed call is retried and how long to back off in between
+
+    The n-th retry waits a random time between 0 and min(max_backoff, backoff * 2 ** n) seconds ("full jitter"), so
+    devices that failed together don't retry in lockstep.
+    """
+    def __init__(self, retries=2, backoff=0.5, max_backoff=8.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class CircuitBreaker(object):
+    """Counts the calls to one device that failed after every retry
+
+    After threshold failures in a row the breaker opens and the device is degraded: every call raises DeviceDegraded
+    at once instead of waiting out timeouts. Once cooldown seconds passed a single trial call is let through, its
+    success closes the breaker again. An endpoint that fails endpoint_threshold times (or times out once) is
+    degraded on its own and skipped for endpoint_cooldown seconds, by default the rest of the run, while the other
+    endpoints carry on.
+    """
+    def __init__(self, threshold=5, cooldown=60.0, endpoint_threshold=2, endpoint_cooldown=None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.endpoint_threshold = endpoint_threshold
+        self.endpoint_cooldown = endpoint_cooldown
+        self.failures = 0
+        self.opened = None
+        self.endpoint_failures = {}
+        # {endpoint: (degraded since, last error)}
+        self.degraded = {}
+
+    def check(self, device, endpoint):
+        """raises when the device or the endpoint is degraded"""
+        if self.opened is not None:
+            if time.monotonic() - self.opened < self.cooldown:
+                raise DeviceDegraded(device, 'Device degraded after ' + str(self.failures) +
+                                     ' failed calls in a row, skipping ' + endpoint)
+            # half open, this call is the trial, the next failure opens the breaker again
+            self.opened = None
+            self.failures = self.threshold - 1
+        if endpoint in self.degraded:
+            since, error = self.degraded[endpoint]
+            if self.endpoint_cooldown is None or time.monotonic() - since < self.endpoint_cooldown:
+                raise EndpointDegraded(device, 'Endpoint ' + endpoint + ' degraded: ' + error)
+            del self.degraded[endpoint]
+            self.endpoint_failures[endpoint] = self.endpoint_threshold - 1
+
+    def success(self):
+        self.failures = 0
+
+    def failure(self, endpoint, error):
+        """records a call that failed after every retry, returns True when the device is now degraded"""
+        self.failures += 1
+        self.endpoint_failures[endpoint] = self.endpoint_failures.get(endpoint, 0) + 1
+        if self.endpoint_failures[endpoint] >= self.endpoint_threshold or isinstance(error, AcosTimeoutError):
+            self.degraded[endpoint] = (time.monotonic(), str(error))
+        if self.failures >= self.threshold:
+            self.opened = time.monotonic()
+            return True
+        return False
+
+    def is_open(self):
+        return self.opened is not None
+
+    def degraded_endpoints(self):
+        """returns {endpoint: last error} of the endpoints degraded so far"""
+        return dict((endpoint, error) for endpoint, (since, error) in self.degraded.items())
+
+
+class ResponseCache(object):
+    """LRU cache of AxAPI responses keyed by (partition, endpoint, payload)
+
+    Only reads are cached: GETs and clideploy calls made up of show commands. Cached responses are handed out as is,
+    so callers must not modify them.
+    """
+    def __init__(self, max_entries=1024, default_ttl=DEFAULT_CACHE_TTL, ttls=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def endpoint(self, module, method, payload):
+        """returns the endpoint name used for the cache key and ttl lookup, None when the call can't be cached"""
+        module = module.strip('/')
+        if method == 'GET':
+            return module
+        if module == 'clideploy':
+            commands = payload.get('CommandList', [])
+            if commands and all(command.startswith('show ') for command in commands):
+                return 'clideploy:' + ';'.join(commands)
+        return None
+
+    def key(self, partition, endpoint):
+        if endpoint in SHARED_ONLY_ENDPOINTS:
+            partition = 'shared'
+        return partition, endpoint
+
+    def ttl(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def cacheable(self, endpoint):
+        return self.max_entries > 0 and self.ttl(endpoint) > 0
+
+    def fresh(self, partition, endpoint):
+        """returns whether a fresh response is cached, without counting a hit or miss"""
+        entry = self.entries.get(self.key(partition, endpoint))
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, partition, endpoint):
+        """returns (True, response) on a fresh hit, (False, None) otherwise"""
+        key = self.key(partition, endpoint)
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            del self.entries[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, partition, endpoint, response):
+        ttl = self.ttl(endpoint)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        # don't hold on to errors, the next caller should get a fresh try
+        if isinstance(response, dict) and response.get('response', {}).get('status') == 'fail':
+            return
+        key = self.key(partition, endpoint)
+        self.entries[key] = (time.monotonic() + ttl, response)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': len(self.entries)}
+
+
+def index_object_stats(response, kind):
+    """turns a list-level stats response into {name: per-object stats response}
+
+    slb/server/stats returns {'server-list': [{'name': ..., 'stats': ...}, ...]} while slb/server/NAME/stats returns
+    {'server': {'name': ..., 'stats': ...}}, so each list entry is re-wrapped to look like the per-object call.
+    """
+    indexed = {}
+    try:
+        for entry in response[kind + '-list']:
+            indexed[entry['name']] = {kind: entry}
+    except (KeyError, TypeError):
+        # older ACOS releases or an empty partition, callers fall back to per-object calls
+        pass
+    return indexed
+
+
+def split_clideploy(response, commands):
+    """splits the output of a multi-command clideploy call into one output per command, or returns None
+
+    ACOS echoes each command of a CommandList (optionally after the prompt) before its output. The output is only
+    split when the echo of every command is found, in order, with nothing in front of the first one.
+    """
+    if not isinstance(response, dict) or not isinstance(response.get('command output'), str):
+        return None
+    lines = response['command output'].splitlines(True)
+    starts = []
+    for n, line in enumerate(lines):
+        if len(starts) == len(commands):
+            break
+        command = commands[len(starts)]
+        line = line.rstrip('\r\n')
+        if line == command or line.endswith('#' + command) or line.endswith('>' + command):
+            starts.append(n)
+    if len(starts) != len(commands) or any(line.strip() for line in lines[:starts[0] if starts else 0]):
+        return None
+    outputs = []
+    for k, start in enumerate(starts):
+        end = starts[k + 1] if k + 1 < len(starts) else len(lines)
+        output = ''.join(lines[start + 1:end])
+        if k + 1 < len(starts):
+            # the line break in front of the next echo belongs to the separator, not to this output
+            if output.endswith('\r\n'):
+                output = output[:-2]
+            elif output.endswith('\n'):
+                output = output[:-1]
+        outputs.append(output)
+    return outputs
+
+
 class Acos(object):
     """Class for making all device calls using AxAPI v3.0"""
-    def __init__(self, device, username, password, verbose):
+    def __init__(self, device, username, password, verbose, pool_size=10, connect_timeout=10, read_timeout=300,
+                 verify=False, cert=None, protocol='https', cache=None, retry=None, breaker=None, token_cache=None):
         self.device = device
         self.username = username
         self.password = password
         self.verbose = verbose
-        self.base_url = 'https://' + device + '/axapi/v3/'
+        # protocol is only ever http when talking to a local stand-in such as Fake_Axapi.py
+        self.base_url = protocol + '://' + device + '/axapi/v3/'
         self.headers = {'content-type': 'application/json'}
         self.logger = logging.getLogger(self.device)
+        # report output for this device, replaced with a file or buffer when devices run in parallel
+        self.report = ReportWriter(sys.stdout)
+        self.timeout = (connect_timeout, read_timeout)
+        # the partition the AxAPI session is currently in, part of every cache key
+        self.partition = 'shared'
+        self.cache = cache if cache is not None else ResponseCache()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        # Token_Cache.TokenCache sessions are taken over from and handed back to instead of logging off, see auth()
+        self.token_cache = token_cache
+        # the token leased from the token cache for this session
+        self.cached_token = None
+        # the HealthCheck method currently running, recorded with every call
+        self.section = None
+        # callables handed a record of every call made, see notify()
+        self.call_hooks = []
+        # HTTP status of the last call that reached the device, None until then
+        self.status_code = None
+        # cleared when a batched clideploy output can't be split, the commands then run one at a time
+        self.batch_clideploy = True
+        self.session = self.build_session(pool_size, verify, cert)
+
+    def build_session(self, pool_size, verify, cert):
+        """builds the keep-alive session used for every call made to the device"""
+        session = requests.Session()
+        # a single device is a single host, so one pool holding up to pool_size keep-alive connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        # verify may be False, True (system CAs) or the path to a CA bundle
+        session.verify = verify
+        # cert may be the path to a client cert or a (cert, key) tuple
+        session.cert = cert
+        return session
+
+    def connection_stats(self):
+        """returns how many requests were sent and how many of them reused an open connection"""
+        requests_sent = 0
+        connections = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                requests_sent += pools[key].num_requests
+                connections += pools[key].num_connections
+        return {'requests': requests_sent, 'connections': connections,
+                'reused': max(requests_sent - connections, 0)}
+
+    def close(self):
+        """closes the pooled connections held by the session"""
+        self.session.close()
+
+    @property
+    def out(self):
+        """the stream the report for this device is written to"""
+        return self.report.stream
+
+    @out.setter
+    def out(self, stream):
+        self.report = ReportWriter(stream)
 
     def set_logging_env(self):
         """Set logging environment for the device"""
@@ -48,8 +361,22 @@ class Acos(object):
         # self.logger.debug('this is debug')
 
     def auth(self):
-        """authenticates and retrieves the auth token for the A10 device"""
+        """authenticates and retrieves the auth token for the A10 device, taking over a live session from the token
+        cache when there is one"""
         self.logger.debug('Entering the auth method')
+        token = self.acquire_token()
+        while token is not None:
+            try:
+                # entering the shared partition validates the session and puts it where a new session starts out
+                response = self.axapi_call('active-partition/shared', 'POST', SHARED_PARTITION)
+            except AcosError:
+                self.token_cache.release(self.token_key(), token)
+                self.cached_token = None
+                raise
+            if self.token_accepted(token, response):
+                self.logger.debug('Exiting the auth method')
+                return token
+            token = self.acquire_token()
         payload = {"credentials": {"username": self.username, "password": self.password}}
         authorization = self.axapi_call('auth', 'POST', payload)
         try:
@@ -61,14 +388,60 @@ class Acos(object):
                 self.logger.error('Please check your credentials and then try again.')
             except Exception as e:
                 self.logger.error('The following error occurred: ' + str(e))
-            exit(1)
+            raise AcosAuthError(self.device, 'Authentication to ' + self.device + ' failed')
 
         self.headers['Authorization'] = 'A10 ' + auth_token
+        # a new AxAPI session always starts out in the shared partition
+        self.partition = 'shared'
+        if self.token_cache is not None:
+            self.token_cache.add(self.token_key(), auth_token)
+            self.cached_token = auth_token
         self.logger.debug('Exiting the auth method')
         return auth_token
 
+    def token_key(self):
+        return self.token_cache.key(self.base_url, self.username, self.password)
+
+    def acquire_token(self):
+        """leases a cached token and sets it on the session, returns None when there is none to reuse"""
+        if self.token_cache is None:
+            return None
+        if self.cached_token is not None:
+            # authenticating again, the session held so far is no longer good
+            self.token_cache.discard(self.token_key(), self.cached_token)
+            self.cached_token = None
+        token = self.token_cache.acquire(self.token_key())
+        if token is not None:
+            self.headers['Authorization'] = 'A10 ' + token
+        return token
+
+    def token_accepted(self, token, response):
+        """returns whether the device accepted a cached token, forgetting it when it didn't"""
+        if isinstance(response, dict) and isinstance(response.get('response'), dict) and \
+                response['response'].get('status') == 'fail':
+            self.logger.info('Cached session no longer valid')
+            self.token_cache.discard(self.token_key(), token)
+            return False
+        self.logger.info('Reusing a cached session')
+        self.token_cache.reused += 1
+        self.cached_token = token
+        self.partition = 'shared'
+        return True
+
+    def release_token(self, token):
+        """hands a cached session back to the token cache, returns False when it should be logged off instead"""
+        if self.token_cache is None or token != self.cached_token:
+            return False
+        self.cached_token = None
+        if self.token_cache.release(self.token_key(), token):
+            self.logger.debug('Session handed back to the token cache')
+            return True
+        return False
+
     def auth_logoff(self, token):
         """authenticates and retrives the auth token for the A10 device"""
+        if self.release_token(token):
+            return
         self.logger.debug('Logging Off to clean up session.')
         self.headers['Authorization'] = 'A10 ' + token
         try:
@@ -81,46 +454,119 @@ class Acos(object):
     def axapi_call(self, module, method, payload=''):
         """axapi structure for making all api requests"""
         self.logger.debug('Entering the axapi_call method')
-        url = self.base_url + module
-        if method == 'GET':
+        endpoint = self.cache.endpoint(module, method, payload)
+        if endpoint is not None:
+            hit, r = self.cache.get(self.partition, endpoint)
+            if hit:
+                self.logger.debug('Served ' + endpoint + ' from the response cache')
+                self.notify(module, method, payload, r, None, time.time(), 0.0, True)
+                return r
+        name = self.call_name(module, payload)
+        self.breaker.check(self.device, name)
+        attempt = 0
+        while True:
+            started = time.time()
+            start = time.perf_counter()
             try:
-                r = requests.get(url, headers=self.headers, verify=False)
-            except requests.ConnectionError:
-                # if there is a connection error catch it
-                self.logger.error('A connection error occurred connecting the the following url: ' + url)
-                self.logger.error('Please make sure that the device API service is reachable.')
-                exit(1)
-
-            except Exception as e:
-                # if for some reason we missed the above catch, let the user know what went wrong
-                # formatting will most likely be ugly
-                self.logger.error('The following error was received making your request: ' + str(e))
-                exit(1)
-        elif method == 'POST':
-            try:
-                r = requests.post(url, data=json.dumps(payload), headers=self.headers, verify=False)
-            except requests.ConnectionError:
-                # if there is a connection error catch it
-                self.logger.error('A connection error occurred connecting the the following url: ' + url)
-                self.logger.error('Please make sure that the device API service is reachable.')
-                exit(1)
+                status_code, r, transfer = self.send(module, method, payload)
+                error = self.status_error(name, status_code)
+            except AcosConnectionError as e:
+                error = e
+            delay = self.retry_delay(name, error, attempt)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+        latency = time.perf_counter() - start
+        self.status_code = status_code
+        if endpoint is not None:
+            self.cache.put(self.partition, endpoint, r)
+        self.notify(module, method, payload, r, status_code, started, latency, False, transfer)
+        self.logger.info(r)
+        self.logger.debug('Exiting the axapi_call method')
+        return r
 
-            except Exception as e:
-                # if for some reason we missed the above catch, let the user know what went wrong
-                # formatting will most likely be ugly
-                self.logger.error('The following error was received making your request: ' + str(e))
-                exit(1)
+    def call_name(self, module, payload):
+        """returns the name a call is tracked under by the circuit breaker, clideploy:<commands> for clideploy"""
+        module = module.strip('/')
+        if module == 'clideploy' and isinstance(payload, dict):
+            return 'clideploy:' + '; '.join(payload.get('CommandList', []))
+        return module
+
+    def status_error(self, name, status_code):
+        """returns the error for a response that is worth retrying, None for any other response"""
+        if status_code in RETRY_STATUSES:
+            return AcosConnectionError(self.device, name + ' returned HTTP ' + str(status_code))
+        return None
+
+    def retry_delay(self, name, error, attempt):
+        """returns how long to wait before retrying a call that failed with error, None when it succeeded;
+        raises the error once the call is out of retries"""
+        if error is None:
+            self.breaker.success()
+            return None
+        if attempt >= self.retry.retries or isinstance(error, AcosTimeoutError):
+            # a read timeout already took read_timeout seconds, retrying it would only multiply that
+            self.logger.error(str(error))
+            self.logger.error('Please make sure that the device API service is reachable.')
+            if self.breaker.failure(name, error):
+                self.logger.error('Device degraded, calls are skipped for the next ' + str(self.breaker.cooldown) +
+                                  ' seconds')
+            raise error
+        delay = self.retry.delay(attempt)
+        self.logger.warning(str(error) + ', retrying in {:.2f}s'.format(delay))
+        return delay
+
+    def send(self, module, method, payload=''):
+        """sends one request to the device and returns the status code, decoded response and transfer details
+        (time to first byte and body size)"""
+        url = self.base_url + module
+        try:
+            if method == 'GET':
+                r = self.session.get(url, headers=self.headers, timeout=self.timeout)
+            else:
+                r = self.session.post(url, data=json.dumps(payload), headers=self.headers, timeout=self.timeout)
+        except requests.ReadTimeout:
+            raise AcosTimeoutError(self.device, 'No response from ' + url + ' within ' + str(self.timeout[1]) +
+                                   ' seconds')
+        except requests.ConnectionError as e:
+            raise AcosConnectionError(self.device, 'A connection error occurred connecting to ' + url + ': ' +
+                                      str(e))
+        except Exception as e:
+            # if for some reason we missed the above catch, let the user know what went wrong
+            raise AcosError(self.device, 'The following error was received making your request: ' + str(e))
+        # requests stops the elapsed clock once the response headers are parsed, before the body is read
+        transfer = {'ttfb': r.elapsed.total_seconds(), 'size': len(r.content)}
+        return r.status_code, self.decode_response(r.status_code, r.content), transfer
+
+    def notify(self, module, method, payload, response, status_code, started, latency, cached, transfer=None):
+        """hands a record of a call to every hook in call_hooks"""
+        if not self.call_hooks:
+            return
+        transfer = transfer or {'ttfb': 0.0, 'size': 0}
+        module = module.strip('/')
+        if module == 'auth':
+            # never let credentials or session tokens leave the process
+            payload = None
+            response = None
+        record = {'device': self.device, 'partition': self.partition, 'section': self.section, 'method': method,
+                  'endpoint': module, 'payload': payload if payload else None, 'timestamp': started,
+                  'latency': latency, 'ttfb': transfer['ttfb'], 'size': transfer['size'], 'status': status_code,
+                  'cached': cached, 'response': response}
+        for hook in self.call_hooks:
+            hook(record)
+
+    def decode_response(self, status_code, content):
+        """turns a raw AxAPI response body into json, or wraps it when the device returned plain text"""
         try:
-            r = json.loads(r.content.decode())
+            r = json.loads(content.decode())
         except ValueError:
-            if r.status_code == 200 and r.content.decode() == '':
+            if status_code == 200 and content.decode() == '':
                 r = ''
-            elif r.status_code == 204:
+            elif status_code == 204:
                 r = {'HTTP RESPONSE CODE': 'HTTP 204'}
             else:
-                r = {'command output': r.content.decode()}
-        self.logger.info(r)
-        self.logger.debug('Exiting the axapi_call method')
+                r = {'command output': content.decode()}
         return r
 
     def clideploy(self, commands):
@@ -131,6 +577,35 @@ class Acos(object):
         self.logger.debug('Exiting the clideploy method')
         return r
 
+    def pending_clideploy(self, commands):
+        """returns the show commands worth prefetching: cacheable, not cached yet and each listed once"""
+        if not self.batch_clideploy:
+            return []
+        pending = []
+        for command in commands:
+            endpoint = 'clideploy:' + command
+            if command.startswith('show ') and command not in pending and self.cache.cacheable(endpoint) and \
+                    not self.cache.fresh(self.partition, endpoint):
+                pending.append(command)
+        return pending if len(pending) > 1 else []
+
+    def cache_clideploy(self, commands, response):
+        """caches the output of each command of a batched clideploy call under its own single-command key"""
+        outputs = split_clideploy(response, commands)
+        if outputs is None:
+            self.logger.info('Batched clideploy output could not be split, running the commands one at a time')
+            self.batch_clideploy = False
+            return
+        for command, output in zip(commands, outputs):
+            self.cache.put(self.partition, 'clideploy:' + command, {'command output': output})
+
+    def prefetch_clideploy(self, commands):
+        """runs several show commands in one clideploy call, so the getters that follow in the current partition
+        are served from the response cache"""
+        pending = self.pending_clideploy(commands)
+        if pending:
+            self.cache_clideploy(pending, self.clideploy(pending))
+
     def get_startup_configs(self):
         """show startup-config all-partitions - Uses cli-deploy method."""
         start_config_all_parts = self.clideploy(['show startup-config all-partitions'])
@@ -149,11 +624,16 @@ class Acos(object):
         self.logger.debug('Exiting get_json_config method')
         return run_json_config
 
+    def get_config_stamps(self):
+        """show running-config partition-config all | include Configuration last - Uses cli-deploy method."""
+        # only the 'last updated'/'last saved' header lines of each partition, cheap next to the full configs
+        config_stamps = self.clideploy(['show running-config partition-config all | include Configuration last'])
+        self.logger.debug('Exiting get_config_stamps method')
+        return config_stamps
+
     def build_section_header(self, section):
         """prints section headers"""
-        print('{:*^100s}'.format(''))
-        print('{:*^100s}'.format(section))
-        print('{:*^100s}'.format(''))
+        self.report.header(section)
 
     def get_partition_list(self):
         """show partitions"""
@@ -180,12 +660,24 @@ class Acos(object):
         try:
             payload = {'active-partition': {'curr_part_name': partition}}
             set_partition = self.axapi_call('active-partition/' + partition, 'POST', payload)
-            # print("Status code for change_partition: ", set_partition.status_code)
-        except requests.HTTPError:
-            logging.debug('Issue changing partition to ', partition)
+            error = self.partition_error(partition, set_partition)
+            if error is not None:
+                raise error
+        except AcosError as e:
+            # the session stays in the partition it was in, callers skip the work meant for the new one
+            self.logger.error('Issue changing partition to ' + partition + ': ' + str(e))
+            raise
         else:
-            # print(partition,' partition response: ', set_partition.content)
-            logging.debug('AxAPI changed to shared partition')
+            self.partition = partition
+            self.logger.debug('AxAPI changed to ' + partition + ' partition')
+
+    def partition_error(self, partition, response):
+        """returns the error for a partition change the device refused, None when the session moved to partition"""
+        failed = isinstance(response, dict) and response.get('response', {}).get('status') == 'fail'
+        if failed or not 200 <= self.status_code < 300:
+            return AcosError(self.device, 'active-partition/' + partition + ' returned HTTP ' + str(self.status_code) +
+                             ': ' + json.dumps(response))
+        return None
 
     def get_vrrpa(self):
         """show vrrp-a"""
@@ -267,6 +759,27 @@ class Acos(object):
         self.logger.debug('Exiting get_slb_service_group_stats method')
         return virtual_server_stats
 
+    def get_slb_server_stats_bulk(self):
+        """show slb server (stats for every server, indexed by name)"""
+        self.logger.debug('Entering get_slb_server_stats_bulk method')
+        slb_server_stats = index_object_stats(self.axapi_call('slb/server/stats', 'GET'), 'server')
+        self.logger.debug('Exiting get_slb_server_stats_bulk method')
+        return slb_server_stats
+
+    def get_slb_service_group_stats_bulk(self):
+        """show slb service-group (stats for every service-group, indexed by name)"""
+        self.logger.debug('Entering get_slb_service_group_stats_bulk method')
+        service_group_stats = index_object_stats(self.axapi_call('slb/service-group/stats', 'GET'), 'service-group')
+        self.logger.debug('Exiting get_slb_service_group_stats_bulk method')
+        return service_group_stats
+
+    def get_slb_virtual_server_stats_bulk(self):
+        """show slb virtual-server (stats for every virtual-server, indexed by name)"""
+        self.logger.debug('Entering get_slb_virtual_server_stats_bulk method')
+        virtual_server_stats = index_object_stats(self.axapi_call('slb/virtual-server/stats', 'GET'), 'virtual-server')
+        self.logger.debug('Exiting get_slb_virtual_server_stats_bulk method')
+        return virtual_server_stats
+
     def get_slb_server_oper(self):
         """show slb server"""
         self.logger.debug('Entering get_slb_server_oper method')
@@ -684,18 +1197,5 @@ class Acos(object):
 
     def pretty_print_json_as_yaml(self, dict):
         """takes a json object and pretty prints it as yaml"""
-        # the dict top level is 'command output' we know it is from clideploy
-        # and just a bunch of text so we pretty it up
-        try:
-            body = dict['command output']
-            body = str.replace(body, '!', '')
-            body = str.replace(body, 'exit-module', '')
-            body = str.replace(body, '\r\n', '\n')
-            body_list = body.split('\n')
-            myyaml = {'command output': body_list}
-            pretty_yaml = yaml.round_trip_dump(myyaml)
-
-        except:
-            pretty_yaml = yaml.round_trip_dump(dict)
-
-        return pretty_yaml
+        # kept for callers that need the yaml as a string, the health check streams through self.report instead
+        return dumps(dict)
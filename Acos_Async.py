@@ -0,0 +1,843 @@
+'''
+Summary:    This script contains an asyncio counterpart of the Acos class. Every device call is a coroutine, so a
+            single process can keep many devices and many in-flight requests going at once, while a per-device
+            semaphore caps how many requests are outstanding against any one ADC's control plane.
+
+            The HealthCheck sections are plain blocking functions; run_sections() and run_blocking() run them on
+            worker threads against a BlockingAcos view of the device whose calls are dispatched back onto the
+            event loop.
+
+Requires:
+            - aiohttp
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import asyncio
+import ssl
+import json
+import re
+import time
+import aiohttp
+from Acos import Acos, AcosAuthError, AcosConnectionError, AcosError, AcosTimeoutError, SHARED_PARTITION, \
+    index_object_stats
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# connect timeouts are retried like any connection error, older aiohttp releases don't tell them apart from read
+# timeouts
+CONNECT_TIMEOUT_ERRORS = getattr(aiohttp, 'ConnectionTimeoutError', ())
+
+
+class AsyncAcos(Acos):
+    """Class for making all device calls using AxAPI v3.0 from an asyncio event loop"""
+    def __init__(self, device, username, password, verbose, max_in_flight=4, pool_size=10, connect_timeout=10,
+                 read_timeout=300, verify=False, cert=None, protocol='https', cache=None, retry=None, breaker=None,
+                 token_cache=None):
+        self.max_in_flight = max_in_flight
+        self.requests_sent = 0
+        self.connections = 0
+        Acos.__init__(self, device, username, password, verbose, pool_size=pool_size,
+                      connect_timeout=connect_timeout, read_timeout=read_timeout, verify=verify, cert=cert,
+                      protocol=protocol, cache=cache, retry=retry, breaker=breaker, token_cache=token_cache)
+
+    def build_session(self, pool_size, verify, cert):
+        """the aiohttp session has to be created on the running loop, so only keep the settings here"""
+        self.pool_size = pool_size
+        self.verify = verify
+        self.cert = cert
+        self.semaphore = None
+        return None
+
+    def build_ssl_context(self):
+        """translates the requests style verify/cert settings into what aiohttp expects"""
+        if self.verify is False and not self.cert:
+            return False
+        if isinstance(self.verify, str):
+            context = ssl.create_default_context(cafile=self.verify)
+        else:
+            context = ssl.create_default_context()
+            if self.verify is False:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+        if isinstance(self.cert, (tuple, list)):
+            context.load_cert_chain(self.cert[0], self.cert[1])
+        elif self.cert:
+            context.load_cert_chain(self.cert)
+        return context
+
+    async def open(self):
+        """opens the pooled keep-alive session, must be awaited before the first call"""
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self.on_connection_created)
+        connector = aiohttp.TCPConnector(limit=self.pool_size, ssl=self.build_ssl_context())
+        timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+        self.session = aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[trace])
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    async def on_connection_created(self, session, context, params):
+        self.connections += 1
+
+    def connection_stats(self):
+        """returns how many requests were sent and how many of them reused an open connection"""
+        return {'requests': self.requests_sent, 'connections': self.connections,
+                'reused': max(self.requests_sent - self.connections, 0)}
+
+    async def close(self):
+        """closes the pooled connections held by the session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def axapi_call(self, module, method, payload=''):
+        """axapi structure for making all api requests"""
+        self.logger.debug('Entering the axapi_call method')
+        endpoint = self.cache.endpoint(module, method, payload)
+        if endpoint is not None:
+            hit, r = self.cache.get(self.partition, endpoint)
+            if hit:
+                self.logger.debug('Served ' + endpoint + ' from the response cache')
+                self.notify(module, method, payload, r, None, time.time(), 0.0, True)
+                return r
+        name = self.call_name(module, payload)
+        self.breaker.check(self.device, name)
+        attempt = 0
+        while True:
+            try:
+                status_code, content, started, latency, ttfb = await self.send_async(module, method, payload)
+                error = self.status_error(name, status_code)
+            except AcosConnectionError as e:
+                error = e
+            delay = self.retry_delay(name, error, attempt)
+            if delay is None:
+                break
+            # only this device's call waits, the other devices on the loop carry on
+            await asyncio.sleep(delay)
+            attempt += 1
+        r = self.decode_response(status_code, content)
+        self.status_code = status_code
+        if endpoint is not None:
+            self.cache.put(self.partition, endpoint, r)
+        self.notify(module, method, payload, r, status_code, started, latency, False,
+                    {'ttfb': ttfb, 'size': len(content)})
+        self.logger.info(r)
+        self.logger.debug('Exiting the axapi_call method')
+        return r
+
+    async def send_async(self, module, method, payload=''):
+        """sends one request to the device and returns the status code, raw body, start time, latency and time to
+        first byte"""
+        url = self.base_url + module
+        # no more than max_in_flight requests are outstanding against this device at any time
+        async with self.semaphore:
+            self.requests_sent += 1
+            started = time.time()
+            start = time.perf_counter()
+            try:
+                if method == 'GET':
+                    request = self.session.get(url, headers=self.headers)
+                else:
+                    request = self.session.post(url, data=json.dumps(payload), headers=self.headers)
+                async with request as r:
+                    # the context is entered once the response headers are in, the body is read below
+                    ttfb = time.perf_counter() - start
+                    status_code = r.status
+                    content = await r.read()
+            except CONNECT_TIMEOUT_ERRORS as e:
+                raise AcosConnectionError(self.device, 'A connection error occurred connecting to ' + url + ': ' +
+                                          str(e))
+            except aiohttp.ServerTimeoutError:
+                raise AcosTimeoutError(self.device, 'No response from ' + url + ' within ' + str(self.timeout[1]) +
+                                       ' seconds')
+            except aiohttp.ClientConnectionError as e:
+                raise AcosConnectionError(self.device, 'A connection error occurred connecting to ' + url + ': ' +
+                                          str(e))
+            except Exception as e:
+                raise AcosError(self.device, 'The following error was received making your request: ' + str(e))
+            latency = time.perf_counter() - start
+        return status_code, content, started, latency, ttfb
+
+    async def auth(self):
+        """authenticates and retrieves the auth token for the A10 device, taking over a live session from the token
+        cache when there is one"""
+        self.logger.debug('Entering the auth method')
+        token = self.acquire_token()
+        while token is not None:
+            try:
+                response = await self.axapi_call('active-partition/shared', 'POST', SHARED_PARTITION)
+            except AcosError:
+                self.token_cache.release(self.token_key(), token)
+                self.cached_token = None
+                raise
+            if self.token_accepted(token, response):
+                self.logger.debug('Exiting the auth method')
+                return token
+            token = self.acquire_token()
+        payload = {"credentials": {"username": self.username, "password": self.password}}
+        authorization = await self.axapi_call('auth', 'POST', payload)
+        try:
+            auth_token = authorization['authresponse']['signature']
+        except:
+            # if the logon fails try to capture the error message from the response JSON then give up on this device
+            # only, the other devices on the event loop carry on
+            try:
+                self.logger.error('The following error was received while authenticating: ' + authorization['response']['err']['msg'])
+                self.logger.error('Please check your credentials and then try again.')
+            except Exception as e:
+                self.logger.error('The following error occurred: ' + str(e))
+            raise AcosAuthError(self.device, 'Authentication to ' + self.device + ' failed')
+
+        self.headers['Authorization'] = 'A10 ' + auth_token
+        # a new AxAPI session always starts out in the shared partition
+        self.partition = 'shared'
+        if self.token_cache is not None:
+            self.token_cache.add(self.token_key(), auth_token)
+            self.cached_token = auth_token
+        self.logger.debug('Exiting the auth method')
+        return auth_token
+
+    async def auth_logoff(self, token):
+        """authenticates and retrives the auth token for the A10 device"""
+        if self.release_token(token):
+            return
+        self.logger.debug('Logging Off to clean up session.')
+        self.headers['Authorization'] = 'A10 ' + token
+        try:
+            await self.axapi_call('logoff', 'POST')
+        except:
+            self.logger.error("Error logging off of session")
+        else:
+            self.logger.debug('Logoff successful')
+
+    async def clideploy(self, commands):
+        """clideploy method (use for either no known api call or broken schema"""
+        self.logger.debug('Entering the clideploy method')
+        payload = {'CommandList': commands}
+        r = await self.axapi_call('clideploy', 'POST', payload)
+        self.logger.debug('Exiting the clideploy method')
+        return r
+
+    async def prefetch_clideploy(self, commands):
+        """runs several show commands in one clideploy call, so the getters that follow in the current partition
+        are served from the response cache"""
+        pending = self.pending_clideploy(commands)
+        if pending:
+            self.cache_clideploy(pending, await self.clideploy(pending))
+
+    async def get_startup_configs(self):
+        """show startup-config all-partitions - Uses cli-deploy method."""
+        start_config_all_parts = await self.clideploy(['show startup-config all-partitions'])
+        self.logger.debug('Exiting get_startup_configs method')
+        return start_config_all_parts
+
+    async def get_running_configs(self):
+        """show running with-default partition-config all - Uses cli-deploy method."""
+        run_config_with_def_all_parts = await self.clideploy(['show running with-default partition-config all'])
+        self.logger.debug('Exiting get_running_config method')
+        return run_config_with_def_all_parts
+
+    async def get_json_config(self):
+        """show json-config - Uses cli-deploy method"""
+        run_json_config = (await self.clideploy(['show json-config']))
+        self.logger.debug('Exiting get_json_config method')
+        return run_json_config
+
+    async def get_config_stamps(self):
+        """show running-config partition-config all | include Configuration last - Uses cli-deploy method."""
+        config_stamps = await self.clideploy(['show running-config partition-config all | include Configuration last'])
+        self.logger.debug('Exiting get_config_stamps method')
+        return config_stamps
+
+    async def get_partition_list(self):
+        """show partitions"""
+        # instantiate list with shared partition as it is implied and not returned by the REST endpoint
+        partitions = ['shared']
+        partition_list = await self.axapi_call('partition', 'GET')
+        try:
+            for partition in partition_list['partition-list']:
+                partitions.append(partition["partition-name"])
+        except TypeError:
+            # if there are no partitions (or only shared), then catch and move on
+            pass
+        return partitions
+
+    async def get_partition_config(self, partition):
+        """gets the configuration for a particular partition"""
+        await self.axapi_call(partition, 'GET')
+        partition_config = await self.axapi_call('/running-config', 'GET')
+        self.logger.info(partition_config)
+        self.logger.debug('Exiting get_partition_config method')
+        return partition_config
+
+    async def change_partition(self, partition):
+        payload = {'active-partition': {'curr_part_name': partition}}
+        try:
+            set_partition = await self.axapi_call('active-partition/' + partition, 'POST', payload)
+            error = self.partition_error(partition, set_partition)
+            if error is not None:
+                raise error
+        except AcosError as e:
+            self.logger.error('Issue changing partition to ' + partition + ': ' + str(e))
+            raise
+        self.partition = partition
+        self.logger.debug('AxAPI changed to ' + partition + ' partition')
+
+    async def get_vrrpa(self):
+        """show vrrp-a"""
+        self.logger.debug('Entering get_vrrpa method')
+        vrrpa = await self.axapi_call('vrrp-a', 'GET')
+        self.logger.info(vrrpa)
+        self.logger.debug('Exiting get_vrrpa method')
+        return vrrpa
+
+    async def get_vrrpa_stats(self):
+        """gets vrrp-a stats"""
+        self.logger.debug('Entering get_vrrpa_stats method')
+        vrrpa_stats = await self.axapi_call('vrrp-a/state/stats', 'GET')
+        self.logger.info(vrrpa_stats)
+        self.logger.debug('Exiting get_vrrpa_stats method')
+        return vrrpa_stats
+
+    async def get_vcs_images(self):
+        """show vcs images"""
+        self.logger.debug('Entering get_vcs_images method')
+        vcs_images = (await self.axapi_call('vcs/images/oper', 'GET'))
+        self.logger.info(vcs_images)
+        self.logger.debug('Exiting get_vcs_images method')
+        return vcs_images
+
+    async def get_vcs_summary(self):
+        """show vcs summary"""
+        self.logger.debug('Entering get_vcs_summary method')
+        vcs_summary = (await self.axapi_call('vcs/vcs-summary/oper', 'GET'))
+        self.logger.info(vcs_summary)
+        self.logger.debug('Exiting get_vcs_summary method')
+        return vcs_summary
+
+    async def get_slb_servers(self):
+        """show slb server"""
+        self.logger.debug('Entering get_slb_servers method')
+        servers_list = await self.axapi_call('slb/server', 'GET')
+        self.logger.info(servers_list)
+        self.logger.debug('Exiting get_slb_servers method')
+        return servers_list
+
+    async def get_slb_service_groups(self):
+        """show slb service-group"""
+        self.logger.debug('Entering get_slb_service_groups method')
+        service_group_list = await self.axapi_call('slb/service-group', 'GET')
+        self.logger.info(service_group_list)
+        self.logger.debug('Exiting get_slb_service_groups method')
+        return service_group_list
+
+    async def get_slb_virtual_servers(self):
+        """show slb virtual-server"""
+        self.logger.debug('Entering get_slb_virtual_servers method')
+        virtual_server_list = await self.axapi_call('slb/virtual-server', 'GET')
+        self.logger.info(virtual_server_list)
+        self.logger.debug('Exiting get_slb_virtual_servers method')
+        return virtual_server_list
+
+    async def get_slb_server_stats(self, server):
+        """show slb server <NAME>"""
+        self.logger.debug('Entering get_slb_server_stats method')
+        slb_server_stats = await self.axapi_call('slb/server/' + server + '/stats', 'GET')
+        self.logger.info(slb_server_stats)
+        self.logger.debug('Exiting get_slb_server_stats method')
+        return slb_server_stats
+
+    async def get_slb_service_group_stats(self, service_group):
+        """show slb service-group <NAME>"""
+        self.logger.debug('Entering get_slb_service_group_stats method')
+        service_group_stats = await self.axapi_call('slb/service-group/' + service_group + '/stats', 'GET')
+        self.logger.info(service_group_stats)
+        self.logger.debug('Exiting get_slb_service_group_stats method')
+        return service_group_stats
+
+    async def get_slb_virtual_server_stats(self, virtual_server):
+        """show slb virtual-server <NAME>"""
+        self.logger.debug('Entering get_slb_service_group_stats method')
+        virtual_server_stats = await self.axapi_call('slb/virtual-server/' + virtual_server + '/stats', 'GET')
+        self.logger.info(virtual_server_stats)
+        self.logger.debug('Exiting get_slb_service_group_stats method')
+        return virtual_server_stats
+
+    async def get_slb_server_stats_bulk(self):
+        """show slb server (stats for every server, indexed by name)"""
+        self.logger.debug('Entering get_slb_server_stats_bulk method')
+        slb_server_stats = index_object_stats(await self.axapi_call('slb/server/stats', 'GET'), 'server')
+        self.logger.debug('Exiting get_slb_server_stats_bulk method')
+        return slb_server_stats
+
+    async def get_slb_service_group_stats_bulk(self):
+        """show slb service-group (stats for every service-group, indexed by name)"""
+        self.logger.debug('Entering get_slb_service_group_stats_bulk method')
+        service_group_stats = index_object_stats(await self.axapi_call('slb/service-group/stats', 'GET'), 'service-group')
+        self.logger.debug('Exiting get_slb_service_group_stats_bulk method')
+        return service_group_stats
+
+    async def get_slb_virtual_server_stats_bulk(self):
+        """show slb virtual-server (stats for every virtual-server, indexed by name)"""
+        self.logger.debug('Entering get_slb_virtual_server_stats_bulk method')
+        virtual_server_stats = index_object_stats(await self.axapi_call('slb/virtual-server/stats', 'GET'), 'virtual-server')
+        self.logger.debug('Exiting get_slb_virtual_server_stats_bulk method')
+        return virtual_server_stats
+
+    async def get_slb_server_oper(self):
+        """show slb server"""
+        self.logger.debug('Entering get_slb_server_oper method')
+        server_oper = await self.axapi_call('slb/server/oper', 'GET')
+        self.logger.info(server_oper)
+        self.logger.debug('Exiting get_slb_server_oper method')
+        return server_oper
+
+    async def get_slb_service_group_oper(self):
+        """show slb service-group"""
+        self.logger.debug('Entering get_slb_service_group_oper method')
+        service_group_oper = await self.axapi_call('slb/service-group/oper', 'GET')
+        self.logger.info(service_group_oper)
+        self.logger.debug('Exiting get_slb_service_group_oper method')
+        return service_group_oper
+
+    async def get_slb_virtual_server_oper(self):
+        """show slb virtual-server"""
+        self.logger.debug('Entering get_slb_virtual_server_oper method')
+        virtual_server_oper = await self.axapi_call('slb/virtual-server/oper', 'GET')
+        self.logger.info(virtual_server_oper)
+        self.logger.debug('Exiting get_slb_virtual_server_oper method')
+        return virtual_server_oper
+
+    async def get_memory(self):
+        """show memory"""
+        self.logger.debug('Entering get_memory method')
+        memory_info = await self.axapi_call('system/memory/oper', 'GET')
+        self.logger.info(memory_info)
+        self.logger.debug('Exiting get_memory method')
+        return memory_info
+
+    async def get_system_oper(self):
+        """show oper"""
+        self.logger.debug('Entering get_system_oper method')
+        system_oper = await self.axapi_call('system/oper/', 'GET')
+        self.logger.info(system_oper)
+        self.logger.debug('Exiting get_system_oper method')
+        return system_oper
+
+    async def get_hardware(self):
+        """show hardware"""
+        self.logger.debug('Entering get_hardware method')
+        hardware = await self.axapi_call('system/hardware/', 'GET')
+        self.logger.info(hardware)
+        self.logger.debug('Exiting get_hardware method')
+        return hardware
+
+    async def get_disk(self):
+        """show disk"""
+        self.logger.debug('Entering get_disk method')
+        disk = await self.axapi_call('system/hardware/oper', 'GET')
+        self.logger.info(disk)
+        self.logger.debug('Exiting get_disk method')
+        return disk
+
+    async def get_slb_hw_compression(self):
+        """show slb hw-compression"""
+        self.logger.debug('Entering get_slb_hw_compression method')
+        slb_hw_compression = await self.axapi_call('slb/hw-compress/stats', 'GET')
+        self.logger.info(slb_hw_compression)
+        self.logger.debug('Exiting get_slb_hw_compression method')
+        return slb_hw_compression
+
+    async def get_environment(self):
+        """show environment"""
+        #NOTE: Works on hardware devices only
+        self.logger.debug('Entering get_environment method')
+        evironment = await self.axapi_call('system/environment', 'GET')
+        self.logger.info(evironment)
+        self.logger.debug('Exiting get_environment method')
+        return evironment
+
+    async def get_interfaces_transceiver(self):
+        """show interfaces transceiver"""
+        self.logger.debug('Entering get_fiber_info method')
+        # BROKEN schema::interfaces_transceiver = await self.axapi_call('network/interface/transceiver', 'GET').content.decode()
+        # try /interface/oper ?
+        # this looks like it grabs that data, i don't have any transceivers so I can't check if the data shows light levels
+        # TODO: Update to only run on fiber ports.
+        interfaces_transceiver = await self.clideploy(['show interfaces transceiver ethernet 9 details'])
+        self.logger.info(interfaces_transceiver)
+        self.logger.debug('Exiting get_fiber_info method')
+        return interfaces_transceiver
+
+    async def get_interface_ethernet(self):
+        """show interfaces"""
+        self.logger.debug('Entering get_interface_ethernet method')
+        interface_ethernet = await self.axapi_call('interface/ethernet/stats', 'GET')
+        self.logger.info(interface_ethernet)
+        self.logger.debug('Exiting get_interface_ethernet method')
+        return interface_ethernet
+
+    async def get_interface_ve(self):
+        """show interfaces ve"""
+        self.logger.debug('Entering get_interface_ve method')
+        interface_ve = await self.axapi_call('interface/ve/stats', 'GET')
+        self.logger.info(interface_ve)
+        self.logger.debug('Exiting get_interface_ve method')
+        return interface_ve
+
+    async def get_trunk(self):
+        """show trunk"""
+        self.logger.debug('Entering get_trunk method')
+        trunk = await self.axapi_call('interface/trunk/stats', 'GET')
+        self.logger.info(trunk)
+        self.logger.debug('Exiting get_trunk method')
+        return trunk
+
+    async def get_lacp(self):
+        """show lacp trunk detail"""
+        self.logger.debug('Entering get_lacp_trunk_detail method')
+        # BROKEN schmea::lacp = await self.axapi_call('network/lacp/trunk', 'GET').content.decode()
+        lacp_trunk_detail = await self.clideploy(['show lacp trunk detail'])
+        self.logger.info(lacp_trunk_detail)
+        self.logger.debug('Exiting get_lacp_info method')
+        return lacp_trunk_detail
+
+    async def get_lacp_counters(self):
+        """show lacp counter"""
+        self.logger.debug('Entering get_lacp_counters method')
+        lacp_counters = await self.axapi_call('network/lacp/stats', 'GET')
+        self.logger.info(lacp_counters)
+        self.logger.debug('Exiting get_lacp_counters method')
+        return lacp_counters
+
+    async def get_vlans(self):
+        """show vlans"""
+        self.logger.debug('Entering get_vlans method')
+        vlans = await self.axapi_call('network/vlan', 'GET')
+        self.logger.info(vlans)
+        self.logger.debug('Exiting get_vlans method')
+        return vlans
+
+    async def get_vlan_stats(self):
+        """show vlan counters"""
+        self.logger.debug('Entering get_vlan_stats method')
+        vlan_stats = await self.axapi_call('network/vlan/stats', 'GET')
+        self.logger.info(vlan_stats)
+        self.logger.debug('Exiting get_vlan_stats method')
+        return vlan_stats
+
+    async def get_system_resources_usage(self):
+        """show system resource-usage"""
+        #NOTE: some of these cmds are not available on all ACOS versions.  
+        self.logger.debug('Entering get_system_resources_usage method')
+        system_resources_usage = await self.axapi_call('system/resource-usage/oper', 'GET')
+        self.logger.info(system_resources_usage)
+        self.logger.debug('Exiting get_system_resources_usage_info method')
+        return system_resources_usage
+
+    async def get_slb_resource_usage(self):
+        """show slb resource-usage"""
+        # NOTE: some of these are not available on all ACOS versions.
+        self.logger.debug('Entering get_slb_resource_usage method')
+        slb_resource_info = await self.axapi_call('slb/resource-usage/oper', 'GET')
+        self.logger.info(slb_resource_info)
+        self.logger.debug('Exiting get_slb_resource_usage method')
+        return slb_resource_info
+
+    async def get_resource_acct(self):
+        """show resource-accounting"""
+        self.logger.debug('Entering get_resource_acct method')
+        resource_acct = await self.axapi_call('system/resource-accounting/oper', 'GET')
+        self.logger.info(resource_acct)
+        self.logger.debug('Exiting get_resource_acct method')
+        return resource_acct
+
+    async def get_icmp_stats(self):
+        """show system icmp"""
+        self.logger.debug('Entering get_icmp_stats method')
+        get_icmp_stats = await self.axapi_call('system/icmp/stats', 'GET')
+        self.logger.info(get_icmp_stats)
+        self.logger.debug('Exiting get_icmp_stats method')
+        return get_icmp_stats
+
+    async def get_data_cpu(self):
+        """show cpu"""
+        self.logger.debug('Entering get_data_cpu method')
+        data_cpu_info = (await self.axapi_call('system/data-cpu/stats', 'GET'))
+        self.logger.info(data_cpu_info)
+        self.logger.debug('Exiting get_data_cpu method')
+        return data_cpu_info
+
+    async def get_control_cpu(self):
+        """show cpu"""
+        self.logger.debug('Entering get_control_cpu method')
+        control_cpu_info = (await self.axapi_call('system/control-cpu/stats', 'GET'))
+        self.logger.info(control_cpu_info)
+        self.logger.debug('Exiting get_control_cpu method')
+        return control_cpu_info
+
+    async def get_cpu_load_sharing(self):
+        """show cpu"""
+        self.logger.debug('Entering get_cpu_load_sharing method')
+        cpu_load_sharing = await self.axapi_call('system/cpu-load-sharing/', 'GET')
+        self.logger.info(cpu_load_sharing)
+        self.logger.debug('Exiting get_cpu_load_sharing method')
+        return cpu_load_sharing
+
+    async def get_cpu_history(self):
+        """show cpu history"""
+        self.logger.debug('Entering get_cpu_history method')
+        # BROKEN schema::cpu_history = await self.axapi_call('system/data-cpu/', 'GET')
+        cpu_history = (await self.clideploy(['show cpu history']))
+        self.logger.info(cpu_history)
+        self.logger.debug('Exiting get_cpu_history method')
+        return cpu_history
+
+    async def get_session(self):
+        """show session"""
+        self.logger.debug('Entering get_session method')
+        session = await self.axapi_call('system/session/stats', 'GET')
+        self.logger.info(session)
+        self.logger.debug('Exiting get_session method')
+        return session
+
+    async def get_ip_route(self):
+        """show ip route"""
+        self.logger.debug('Entering the get_ip_route method')
+        routes = await self.axapi_call('ip/fib/oper', 'GET')
+        self.logger.info(routes)
+        self.logger.debug('Exiting the get_ip_route method')
+        return routes
+
+    async def get_ip_stats(self):
+        """show ip stats"""
+        self.logger.debug('Entering get_ip_stats method')
+        ip_stats = await self.axapi_call('ip/stats', 'GET')
+        self.logger.info(ip_stats)
+        self.logger.debug('Exiting get_ip_stats method')
+        return ip_stats
+
+    async def get_slb_switch(self):
+        """show slb switch"""
+        self.logger.debug('Entering get_slb_switch method')
+        slb_switch = await self.axapi_call('slb/switch/stats', 'GET')
+        self.logger.info(slb_switch)
+        self.logger.debug('Exiting get_slb_switch method')
+        return slb_switch
+
+    async def get_slb_tcp_stack(self):
+        """show slb tcp stack"""
+        self.logger.debug('Entering get_slb_tcp_stack method')
+        slb_tcp_stack = await self.axapi_call('system/tcp/stats', 'GET')
+        self.logger.info(slb_tcp_stack)
+        self.logger.debug('Exiting get_slb_tcp_stack method')
+        return slb_tcp_stack
+
+    async def get_system_bandwidth_stats(self):
+        """Equivalent show cmd???"""
+        self.logger.debug('Entering get_system_bandwidth_stats method')
+        system_bandwidth_stats = await self.axapi_call('/system/bandwidth/stats', 'GET')
+        self.logger.info(system_bandwidth_stats)
+        self.logger.debug('Exiting get_system_bandwidth_stats method')
+        return system_bandwidth_stats
+
+    async def get_slb_ssl_error(self):
+        """show slb ssl error"""
+        self.logger.debug('Entering get_slb_ssl_error method')
+        # BROKEN schema::get_slb_ssl_error_info = await self.axapi_call('hd/', 'GET')
+        get_slb_ssl_error_info =  (await self.clideploy(['show slb ssl error']))
+        self.logger.info(get_slb_ssl_error_info)
+        self.logger.debug('Exiting get_slb_ssl_error method')
+        return get_slb_ssl_error_info
+
+    async def get_slb_ssl_stats(self):
+        """show slb ssl stats"""
+        self.logger.debug('Entering get_slb_ssl_stats method')
+        # BROKEN schema::slb_ssl_stats = await self.axapi_call('slb/ssl/stats', 'GET')
+        slb_ssl_stats = (await self.clideploy(['show slb tcp stack']))
+        self.logger.info(slb_ssl_stats)
+        self.logger.debug('Exiting get_slb_ssl_stats method')
+        return slb_ssl_stats
+
+    async def get_slb_l4(self):
+        """ show slb l4"""
+        self.logger.debug('Entering get_slb_l4 method')
+        slb_l4 = await self.axapi_call('slb/l4/stats', 'GET')
+        self.logger.info(slb_l4)
+        self.logger.debug('Exiting get_slb_l4 method')
+        return slb_l4
+
+    async def get_resource_acct_system(self):
+        """show resource-accounting resource-type system-resources"""
+        self.logger.debug('Entering get_resource_acct_system method')
+        # BROKEN schema::resource_acct_system = await self.axapi_call('hd/', 'GET')
+        resource_acct_system = (await self.clideploy(['show resource-accounting resource-type system-resources']))
+        self.logger.info(resource_acct_system)
+        self.logger.debug('Exiting get_resource_acct_system method')
+        return resource_acct_system
+
+    async def get_health_monitor_status(self):
+        """show health stat"""
+        self.logger.debug('Entering get_health_monitor_status method')
+        # health_monitor_status = await self.axapi_call('hd/', 'GET')
+        health_monitor_status = (await self.clideploy(['show health stat']))
+        self.logger.info(health_monitor_status)
+        self.logger.debug('Exiting get_health_monitor_status method')
+        return health_monitor_status
+
+    async def get_health_monitor(self):
+        """show health stat"""
+        self.logger.debug('Entering get_health_monitor method')
+        # health_monitor_status = await self.axapi_call('hd/', 'GET')
+        health_monitor = (await self.clideploy(['show health monitor']))
+        self.logger.info(health_monitor)
+        self.logger.debug('Exiting get_health_monitor method')
+        return health_monitor
+
+    async def get_health_monitor_reason(self, n):
+        """show health down-reason N"""
+        self.logger.debug('Entering get_health_monitor_reason method')
+        # BROKEN schema: health_monitor_reason = await self.axapi_call('health/monitor/stats', 'GET')
+        health_monitor_reason = (await self.clideploy(['show health down-reason ' + n]))
+        self.logger.info(health_monitor_reason)
+        self.logger.debug('Exiting get_health_monitor_reason method')
+        return health_monitor_reason
+
+    async def get_health(self):
+        """show health monitor"""
+        self.logger.debug('Entering get_health method')
+        health_info = await self.axapi_call('health/monitor', 'GET')
+        self.logger.info(health_info)
+        self.logger.debug('Exiting get_health method')
+        return health_info
+
+    async def get_health_stat(self):
+        """show health stat"""
+        self.logger.debug('Entering get_health_stat method')
+        # BROKEN schema::health_stat = await self.axapi_call('health/stat', 'GET')
+        health_stat = await self.clideploy(['show health stat'])
+        self.logger.info(health_stat)
+        self.logger.debug('Exiting get_health_stat method')
+        return health_stat
+
+    async def get_hm_down_reasons(self):
+        list_of_down_reasons = []
+        down_reasons = []
+        commands = 'show health stat'
+        r = await self.clideploy([commands])
+        health_stat = r['command output']
+
+        for line in health_stat:
+            if 'DOWN' in line:
+                pntr = (line.find("/"))
+                list_of_down_reasons.append(line[pntr + 1:pntr + 3])
+        for line in list_of_down_reasons:
+            if re.match('[0-9]', line) is not None:
+                down_reasons.append(line)
+        return list(set(down_reasons))
+
+    async def get_performance(self):
+        """show slb performance"""
+        self.logger.debug('Entering get_performance method')
+        performance = await self.axapi_call('slb/perf/stats', 'GET')
+        self.logger.info(performance)
+        self.logger.debug('Exiting get_performance method')
+        return performance
+
+    async def get_logging_data(self):
+        """show log"""
+        self.logger.debug('Entering get_logging_data method')
+        logging_data = await self.axapi_call('syslog/oper', 'GET')
+        self.logger.info(logging_data)
+        self.logger.debug('Exiting get_logging_data method')
+        return logging_data
+
+    async def get_logging(self):
+        """show log"""
+        self.logger.debug('Entering get_logging method')
+        logging = await self.axapi_call('/logging', 'GET')
+        self.logger.info(logging)
+        self.logger.debug('Exiting get_logging method')
+        return logging
+
+    async def get_management_services(self):
+        """show run enable-management"""
+        self.logger.debug('Entering get_management_services method')
+        management_services = await self.axapi_call('enable-management', 'GET')
+        self.logger.debug('Exiting get_management_services method')
+        return management_services
+
+    async def get_slb_conn_rate_limit_data(self):
+        """show slb conn-rate-limit src-ip statistics"""
+        self.logger.debug('Entering get_slb_conn_rate_limit_data method')
+        slb_conn_rate_limit_data = await self.axapi_call('slb/common/conn-rate-limit', 'GET')
+        self.logger.info(slb_conn_rate_limit_data)
+        self.logger.debug('Exiting get_slb_conn_rate_limit_data method')
+        return slb_conn_rate_limit_data
+
+    async def get_ip_anomaly_drop(self):
+        """show ip anomaly-drop"""
+        self.logger.debug('Entering get_ip_anomaly_drop method')
+        ip_anomaly = await self.axapi_call('ip/anomaly-drop/stats', 'GET')
+        self.logger.info(ip_anomaly)
+        self.logger.debug('Exiting get_ip_anomaly_drop method')
+        return ip_anomaly
+
+    async def get_version(self):
+        """show version"""
+        self.logger.debug('Entering get_version method')
+        version = await self.axapi_call('version/oper', 'GET')
+        self.logger.info(version)
+        self.logger.debug('Exiting get_version method')
+        return version
+
+    async def get_bootimage(self):
+        """show bootimage"""
+        self.logger.debug('Entering get_bootimage method')
+        bootimage = await self.axapi_call('bootimage/oper', 'GET')
+        self.logger.info(bootimage)
+        self.logger.debug('Exiting get_bootimage method')
+        return bootimage
+
+    async def gather(self, getter, names):
+        """runs a per-object coroutine, e.g. get_slb_server_stats, for many objects at once"""
+        return await asyncio.gather(*[getter(name) for name in names])
+
+
+class BlockingAcos(object):
+    """Blocking view of an AsyncAcos, used to run the HealthCheck sections from a worker thread.
+
+    Coroutine methods are submitted to the event loop owning the device and waited on, everything else (partitions,
+    out, build_section_header, pretty_print_json_as_yaml...) is read from and written to the device itself. The
+    device and loop are kept under private names so that device still reads the address of the device.
+    """
+    def __init__(self, device, loop):
+        object.__setattr__(self, '_device', device)
+        object.__setattr__(self, '_loop', loop)
+
+    def __getattr__(self, name):
+        attr = getattr(self._device, name)
+        if asyncio.iscoroutinefunction(attr):
+            def call(*args, **kwargs):
+                return asyncio.run_coroutine_threadsafe(attr(*args, **kwargs), self._loop).result()
+            return call
+        return attr
+
+    def __setattr__(self, name, value):
+        setattr(self._device, name, value)
+
+
+async def run_blocking(device, function, *args, executor=None):
+    """runs function(blocking_device, *args) on a worker thread without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, lambda: function(BlockingAcos(device, loop), *args))
+
+
+async def run_sections(device, methods, wait, executor=None):
+    """runs blocking HealthCheck methods against an AsyncAcos without blocking the event loop"""
+    for method in methods:
+        await asyncio.sleep(wait)
+        await run_blocking(device, method, executor=executor)
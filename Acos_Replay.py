@@ -0,0 +1,113 @@
+'''
+Summary:    This script contains the record/replay backend for the Acos class.
+
+            While recording, every axapi_call/clideploy exchange with a device is written to a capture archive,
+            one gzipped JSON lines file per device (<capture dir>/<device>.jsonl.gz, the same records as
+            Health_Check.py --format jsonl). ReplayAcos serves those responses back in place of the device, so the
+            HealthCheck sections and Health_Check_Interpreter.py can be re-run offline as often as needed without
+            touching the production ADC's control CPU.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import json
+import os
+from urllib.parse import quote, unquote
+from collections import deque
+from Acos import Acos
+from Collection_Writer import CollectionWriter, load_records
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+CAPTURE_SUFFIX = '.jsonl.gz'
+
+
+def capture_path(capture_dir, device):
+    """returns the capture file of a device"""
+    # quoted so host:port device names survive on every file system and can be read back
+    return os.path.join(capture_dir, quote(device, safe='') + CAPTURE_SUFFIX)
+
+
+def captured_devices(capture_dir):
+    """returns the devices that have a capture in capture_dir"""
+    devices = []
+    for name in sorted(os.listdir(capture_dir)):
+        if name.endswith(CAPTURE_SUFFIX):
+            devices.append(unquote(name[:-len(CAPTURE_SUFFIX)]))
+    return devices
+
+
+def exchange_key(partition, method, endpoint, payload):
+    if payload:
+        payload = json.dumps(payload, sort_keys=True)
+    return partition, method, endpoint.strip('/'), payload or ''
+
+
+def open_recorder(capture_dir, device):
+    """returns a writer that records every call of device to its capture file"""
+    os.makedirs(capture_dir, exist_ok=True)
+    recorder = CollectionWriter(capture_path(capture_dir, device.device), 'jsonl')
+    device.call_hooks.append(recorder.write)
+    return recorder
+
+
+class Capture(object):
+    """The recorded exchanges of one device, in the order they happened"""
+    def __init__(self, path):
+        self.path = path
+        self.exchanges = {}
+        for record in load_records(path, 'jsonl'):
+            if record['cached']:
+                # served from the response cache while recording, the device never saw it
+                continue
+            key = exchange_key(record['partition'], record['method'], record['endpoint'], record['payload'])
+            # the recorded body size still holds, nothing is waited for on replay
+            transfer = {'ttfb': 0.0, 'size': record.get('size', 0)}
+            self.exchanges.setdefault(key, deque()).append((record['status'], record['response'], transfer))
+
+    def next(self, key):
+        """returns the next recorded (status, response, transfer) for key, repeating the last one once they run out"""
+        responses = self.exchanges.get(key)
+        if not responses:
+            return None
+        if len(responses) > 1:
+            return responses.popleft()
+        return responses[0]
+
+
+class ReplayAcos(Acos):
+    """Acos backed by a capture archive instead of a device"""
+    def __init__(self, device, username, password, verbose, capture_dir='.', **kwargs):
+        self.capture = Capture(capture_path(capture_dir, device))
+        self.replayed = 0
+        Acos.__init__(self, device, username, password, verbose, **kwargs)
+
+    def build_session(self, pool_size, verify, cert):
+        # nothing is ever sent to the device
+        return None
+
+    def connection_stats(self):
+        return {'requests': self.replayed, 'connections': 0, 'reused': 0}
+
+    def close(self):
+        pass
+
+    def send(self, module, method, payload=''):
+        """serves the recorded response for this call"""
+        module = module.strip('/')
+        self.replayed += 1
+        if module == 'auth':
+            # auth is never recorded, any signature will do
+            return 200, {'authresponse': {'signature': 'replay'}}, None
+        exchange = self.capture.next(exchange_key(self.partition, method, module, payload))
+        if exchange is None:
+            if module == 'logoff' or module.startswith('active-partition/'):
+                return 204, {'HTTP RESPONSE CODE': 'HTTP 204'}, None
+            self.logger.warning('No recorded response for ' + method + ' ' + module + ' in partition ' +
+                                self.partition)
+            return 404, {'response': {'status': 'fail', 'err': {'code': 0, 'msg': 'Not in capture: ' + module}}}, None
+        return exchange
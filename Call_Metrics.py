@@ -0,0 +1,175 @@
+'''
+Summary:    This script contains the per-call instrumentation of the health check. CallMetrics is an Acos call hook
+            that keeps the wall time, time to first byte, response size, HTTP status, partition and section
+            (HealthCheck method) of every AxAPI call, and at the end of a run reports per-endpoint latency
+            percentiles (p50/p95/p99) and histograms, a per-section breakdown and the slowest calls, as text and as
+            a JSON document that can be compared across runs.
+
+            Object names are folded out of endpoints (slb/server/<name>/stats, active-partition/<partition>,
+            show health down-reason <n>...) so a fleet with thousands of objects still reports a handful of
+            endpoints.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import bisect
+import json
+import math
+import re
+import time
+from threading import Lock
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# upper bounds (seconds) of the latency histogram buckets, the last bucket catches everything slower
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (pattern, replacement) applied in order to fold object names out of an endpoint
+ENDPOINT_TEMPLATES = (
+    (re.compile(r'^slb/(server|service-group|virtual-server)/[^/]+/(stats|oper)$'), r'slb/\1/{name}/\2'),
+    (re.compile(r'^active-partition/.+$'), 'active-partition/{partition}'),
+    (re.compile(r'^(clideploy:show health down-reason) \S+$'), r'\1 {reason}'),
+    (re.compile(r'^(clideploy:show interfaces transceiver ethernet) \S+( .*)?$'), r'\1 {ethernet}\2'),
+)
+
+# sections of calls made outside any HealthCheck method (auth, partition list, logoff)
+SETUP_SECTION = '(setup)'
+
+
+def endpoint_name(record):
+    """returns the endpoint of a call record with object names folded out"""
+    endpoint = record['endpoint']
+    if endpoint == 'clideploy' and record['payload']:
+        endpoint = 'clideploy:' + ';'.join(record['payload'].get('CommandList', []))
+    for pattern, replacement in ENDPOINT_TEMPLATES:
+        if pattern.match(endpoint):
+            return pattern.sub(replacement, endpoint)
+    return endpoint
+
+
+def percentile(ordered, fraction):
+    """nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    rank = max(int(math.ceil(fraction * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(calls):
+    """returns the latency, ttfb and size summary of a list of calls"""
+    latencies = sorted(call['latency'] for call in calls)
+    ttfbs = sorted(call['ttfb'] for call in calls)
+    histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+    for latency in latencies:
+        histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+    total_bytes = sum(call['size'] for call in calls)
+    return {'calls': len(calls),
+            'errors': sum(1 for call in calls if call['status'] is not None and call['status'] >= 400),
+            'p50': percentile(latencies, 0.50), 'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99), 'max': latencies[-1] if latencies else None,
+            'total': sum(latencies), 'ttfb_p50': percentile(ttfbs, 0.50), 'ttfb_p95': percentile(ttfbs, 0.95),
+            'bytes': total_bytes, 'mean_bytes': total_bytes // len(calls) if calls else 0,
+            'histogram': dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ['+Inf'], histogram))}
+
+
+class CallMetrics(object):
+    """Collects the timing of every AxAPI call, safe to share between device threads"""
+    def __init__(self, top=10):
+        self.top = top
+        self.lock = Lock()
+        self.calls = []
+        self.cached = 0
+
+    def record(self, record):
+        """keeps the timing of a call, usable directly as an Acos call hook"""
+        if record['cached']:
+            # never reached the device, only counted
+            with self.lock:
+                self.cached += 1
+            return
+        call = {'device': record['device'], 'partition': record['partition'],
+                'section': record['section'] or SETUP_SECTION, 'method': record['method'],
+                'endpoint': endpoint_name(record), 'status': record['status'], 'latency': record['latency'],
+                'ttfb': record.get('ttfb') or 0.0, 'size': record.get('size') or 0,
+                'timestamp': record['timestamp']}
+        with self.lock:
+            self.calls.append(call)
+
+    def group(self, key):
+        groups = {}
+        for call in self.calls:
+            groups.setdefault(key(call), []).append(call)
+        return groups
+
+    def endpoints(self):
+        """returns {endpoint: summary} across every device"""
+        return dict((endpoint, summarize(calls)) for endpoint, calls in
+                    self.group(lambda call: call['endpoint']).items())
+
+    def devices(self):
+        """returns {device: {endpoint: summary}}"""
+        devices = {}
+        for (device, endpoint), calls in self.group(lambda call: (call['device'], call['endpoint'])).items():
+            devices.setdefault(device, {})[endpoint] = summarize(calls)
+        return devices
+
+    def sections(self):
+        """returns {section: summary} with the slowest endpoint of each section"""
+        sections = {}
+        for section, calls in self.group(lambda call: call['section']).items():
+            summary = summarize(calls)
+            by_endpoint = {}
+            for call in calls:
+                by_endpoint[call['endpoint']] = by_endpoint.get(call['endpoint'], 0.0) + call['latency']
+            summary['slowest_endpoint'] = max(by_endpoint, key=by_endpoint.get)
+            sections[section] = summary
+        return sections
+
+    def slowest(self):
+        """returns the top slowest calls"""
+        return sorted(self.calls, key=lambda call: call['latency'], reverse=True)[:self.top]
+
+    def report(self):
+        """returns the whole run as a json serializable document"""
+        with self.lock:
+            return {'generated': time.time(), 'calls': len(self.calls), 'cached': self.cached,
+                    'buckets': list(LATENCY_BUCKETS), 'endpoints': self.endpoints(), 'sections': self.sections(),
+                    'devices': self.devices(), 'slowest': self.slowest()}
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_report(self, out):
+        """writes the per-endpoint, per-section and slowest call tables"""
+        report = self.report()
+        ms = lambda seconds: '-' if seconds is None else '{:.1f}'.format(seconds * 1000)
+
+        out.write('AxAPI calls: ' + str(report['calls']) + ' sent, ' + str(report['cached']) +
+                  ' served from the response cache\n\n')
+        out.write('{:<60} {:>6} {:>5} {:>8} {:>8} {:>8} {:>8} {:>10}\n'.format(
+            'Endpoint', 'Calls', 'Err', 'p50 ms', 'p95 ms', 'p99 ms', 'TTFB ms', 'Bytes'))
+        endpoints = report['endpoints']
+        for endpoint in sorted(endpoints, key=lambda name: endpoints[name]['total'], reverse=True):
+            summary = endpoints[endpoint]
+            out.write('{:<60} {:>6} {:>5} {:>8} {:>8} {:>8} {:>8} {:>10}\n'.format(
+                endpoint[:60], summary['calls'], summary['errors'], ms(summary['p50']), ms(summary['p95']),
+                ms(summary['p99']), ms(summary['ttfb_p50']), summary['bytes']))
+
+        out.write('\n{:<32} {:>6} {:>10} {:>10}  {}\n'.format('Section', 'Calls', 'Total ms', 'Bytes',
+                                                             'Slowest endpoint'))
+        sections = report['sections']
+        for section in sorted(sections, key=lambda name: sections[name]['total'], reverse=True):
+            summary = sections[section]
+            out.write('{:<32} {:>6} {:>10} {:>10}  {}\n'.format(section, summary['calls'], ms(summary['total']),
+                                                                summary['bytes'], summary['slowest_endpoint']))
+
+        out.write('\nSlowest calls:\n')
+        for call in report['slowest']:
+            out.write('{:>10} ms  {:<22} {:<12} {:<28} {}\n'.format(ms(call['latency']), call['device'][:22],
+                                                                   call['partition'][:12], call['section'][:28],
+                                                                   call['endpoint']))
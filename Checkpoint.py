@@ -0,0 +1,130 @@
+'''
+Summary:    This script contains the checkpoint behind Health_Check.py --checkpoint/--resume. The report output of every
+            completed unit of work, a HealthCheck method run in one partition or a whole method as it reads in the
+            report, is written to disk as it is produced. A unit is only complete once its manifest is written, so a
+            run that dies halfway leaves the finished units behind and nothing half written. A resumed run replays
+            the completed units into the report and only collects the ones that are missing.
+
+                <checkpoint>/<device>/<method>@<partition>.txt     report text of the unit
+                <checkpoint>/<device>/<method>@<partition>.json    section boundaries, written last
+
+            A whole method is stored with an empty partition, e.g. sessions_check@.txt next to sessions_check@P1.txt.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import json
+import os
+import shutil
+from urllib.parse import quote
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+READ_SIZE = 1024 * 1024
+
+
+class UnitRecorder(object):
+    """Passes the report output of one unit on to the device output stream and records it to the checkpoint"""
+    def __init__(self, stream, path):
+        self.stream = stream
+        self.path = path
+        self.temporary = path + '.txt.' + str(os.getpid()) + '.tmp'
+        self.file = open(self.temporary, 'w', newline='')
+        self.size = 0
+        # [[offset, section name]]
+        self.sections = []
+
+    def write(self, text):
+        self.stream.write(text)
+        self.file.write(text)
+        self.size += len(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def begin_section(self, name):
+        if hasattr(self.stream, 'begin_section'):
+            self.stream.begin_section(name)
+        self.sections.append([self.size, name])
+
+    def commit(self):
+        """marks the unit complete"""
+        self.file.close()
+        os.replace(self.temporary, self.path + '.txt')
+        with open(self.path + '.json.tmp', 'w') as f:
+            json.dump({'size': self.size, 'sections': self.sections}, f)
+        os.replace(self.path + '.json.tmp', self.path + '.json')
+
+    def discard(self):
+        self.file.close()
+        os.remove(self.temporary)
+
+
+class Checkpoint(object):
+    """Completed units of work of every device, kept under root"""
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.recorded = 0
+        self.replayed = 0
+
+    def device_dir(self, device):
+        path = os.path.join(self.root, quote(device, safe=''))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def unit_path(self, device, method, partition=None):
+        return os.path.join(self.device_dir(device), quote(method, safe='') + '@' + quote(partition or '', safe=''))
+
+    def done(self, device, method, partition=None):
+        return os.path.exists(self.unit_path(device, method, partition) + '.json')
+
+    def complete(self, device, methods):
+        """returns True when every method of the device is done"""
+        return all(self.done(device, method) for method in methods)
+
+    def clear(self, device):
+        """forgets the units of a device, for a run that starts over"""
+        shutil.rmtree(self.device_dir(device))
+
+    def clean(self, device):
+        """removes the partly written units an interrupted run left behind"""
+        path = self.device_dir(device)
+        for name in os.listdir(path):
+            if name.endswith('.tmp'):
+                os.remove(os.path.join(path, name))
+
+    def record(self, device, method, partition, stream):
+        """returns a stream that records the unit while passing its output on to stream, see commit()"""
+        return UnitRecorder(stream, self.unit_path(device, method, partition))
+
+    def commit(self, recorder, succeeded):
+        """keeps the unit of a recorder when it succeeded, otherwise it is collected again on resume"""
+        if succeeded:
+            recorder.commit()
+            self.recorded += 1
+        else:
+            recorder.discard()
+
+    def replay(self, device, method, partition, stream):
+        """writes a completed unit to stream, starting its sections when stream is an archive member"""
+        path = self.unit_path(device, method, partition)
+        with open(path + '.json') as f:
+            manifest = json.load(f)
+        position = 0
+        with open(path + '.txt', newline='') as f:
+            for offset, name in manifest['sections'] + [[manifest['size'], None]]:
+                while position < offset:
+                    text = f.read(min(READ_SIZE, offset - position))
+                    if not text:
+                        break
+                    stream.write(text)
+                    position += len(text)
+                if name is not None and hasattr(stream, 'begin_section'):
+                    stream.begin_section(name)
+        self.replayed += 1
@@ -0,0 +1,97 @@
+'''
+Summary:    This script contains the machine-readable collection output of the health check. Every AxAPI response
+            is written as one record holding the device, partition, section (HealthCheck method), endpoint,
+            timestamp, latency and the raw response, either as JSON lines or as a stream of msgpack maps.
+
+            load_records() reads a collection back in a single pass, index_records() turns it into
+            {device: {(partition, endpoint): response}} for analysis such as Health_Check_Interpreter.py.
+
+Requires:
+            - msgpack (only for the msgpack format)
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import gzip
+import json
+from threading import Lock
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+FORMATS = ('jsonl', 'msgpack')
+
+
+def open_file(path, mode):
+    """opens a collection file, transparently gzipped when the name ends in .gz"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+class CollectionWriter(object):
+    """Writes one record per AxAPI response, safe to share between device threads"""
+    def __init__(self, path, format='jsonl'):
+        if format not in FORMATS:
+            raise ValueError('Unknown collection format: ' + format)
+        self.path = path
+        self.format = format
+        self.lock = Lock()
+        self.records = 0
+        if format == 'msgpack':
+            import msgpack
+            self.packer = msgpack.Packer(use_bin_type=True)
+            self.file = open_file(path, 'wb')
+        else:
+            self.file = open_file(path, 'wt')
+
+    def encode(self, record):
+        if self.format == 'msgpack':
+            return self.packer.pack(record)
+        return json.dumps(record, separators=(',', ':')) + '\n'
+
+    def write(self, record):
+        """writes a record, usable directly as an Acos call hook"""
+        data = self.encode(record)
+        with self.lock:
+            self.file.write(data)
+            self.records += 1
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+def detect_format(path):
+    if '.msgpack' in path or '.mpk' in path:
+        return 'msgpack'
+    return 'jsonl'
+
+
+def load_records(path, format=None):
+    """yields the records of a collection file in the order they were written"""
+    format = format or detect_format(path)
+    if format == 'msgpack':
+        import msgpack
+        with open_file(path, 'rb') as f:
+            for record in msgpack.Unpacker(f, raw=False):
+                yield record
+    else:
+        with open_file(path, 'rt') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def index_records(records):
+    """returns {device: {(partition, endpoint): response}}, keeping the last response seen for each key"""
+    index = {}
+    for record in records:
+        key = (record['partition'], record['endpoint'])
+        if record['endpoint'] == 'clideploy' and record['payload']:
+            key = (record['partition'], 'clideploy:' + ';'.join(record['payload'].get('CommandList', [])))
+        index.setdefault(record['device'], {})[key] = record['response']
+    return index
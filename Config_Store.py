@@ -0,0 +1,150 @@
+'''
+Summary:    This script contains the local store behind incremental config collection. Before the startup, running
+            or json config of a device is downloaded, a cheap probe (Acos.get_config_stamps, show running-config
+            partition-config all | include Configuration last) returns the "last updated" and "last saved" stamps
+            of every partition. When the stamps match the ones recorded with the stored copy, nothing changed and
+            the download is skipped.
+
+            Configs are stored content-addressed: the text is split into its '!' separated sections (top-level keys
+            for the json config), every section is kept once as a gzipped object named after its sha256, and a small
+            manifest per device and config lists the section hashes in order. A changed config therefore only adds
+            the sections that changed, and any stored config can be put back together with restore().
+
+                <store>/objects/ab/ab12...gz
+                <store>/<device>/running.json      manifest of the last collected running config
+                <store>/<device>/history.jsonl     one line per collection: when, what changed
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import gzip
+import hashlib
+import json
+import os
+import time
+from urllib.parse import quote
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# probe lines that change with each kind of config
+PROBE_MARKERS = {'running': 'last updated', 'json': 'last updated', 'startup': 'last saved'}
+
+
+def fingerprint(probe_output, kind):
+    """returns the sha256 of the probe lines that change with this kind of config, or None when there are none"""
+    marker = PROBE_MARKERS[kind]
+    lines = [line.strip() for line in probe_output.splitlines() if marker in line]
+    if not lines:
+        return None
+    return hashlib.sha256('\n'.join(lines).encode()).hexdigest()
+
+
+def split_sections(text, kind):
+    """returns the sections of a config, which joined back together give the original text"""
+    if kind == 'json':
+        try:
+            config = json.loads(text)
+        except ValueError:
+            return [text]
+        if isinstance(config, dict):
+            # one section per top level key, restore() rebuilds the document from them
+            return [json.dumps({key: value}) for key, value in config.items()]
+        return [text]
+    sections = []
+    start = 0
+    while True:
+        end = text.find('\n!', start)
+        if end < 0:
+            sections.append(text[start:])
+            return sections
+        # keep the separator line with the section it closes
+        end = text.find('\n', end + 2)
+        if end < 0:
+            sections.append(text[start:])
+            return sections
+        sections.append(text[start:end + 1])
+        start = end + 1
+
+
+def join_sections(sections, kind):
+    if kind == 'json' and all(section.startswith('{') for section in sections):
+        config = {}
+        for section in sections:
+            config.update(json.loads(section))
+        return json.dumps(config)
+    return ''.join(sections)
+
+
+class ConfigStore(object):
+    """Content-addressed store of the configs collected from each device"""
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+
+    def device_dir(self, device):
+        path = os.path.join(self.root, quote(device, safe=''))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest + '.gz')
+
+    def manifest(self, device, kind):
+        """returns the manifest of the last stored config, or None"""
+        try:
+            with open(os.path.join(self.device_dir(device), kind + '.json')) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return None
+
+    def unchanged(self, device, kind, probe_output):
+        """returns the stored manifest when the probe shows the config did not change since it was stored"""
+        current = fingerprint(probe_output, kind)
+        manifest = self.manifest(device, kind)
+        if current is None or manifest is None or manifest.get('fingerprint') != current:
+            return None
+        return manifest
+
+    def save(self, device, kind, text, probe_output):
+        """stores a config, writing only the sections not stored yet, and returns (changed, total) sections"""
+        previous = self.manifest(device, kind)
+        previous_sections = set(previous['sections']) if previous else set()
+        digests = []
+        for section in split_sections(text, kind):
+            data = section.encode()
+            digest = hashlib.sha256(data).hexdigest()
+            digests.append(digest)
+            path = self.object_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary = path + '.' + str(os.getpid()) + '.tmp'
+                with gzip.open(temporary, 'wb') as f:
+                    f.write(data)
+                os.replace(temporary, path)
+        changed = [digest for digest in digests if digest not in previous_sections]
+        removed = len(previous_sections - set(digests))
+        manifest = {'device': device, 'kind': kind, 'collected': time.time(),
+                    'fingerprint': fingerprint(probe_output, kind), 'bytes': len(text), 'sections': digests}
+        path = os.path.join(self.device_dir(device), kind + '.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(path + '.tmp', path)
+        with open(os.path.join(self.device_dir(device), 'history.jsonl'), 'a') as f:
+            f.write(json.dumps({'collected': manifest['collected'], 'kind': kind, 'sections': len(digests),
+                                'changed': changed, 'removed': removed}) + '\n')
+        return len(changed), len(digests)
+
+    def restore(self, device, kind):
+        """returns the last stored config text, or None"""
+        manifest = self.manifest(device, kind)
+        if manifest is None:
+            return None
+        sections = []
+        for digest in manifest['sections']:
+            with gzip.open(self.object_path(digest), 'rb') as f:
+                sections.append(f.read().decode())
+        return join_sections(sections, kind)
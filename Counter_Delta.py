@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+
+'''
+Summary:
+    Vectorized snapshot-delta engine for the cumulative counters returned by AxAPI (interface/ethernet/stats,
+    network/vlan/stats, interface/trunk/stats, slb/switch/stats and the SLB server/service-group/virtual-server
+    stats). Each snapshot becomes an objects x counters uint64 matrix, snapshots are aligned on the union of their
+    objects and counters, and the deltas and rates of every counter between consecutive snapshots are computed at
+    once with NumPy.
+
+    Only integers are counters: a float, string or boolean value is left out of the snapshot rather than cast.
+    A counter that went backwards either wrapped or was reset. When its previous value was close to the top of the
+    32-bit or 64-bit range it wrapped and the delta is taken modulo that range, otherwise it was cleared (reboot,
+    clear counters) and the new value is the delta since the reset. Both cases are flagged.
+
+    CounterRates is an Acos call hook that keeps the running deltas of every series polled by
+    Health_Check_Collector.py --counter-rates. Run on its own, Counter_Delta.py reads collection records
+    (Health_Check.py --format, Health_Check_Collector.py) and reports the fastest moving counters of every device,
+    partition and endpoint with two or more snapshots:
+
+        ./Counter_Delta.py collector_20261016-101500.jsonl --top 20
+
+Requires:
+    - numpy
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import argparse
+import itertools
+import operator
+import re
+import threading
+import numpy as np
+from Collection_Writer import load_records
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# a counter that went backwards from at least this fraction of its range wrapped rather than being reset
+WRAP_THRESHOLD = 0.75
+MAX32 = 2 ** 32
+MAX64 = 2 ** 64
+WRAP32_FLOOR = np.uint64(int(MAX32 * WRAP_THRESHOLD))
+WRAP64_FLOOR = np.uint64(int(2 ** 64 * WRAP_THRESHOLD))
+MASK32 = np.uint64(MAX32 - 1)
+
+# fields holding current values or rates rather than cumulative counts
+GAUGE = re.compile(r'per-sec|per_sec|curr|peak|bandwidth|usage|state')
+# keys naming the object of a list entry, in order of preference
+OBJECT_KEYS = ('name', 'ifnum', 'vlan-num', 'trunk-number', 'port-number')
+
+ENDPOINTS = ('interface/ethernet/stats', 'network/vlan/stats', 'interface/trunk/stats', 'slb/switch/stats',
+             'slb/server/stats', 'slb/service-group/stats', 'slb/virtual-server/stats')
+
+
+def object_name(entry, default):
+    for key in OBJECT_KEYS:
+        if key in entry:
+            return str(entry[key])
+    return default
+
+
+def stats_entries(response):
+    """returns [(object name, stats dict)] from a list-level or single object stats response"""
+    if not isinstance(response, dict) or len(response) != 1:
+        return []
+    root_key, root = next(iter(response.items()))
+    if root_key.endswith('-list') and isinstance(root, list):
+        return [(object_name(entry, str(n)), entry['stats']) for n, entry in enumerate(root)
+                if isinstance(entry, dict) and isinstance(entry.get('stats'), dict)]
+    if isinstance(root, dict) and isinstance(root.get('stats'), dict):
+        return [(object_name(root, root_key), root['stats'])]
+    return []
+
+
+def is_counter(value):
+    """returns whether value can be a counter: an integer in the uint64 range, never a bool, float or string"""
+    return type(value) is int and 0 <= value < MAX64
+
+
+def counter_fields(entries, gauges):
+    """returns the counter fields found in the stats of entries, in order of appearance"""
+    counters = []
+    seen = set()
+    for name, stats in entries:
+        for counter, value in stats.items():
+            if counter not in seen and type(value) is int and not (gauges and gauges.search(counter)):
+                seen.add(counter)
+                counters.append(counter)
+    return counters
+
+
+class Snapshot(object):
+    """The counters of a set of objects at one point in time"""
+    def __init__(self, objects, counters, values, present, timestamp):
+        self.objects = objects
+        self.counters = counters
+        self.values = values
+        # None when every object has every counter
+        self.present = present
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_response(cls, response, timestamp, gauges=GAUGE):
+        """builds a snapshot from a stats response, leaving out the gauge fields"""
+        entries = stats_entries(response)
+        objects = [name for name, stats in entries]
+        rows = len(entries)
+
+        # every object of a list normally has the same fields as the first one. Then the values are gathered in
+        # one pass and copied into the array, a missing, extra or non counter field sends us down the slow path
+        fields = len(entries[0][1]) if entries else 0
+        counters = counter_fields(entries[:1], gauges)
+        if counters and all(len(stats) == fields for name, stats in entries):
+            row_values = operator.itemgetter(*counters)
+            if len(counters) == 1:
+                row_values = lambda stats, key=counters[0]: (stats[key],)
+            try:
+                flat = list(itertools.chain.from_iterable(map(row_values, (stats for name, stats in entries))))
+                # numpy would cast a float, bool or numeric string to uint64 without a word
+                if set(map(type, flat)) == {int}:
+                    values = np.fromiter(flat, dtype=np.uint64, count=len(flat))
+                    return cls(objects, counters, values.reshape(rows, len(counters)), None, timestamp)
+            except (KeyError, OverflowError):
+                pass
+
+        counters = counter_fields(entries, gauges)
+        values = np.zeros((rows, len(counters)), dtype=np.uint64)
+        present = np.zeros((rows, len(counters)), dtype=bool)
+        position = dict((counter, n) for n, counter in enumerate(counters))
+        for row, (name, stats) in enumerate(entries):
+            for counter, value in stats.items():
+                column = position.get(counter)
+                if column is not None and is_counter(value):
+                    values[row, column] = value
+                    present[row, column] = True
+        return cls(objects, counters, values, present, timestamp)
+
+    def reindex(self, objects, counters, object_position, counter_position):
+        """returns (values, present) laid out on the given objects and counters"""
+        if self.objects == objects and self.counters == counters:
+            present = self.present if self.present is not None else np.ones(self.values.shape, dtype=bool)
+            return self.values, present
+        values = np.zeros((len(objects), len(counters)), dtype=np.uint64)
+        present = np.zeros((len(objects), len(counters)), dtype=bool)
+        rows = np.array([object_position[name] for name in self.objects], dtype=np.intp)
+        columns = np.array([counter_position[counter] for counter in self.counters], dtype=np.intp)
+        if len(rows) and len(columns):
+            grid = np.ix_(rows, columns)
+            values[grid] = self.values
+            present[grid] = True if self.present is None else self.present
+        return values, present
+
+
+class Deltas(object):
+    """Deltas and rates between consecutive snapshots, shaped (intervals, objects, counters)"""
+    def __init__(self, objects, counters, timestamps, delta, rate, valid, wrapped, reset):
+        self.objects = objects
+        self.counters = counters
+        self.timestamps = timestamps
+        self.delta = delta
+        self.rate = rate
+        self.valid = valid
+        self.wrapped = wrapped
+        self.reset = reset
+
+    def total(self):
+        """returns the delta over the whole series and the average rate, shaped (objects, counters)"""
+        delta = np.where(self.valid, self.delta, 0).sum(axis=0, dtype=np.uint64)
+        elapsed = self.timestamps[-1] - self.timestamps[0]
+        rate = delta.astype(np.float64) / elapsed if elapsed > 0 else np.zeros(delta.shape)
+        return delta, rate
+
+    def top(self, n=10):
+        """returns the n fastest moving (object, counter, average rate, total delta)"""
+        delta, rate = self.total()
+        return fastest(self.objects, self.counters, delta, rate, n)
+
+
+def fastest(objects, counters, delta, rate, n):
+    """returns the n (object, counter, rate, delta) with the highest rate, rate and delta shaped (objects, counters)"""
+    flat = rate.ravel()
+    n = min(n, flat.size)
+    if n == 0:
+        return []
+    best = np.argpartition(flat, -n)[-n:]
+    best = best[np.argsort(flat[best])[::-1]]
+    columns = len(counters)
+    return [(objects[i // columns], counters[i % columns], float(flat[i]), int(delta.flat[i])) for i in best]
+
+
+def compute_deltas(snapshots):
+    """returns the Deltas of two or more snapshots taken in time order"""
+    if len(snapshots) < 2:
+        raise ValueError('At least two snapshots are needed to compute deltas')
+    objects = list(snapshots[0].objects)
+    counters = list(snapshots[0].counters)
+    if any(snapshot.objects != objects or snapshot.counters != counters for snapshot in snapshots[1:]):
+        # objects or counters came and went, lay every snapshot out on the union of them
+        object_position = dict((name, n) for n, name in enumerate(objects))
+        counter_position = dict((counter, n) for n, counter in enumerate(counters))
+        for snapshot in snapshots[1:]:
+            for name in snapshot.objects:
+                if name not in object_position:
+                    object_position[name] = len(objects)
+                    objects.append(name)
+            for counter in snapshot.counters:
+                if counter not in counter_position:
+                    counter_position[counter] = len(counters)
+                    counters.append(counter)
+    else:
+        object_position = counter_position = None
+    laid_out = [snapshot.reindex(objects, counters, object_position, counter_position) for snapshot in snapshots]
+    values = np.stack([values for values, present in laid_out])
+    present = np.stack([present for values, present in laid_out])
+    timestamps = np.array([snapshot.timestamp for snapshot in snapshots], dtype=np.float64)
+
+    previous = values[:-1]
+    current = values[1:]
+    valid = present[:-1] & present[1:]
+    backwards = current < previous
+    wrapped32 = backwards & (previous >= WRAP32_FLOOR) & (previous < np.uint64(MAX32))
+    wrapped64 = backwards & (previous >= WRAP64_FLOOR)
+    reset = backwards & ~wrapped32 & ~wrapped64
+    # uint64 subtraction is modulo 2**64, which already is the delta of a 64-bit wrap
+    delta = current - previous
+    np.bitwise_and(delta, MASK32, out=delta, where=wrapped32)
+    np.copyto(delta, current, where=reset)
+    if not valid.all():
+        np.copyto(delta, np.uint64(0), where=~valid)
+
+    elapsed = np.diff(timestamps)[:, None, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(elapsed > 0, delta.astype(np.float64) / elapsed, 0.0)
+    return Deltas(objects, counters, timestamps, delta, rate, valid, wrapped32 | wrapped64, reset & valid)
+
+
+def positions(names, known, position):
+    """returns the positions of names in known, appending the ones not seen before"""
+    for name in names:
+        if name not in position:
+            position[name] = len(known)
+            known.append(name)
+    return np.array([position[name] for name in names], dtype=np.intp)
+
+
+class RunningDeltas(object):
+    """The deltas of a series of snapshots added one at a time, summed on every object and counter seen so far
+
+    Only the last snapshot is kept, so a series polled for days costs one snapshot and one objects x counters
+    matrix of totals.
+    """
+    def __init__(self, snapshot):
+        self.first = snapshot.timestamp
+        self.last = snapshot
+        self.snapshots = 1
+        self.objects = []
+        self.counters = []
+        self.object_position = {}
+        self.counter_position = {}
+        self.delta = np.zeros((0, 0), dtype=np.uint64)
+        self.wrapped = 0
+        self.reset = 0
+
+    def add(self, snapshot):
+        """adds the deltas between the last snapshot and snapshot, which must be newer"""
+        deltas = compute_deltas([self.last, snapshot])
+        rows = positions(deltas.objects, self.objects, self.object_position)
+        columns = positions(deltas.counters, self.counters, self.counter_position)
+        if self.delta.shape != (len(self.objects), len(self.counters)):
+            grown = np.zeros((len(self.objects), len(self.counters)), dtype=np.uint64)
+            grown[:self.delta.shape[0], :self.delta.shape[1]] = self.delta
+            self.delta = grown
+        self.delta[np.ix_(rows, columns)] += deltas.delta[0]
+        self.wrapped += int(deltas.wrapped.sum())
+        self.reset += int(deltas.reset.sum())
+        self.last = snapshot
+        self.snapshots += 1
+
+    def elapsed(self):
+        return self.last.timestamp - self.first
+
+    def top(self, n=10):
+        """returns the n fastest moving (object, counter, average rate, total delta)"""
+        elapsed = self.elapsed()
+        rate = self.delta.astype(np.float64) / elapsed if elapsed > 0 else np.zeros(self.delta.shape)
+        return fastest(self.objects, self.counters, self.delta, rate, n)
+
+
+class CounterRates(object):
+    """Keeps the RunningDeltas of every (device, partition, endpoint), usable directly as an Acos call hook"""
+    def __init__(self, endpoints=ENDPOINTS):
+        self.endpoints = endpoints
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def record(self, record):
+        if record['endpoint'] not in self.endpoints or record['status'] != 200 or record['cached']:
+            return
+        snapshot = Snapshot.from_response(record['response'], record['timestamp'])
+        key = (record['device'], record['partition'], record['endpoint'])
+        with self.lock:
+            running = self.series.get(key)
+            if running is None:
+                self.series[key] = RunningDeltas(snapshot)
+                return
+        # the calls of a device are made one at a time, so nothing else adds to this series meanwhile
+        running.add(snapshot)
+
+    def print_top(self, n=10):
+        """prints the fastest moving counters of every series with two or more snapshots"""
+        for (device, partition, endpoint), running in sorted(self.series.items()):
+            if running.snapshots < 2:
+                continue
+            print_series(device, partition, endpoint, running.snapshots, running.elapsed(), running.objects,
+                         running.counters, running.wrapped, running.reset, running.top(n))
+
+
+def print_series(device, partition, endpoint, snapshots, elapsed, objects, counters, wrapped, reset, top):
+    print(device + ' ' + partition + ' ' + endpoint + ': ' + str(snapshots) + ' snapshots over ' +
+          '{:.1f}'.format(elapsed) + 's, ' + str(len(objects)) + ' objects x ' + str(len(counters)) + ' counters, ' +
+          str(wrapped) + ' wrapped, ' + str(reset) + ' reset')
+    for name, counter, rate, delta in top:
+        print('    {:<32} {:<40} {:>16.2f}/s {:>20}'.format(name[:32], counter[:40], rate, delta))
+    print('')
+
+
+def snapshot_series(records, endpoints=ENDPOINTS):
+    """returns {(device, partition, endpoint): [Snapshot]} from collection records, in time order"""
+    series = {}
+    for record in records:
+        if record['endpoint'] in endpoints and record['status'] == 200 and not record['cached']:
+            key = (record['device'], record['partition'], record['endpoint'])
+            series.setdefault(key, []).append(Snapshot.from_response(record['response'], record['timestamp']))
+    for snapshots in series.values():
+        snapshots.sort(key=lambda snapshot: snapshot.timestamp)
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Computes counter deltas and rates from collection records.')
+    parser.add_argument('collection', help='Collection file written by Health_Check.py --format or Health_Check_Collector.py')
+    parser.add_argument('--top', default=10, type=int, help='Fastest moving counters listed per device, partition and endpoint (default: 10)')
+    parser.add_argument('--endpoint', default=None, help='Only this endpoint, e.g. slb/server/stats (default: ' + ', '.join(ENDPOINTS) + ')')
+    args = parser.parse_args()
+
+    endpoints = (args.endpoint,) if args.endpoint else ENDPOINTS
+    series = snapshot_series(load_records(args.collection), endpoints)
+    for (device, partition, endpoint), snapshots in sorted(series.items()):
+        if len(snapshots) < 2:
+            continue
+        deltas = compute_deltas(snapshots)
+        print_series(device, partition, endpoint, len(snapshots), deltas.timestamps[-1] - deltas.timestamps[0],
+                     deltas.objects, deltas.counters, int(deltas.wrapped.sum()), int(deltas.reset.sum()),
+                     deltas.top(args.top))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+
+'''
+Summary:
+    Local stand-in for the AxAPI v3 interface of an A10 device. It serves canned responses for every endpoint used
+    by the Acos class so the health check, the async client and the interpreter can be exercised without touching a
+    real ADC.
+
+    The stand-in speaks plain HTTP, so point the scripts at it with --protocol http, e.g.
+
+        ./Fake_Axapi.py --port 8080 &
+        ./Health_Check.py -d 127.0.0.1:8080 --protocol http -w 0
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+NOT_FOUND = {'response': {'status': 'fail', 'err': {'code': 1023460352, 'msg': 'Object not found'}}}
+INVALID_SESSION = {'response': {'status': 'fail', 'err': {'code': 1009, 'msg': 'Invalid session ID'}}}
+UNAVAILABLE = {'response': {'status': 'fail', 'err': {'code': 503, 'msg': 'Service unavailable'}}}
+
+# per-object stats, e.g. slb/server/s1/stats
+OBJECT_STATS = re.compile(r'^slb/(server|service-group|virtual-server)/([^/]+)/stats$')
+
+
+class FakeDevice(object):
+    """canned state of the device served by the stand-in"""
+    def __init__(self, partitions=1, latency=0.0, servers=3, service_groups=2, virtual_servers=2,
+                 session_timeout=0.0, failing=(), flaky=0.0):
+        self.latency = latency
+        # endpoints (or clideploy commands) always answered with a 503, and the share of other requests that get one
+        self.failing = set(failing)
+        self.flaky = flaky
+        # seconds a session may sit idle before its token is rejected, 0 keeps sessions forever
+        self.session_timeout = session_timeout
+        self.partitions = ['shared'] + ['P' + str(n) for n in range(1, partitions + 1)]
+        # number of slb objects of each kind in every partition
+        self.counts = {'rs': servers, 'sg': service_groups, 'vip': virtual_servers}
+        # (prefix, partition) -> object names, built once so large object counts stay cheap to serve
+        self.names = {}
+        # stamped into the config headers, change it to make the configuration look updated or saved
+        self.config_updated = time.strftime('%H:%M:%S UTC %a %b %d %Y')
+        self.config_saved = self.config_updated
+        # token -> active partition
+        self.sessions = {}
+        # token -> time of the last request made with it
+        self.last_used = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def fault(self, path, payload=None):
+        """returns True when a request should be answered with a 503"""
+        if path in self.failing:
+            return True
+        if path == 'clideploy' and payload and self.failing.intersection(payload.get('CommandList', [])):
+            return True
+        return self.flaky > 0 and random.random() < self.flaky
+
+    def object_names(self, prefix, partition):
+        names = self.names.get((prefix, partition))
+        if names is None:
+            names = [prefix + '-' + partition + '-' + str(n) for n in range(1, self.counts[prefix] + 1)]
+            self.names[(prefix, partition)] = names
+        return names
+
+    def servers(self, partition):
+        return self.object_names('rs', partition)
+
+    def service_groups(self, partition):
+        return self.object_names('sg', partition)
+
+    def virtual_servers(self, partition):
+        return self.object_names('vip', partition)
+
+    def login(self):
+        token = uuid.uuid4().hex
+        with self.lock:
+            self.sessions[token] = 'shared'
+            self.last_used[token] = time.monotonic()
+        return token
+
+    def logoff(self, token):
+        with self.lock:
+            self.sessions.pop(token, None)
+            self.last_used.pop(token, None)
+
+    def valid(self, token):
+        """returns whether token belongs to a live session, expiring it when it sat idle for too long"""
+        with self.lock:
+            if token not in self.sessions:
+                return False
+            now = time.monotonic()
+            if self.session_timeout and now - self.last_used[token] > self.session_timeout:
+                del self.sessions[token]
+                del self.last_used[token]
+                return False
+            self.last_used[token] = now
+            return True
+
+    def get(self, path, partition):
+        """returns the json body for a GET, or None when the path is unknown"""
+        match = OBJECT_STATS.match(path)
+        if match:
+            return self.object_stats(match.group(1), match.group(2), partition)
+        handler = GET_HANDLERS.get(path.strip('/'))
+        if handler is None:
+            return None
+        return handler(self, partition)
+
+    def object_stats(self, kind, name, partition):
+        names = {'server': self.servers, 'service-group': self.service_groups,
+                 'virtual-server': self.virtual_servers}[kind](partition)
+        if name not in names:
+            return None
+        return {kind: self.object_entry(kind, name)}
+
+    def object_entry(self, kind, name):
+        stats = {'curr-conn': 3, 'total-conn': 1024, 'fwd-pkt': 20480, 'rev-pkt': 19876, 'peak-conn': 17}
+        return {'name': name, 'stats': stats}
+
+    def clideploy(self, commands, partition):
+        """returns the plain text output of a list of cli commands"""
+        if len(commands) == 1:
+            return self.cli_output(commands[0], partition)
+        # like ACOS, several commands are each echoed after the prompt
+        prompt = 'fake-adc' + ('' if partition == 'shared' else '[' + partition + ']') + '#'
+        output = []
+        for command in commands:
+            output.append(prompt + command + '\r\n' + self.cli_output(command, partition))
+        return '\r\n'.join(output)
+
+    def cli_output(self, command, partition):
+        command, separator, include = command.partition(' | include ')
+        output = self.command_output(command, partition)
+        if separator:
+            output = '\r\n'.join(line for line in output.split('\r\n') if include in line)
+        return output
+
+    def config(self, partitions):
+        """returns the configuration text of the given partitions"""
+        lines = ['!Current configuration: 1024 bytes',
+                 '!Configuration last updated at ' + self.config_updated,
+                 '!Configuration last saved at ' + self.config_saved,
+                 '!', 'hostname fake-adc', '!']
+        for partition in partitions:
+            if partition != 'shared':
+                lines += ['active-partition ' + partition, '!']
+            for n, server in enumerate(self.servers(partition)):
+                lines += ['slb server ' + server + ' 10.0.' + str(n // 250) + '.' + str(n % 250 + 1),
+                          '  port 80 tcp', '!']
+        lines.append('end')
+        return '\r\n'.join(lines)
+
+    def command_output(self, command, partition):
+        if command.startswith('show health stat'):
+            lines = ['Health monitor statistics for partition ' + partition,
+                     'IP address       Port  Health monitor  Status     Cause(Up/Down) Retry PinHoles',
+                     '--------------------------------------------------------------------------------']
+            for n, server in enumerate(self.servers(partition)):
+                status = 'DOWN' if n == 0 else 'UP'
+                lines.append('10.0.0.' + str(n + 1) + '        80    default         ' + status +
+                             '       0 /15         0     No')
+            return '\r\n'.join(lines)
+        if command.startswith('show health down-reason'):
+            return 'Down reason ' + command.split()[-1] + ': TCP connection refused'
+        if command.startswith('show running') or command.startswith('show startup-config'):
+            if 'all' in command.split():
+                return self.config(self.partitions)
+            return self.config([partition])
+        if command.startswith('show json-config'):
+            return json.dumps({'hostname': {'value': 'fake-adc'}})
+        return command + '\r\nfake-adc output for "' + command + '" in partition ' + partition
+
+
+def counters(*names):
+    return dict((name, 1000 * (n + 1)) for n, name in enumerate(names))
+
+
+def get_partition_list(device, partition):
+    return {'partition-list': [{'partition-name': name} for name in device.partitions[1:]]}
+
+
+def get_vrrpa(device, partition):
+    return {'vrrp-a': {'state': {'state': 'Active', 'priority': 150}, 'common': {'device-id': 1, 'set-id': 1}}}
+
+
+def get_resource_accounting(device, partition):
+    res_types = [{'resource-type': 'network-resources', 'l4-session-count': 10},
+                 {'resource-type': 'app-resources', 'slb-server-count': len(device.servers(partition))},
+                 {'resource-type': 'system-resources', 'bw-limit-current': 0}]
+    return {'resource-accounting': {'oper': {'partition-resource': [{'partition-name': partition,
+                                                                     'res-type': res_types}]}}}
+
+
+def get_slb_switch(device, partition):
+    return {'switch': {'stats': counters('tcp-in', 'tcp-out', 'udp-in', 'udp-out', 'ip-frag')}}
+
+
+def get_slb_list(kind, names):
+    def handler(device, partition):
+        return {kind + '-list': [{'name': name} for name in names(device, partition)]}
+    return handler
+
+
+def get_slb_stats(kind, names):
+    def handler(device, partition):
+        return {kind + '-list': [device.object_entry(kind, name) for name in names(device, partition)]}
+    return handler
+
+
+def get_slb_oper(kind, names):
+    def handler(device, partition):
+        # the first real server is down, as in show health stat
+        return {kind + '-list': [{'name': name, 'oper': {'state': 'Down' if kind == 'server' and n == 0 else 'Up'}}
+                                 for n, name in enumerate(names(device, partition))]}
+    return handler
+
+
+def get_perf_stats(device, partition):
+    # rates drift with the wall clock so successive samples differ
+    second = int(time.time())
+    return {'perf': {'stats': {'total-throughput-bits-per-sec': 8000000 + 1000 * (second % 60),
+                               'l4-conns-per-sec': 1200 + second % 60, 'total-curr-conns': 3000 + second % 7}}}
+
+
+def static(body):
+    def handler(device, partition):
+        return body
+    return handler
+
+
+GET_HANDLERS = {
+    'partition': get_partition_list,
+    'vrrp-a': get_vrrpa,
+    'vrrp-a/state/stats': static({'state': {'stats': counters('sync-pkt-tx-counter', 'sync-pkt-rcv-counter')}}),
+    'vcs/images/oper': static({'images': {'oper': {}}}),
+    'vcs/vcs-summary/oper': static({'vcs-summary': {'oper': {'vcs-enabled': 'Invalid'}}}),
+    'slb/server': get_slb_list('server', FakeDevice.servers),
+    'slb/service-group': get_slb_list('service-group', FakeDevice.service_groups),
+    'slb/virtual-server': get_slb_list('virtual-server', FakeDevice.virtual_servers),
+    'slb/server/stats': get_slb_stats('server', FakeDevice.servers),
+    'slb/service-group/stats': get_slb_stats('service-group', FakeDevice.service_groups),
+    'slb/virtual-server/stats': get_slb_stats('virtual-server', FakeDevice.virtual_servers),
+    'slb/server/oper': get_slb_oper('server', FakeDevice.servers),
+    'slb/service-group/oper': get_slb_oper('service-group', FakeDevice.service_groups),
+    'slb/virtual-server/oper': get_slb_oper('virtual-server', FakeDevice.virtual_servers),
+    'system/memory/oper': static({'memory': {'oper': {'Total': 8000000, 'Used': 2000000, 'Free': 6000000,
+                                                      'Usage': '25.0%'}}}),
+    'system/oper': static({'system': {'oper': {'hostname': 'fake-adc'}}}),
+    'system/hardware': static({'hardware': {'platform-description': 'Fake ADC'}}),
+    'system/hardware/oper': static({'hardware': {'oper': {'disk-total': 100000, 'disk-used': 20000}}}),
+    'slb/hw-compress/stats': static({'hw-compress': {'stats': counters('request-count', 'submit-count')}}),
+    'system/environment': static({'environment': {'oper': {'physical-system-temperature': 40}}}),
+    'interface/ethernet/stats': static({'ethernet-list': [{'ifnum': 1, 'stats': counters('packets_input',
+                                                                                        'packets_output')}]}),
+    'interface/ve/stats': static({'ve-list': [{'ifnum': 10, 'stats': counters('num_pkts', 'num_total_bytes')}]}),
+    'interface/trunk/stats': static({'trunk-list': []}),
+    'network/lacp/stats': static({'lacp': {'stats': counters('pkts-received', 'pkts-sent')}}),
+    'network/vlan': static({'vlan-list': [{'vlan-num': 10, 've': 10}]}),
+    'network/vlan/stats': static({'vlan-list': [{'vlan-num': 10, 'stats': counters('broadcast_count')}]}),
+    'system/resource-usage/oper': static({'resource-usage': {'oper': {'l4-session-count': 16000000}}}),
+    'slb/resource-usage/oper': static({'resource-usage': {'oper': {'server-count': 1024}}}),
+    'system/resource-accounting/oper': get_resource_accounting,
+    'system/icmp/stats': static({'icmp': {'stats': counters('num', 'rate_limit_drop')}}),
+    'system/data-cpu/stats': static({'data-cpu': {'stats': {'cpu-1': 4, 'cpu-2': 6}}}),
+    'system/control-cpu/stats': static({'control-cpu': {'stats': {'cpu-1': 8}}}),
+    'system/cpu-load-sharing': static({'cpu-load-sharing': {'disable': 0}}),
+    'system/session/stats': static({'session': {'stats': counters('total_l4_conn', 'conn_count')}}),
+    'ip/fib/oper': static({'fib': {'oper': {'total-routes': 1}}}),
+    'ip/stats': static({'ip': {'stats': counters('inreceives', 'indelivers')}}),
+    'slb/switch/stats': get_slb_switch,
+    'system/tcp/stats': static({'tcp': {'stats': counters('activeopens', 'passiveopens')}}),
+    'system/bandwidth/stats': static({'bandwidth': {'stats': counters('input-bytes-per-sec')}}),
+    'slb/l4/stats': static({'l4': {'stats': counters('intcp', 'synreceived')}}),
+    'health/monitor': static({'monitor-list': [{'name': 'default'}]}),
+    'slb/perf/stats': get_perf_stats,
+    'syslog/oper': static({'syslog': {'oper': {'lines': [
+        {'line': 'Feb 26 2018 14:31:40 Warning [ACOS]:Control CPU usage 81% exceeds threshold 80%'},
+        {'line': 'Feb 26 2018 14:20:03 Error [HMON]:Server rs-shared-2 is down.'},
+        {'line': 'Feb 26 2018 14:12:55 Notice [SYSTEM]:Configuration saved by admin'},
+        {'line': 'Feb 26 2018 14:07:18 Warning [ACOS]:Control CPU usage 84% exceeds threshold 80%'},
+        {'line': 'Feb 26 2018 14:05:12 Error [HMON]:Server rs-shared-1 is down.'},
+        {'line': 'Feb 26 2018 14:02:31 Info [SYSTEM]:The system is ready.'}]}}}),
+    'logging': static({'logging': {'buffered': {'buffersize': 30000}}}),
+    'enable-management': static({'enable-management': {'service': {'ssh': {'management': 1},
+                                                                   'https': {'management': 1},
+                                                                   'ping': {'management': 1, 'eth-cfg': [
+                                                                       {'ethernet-start': 1, 'ethernet-end': 2}]}}}}),
+    'slb/common/conn-rate-limit': static({'conn-rate-limit': {}}),
+    'ip/anomaly-drop/stats': static({'anomaly-drop': {'stats': counters('land', 'emp-frg')}}),
+    'version/oper': static({'version': {'oper': {'sw-version': '4.1.4-GR1-P1 build 27', 'hw-platform': 'Fake'}}}),
+    'bootimage/oper': static({'bootimage': {'oper': {'hd-default': 'pri'}}}),
+    'running-config': static({'running-config': {}}),
+}
+
+
+class FakeAxapiHandler(BaseHTTPRequestHandler):
+    """answers AxAPI v3 requests from the FakeDevice attached to the server"""
+    protocol_version = 'HTTP/1.1'
+    # headers and body go out in separate writes, don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # keep the stand-in quiet, the clients log everything we need
+        pass
+
+    def send_body(self, code, body, content_type='application/json'):
+        if not isinstance(body, bytes):
+            body = body.encode()
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, code, body):
+        self.send_body(code, json.dumps(body))
+
+    def route(self):
+        """returns the path below /axapi/v3/ and the session token, or None when the request is not authenticated"""
+        device = self.server.device
+        with device.lock:
+            device.requests += 1
+        if device.latency:
+            time.sleep(device.latency)
+        path = self.path.split('?')[0]
+        if path.startswith('/axapi/v3/'):
+            path = path[len('/axapi/v3/'):]
+        path = path.strip('/')
+        token = self.headers.get('Authorization', '').replace('A10 ', '')
+        return path, token
+
+    def do_GET(self):
+        device = self.server.device
+        path, token = self.route()
+        if device.fault(path):
+            self.send_json(503, UNAVAILABLE)
+            return
+        if not device.valid(token):
+            self.send_json(401, INVALID_SESSION)
+            return
+        body = device.get(path, device.sessions[token])
+        if body is None:
+            self.send_json(404, NOT_FOUND)
+        else:
+            self.send_json(200, body)
+
+    def do_POST(self):
+        device = self.server.device
+        path, token = self.route()
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length).decode() or '{}')
+        except ValueError:
+            payload = {}
+        if device.fault(path, payload):
+            self.send_json(503, UNAVAILABLE)
+            return
+        if path == 'auth':
+            self.send_json(200, {'authresponse': {'signature': device.login(),
+                                                  'description': 'the signature should be set in Authorization header for following request.'}})
+            return
+        if not device.valid(token):
+            self.send_json(401, INVALID_SESSION)
+            return
+        if path == 'logoff':
+            device.logoff(token)
+            self.send_body(200, '')
+        elif path.startswith('active-partition/'):
+            partition = path.split('/', 1)[1]
+            if partition not in device.partitions:
+                self.send_json(404, NOT_FOUND)
+                return
+            with device.lock:
+                device.sessions[token] = partition
+            self.send_body(204, '')
+        elif path == 'clideploy':
+            output = device.clideploy(payload.get('CommandList', []), device.sessions[token])
+            self.send_body(200, output, 'text/plain')
+        else:
+            self.send_json(404, NOT_FOUND)
+
+
+def start_server(device=None, host='127.0.0.1', port=0):
+    """starts the stand-in on a background thread and returns the server, server.server_port holds the port"""
+    server = ThreadingHTTPServer((host, port), FakeAxapiHandler)
+    server.daemon_threads = True
+    server.device = device if device is not None else FakeDevice()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the AxAPI v3 interface of an A10 device.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', default=8080, type=int, help='port to listen on (default: 8080)')
+    parser.add_argument('--partitions', default=1, type=int, help='number of L3V partitions besides shared')
+    parser.add_argument('--latency', default=0.0, type=float, help='seconds added to every response')
+    parser.add_argument('--servers', default=3, type=int, help='slb servers in every partition (default: 3)')
+    parser.add_argument('--service-groups', default=2, type=int, help='slb service groups in every partition (default: 2)')
+    parser.add_argument('--virtual-servers', default=2, type=int, help='slb virtual servers in every partition (default: 2)')
+    parser.add_argument('--session-timeout', default=0.0, type=float, help='seconds an idle session stays valid, 0 never expires (default: 0)')
+    parser.add_argument('--fail', action='append', default=[], metavar='ENDPOINT', help='answer this endpoint (or clideploy command) with a 503, may be repeated')
+    parser.add_argument('--flaky', default=0.0, type=float, help='share of the other requests answered with a 503 (default: 0)')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeAxapiHandler)
+    server.daemon_threads = True
+    server.device = FakeDevice(partitions=args.partitions, latency=args.latency, servers=args.servers,
+                               service_groups=args.service_groups, virtual_servers=args.virtual_servers,
+                               session_timeout=args.session_timeout, failing=args.fail, flaky=args.flaky)
+    print('AxAPI stand-in listening on http://' + args.host + ':' + str(args.port) + '/axapi/v3/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
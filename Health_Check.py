@@ -24,48 +24,370 @@ import argparse
 import requests
 import logging
 import inspect
-from Acos import Acos
-from time import sleep
+import json
+from Acos import Acos, CircuitBreaker, DeviceDegraded, ResponseCache, RetryPolicy
+from Partition_Planner import PartitionPlanner
+from Collection_Writer import CollectionWriter
+from Call_Metrics import CallMetrics
+from Metrics_Exporter import OpenMetricsExporter
+from Pacer import AdaptivePacer, FixedPacer
+from Perf_Sampler import perf_series, perf_stats, sample_performance
+from Acos_Replay import ReplayAcos, captured_devices, open_recorder
+from Config_Store import ConfigStore
+from Checkpoint import Checkpoint
+from Token_Cache import DEFAULT_LIFETIME, DEFAULT_PATH, TokenCache
+from Report_Archive import ReportArchive, SectionBuffer
+from Inventory import Progress, inventory_entry, load_inventory, lpt_order
+from Syslog_Analyzer import analyze_syslog
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from threading import Lock
+import asyncio
 import datetime
+import time
+import io
+import multiprocessing
+import os
+import sys
 
 
 __version__ = '1.0'
 __author__ = 'A10 Networks'
 
+# serializes buffered device reports onto stdout in parallel runs
+output_lock = Lock()
+
+# machine-readable record of every response, set up in main() for --format jsonl/msgpack
+collection = None
+
+# per-call latency instrumentation, set up in main() for --metrics/--metrics-file
+metrics = None
+
+# counters exported as OpenMetrics, set up in main() for --openmetrics-file
+exporter = None
+
+# last collected configs of every device, set up in main() for --config-store
+config_store = None
+
+# compressed archive the device reports are written to, set up in main() for --archive
+archive = None
+
+# completed units of work of every device, set up in main() for --checkpoint
+checkpoint = None
+
+# AxAPI sessions shared with other runs, set up in main() for --token-cache
+token_cache = None
+
+# progress and ETA of a run over several devices, set up in main()
+progress = None
+
+# set in worker processes (--processes), which hand their reports back to the parent instead of writing them
+process_worker = False
+
 parser = argparse.ArgumentParser(description='This program will grab all of the data necessary to do an A10 ACOS SLB health check.')
 devices = parser.add_mutually_exclusive_group()
-devices.add_argument('-d', '--device', default='192.168.0.152', help='A10 device hostname or IP address. Multiple devices may be included separated by a comma.')
+devices.add_argument('-d', '--device', default=None, help='A10 device hostname or IP address. Multiple devices may be included separated by a comma. (default: 192.168.0.152, or every captured device with --replay)')
+devices.add_argument('-i', '--inventory', default=None, metavar='FILE', help='YAML or CSV inventory of the devices with their credentials, tags and expected size, see Inventory.py')
+parser.add_argument('--tags', default=None, help='With --inventory, only the devices with one of these comma separated tags')
 parser.add_argument('-p', '--password', default='a10', help='user password')
 parser.add_argument('-u', '--username', default='admin', help='username (default: admin)')
-parser.add_argument('-w', '--wait', default=1, type=int, help='How long to delay each API call, longer delays may help to avoid control CPU spikes')
+parser.add_argument('-w', '--wait', default=1, type=float, help='How long to delay each API call, longer delays may help to avoid control CPU spikes (the starting delay with --pace)')
 parser.add_argument('-r', '--repeat', default=5, type=int, help='How many times to repeat API calls for SLB perf stats' )
+parser.add_argument('--sample-interval', default=1.0, type=float, help='Seconds between SLB perf stats samples, kept on a fixed clock (default: 1)')
 parser.add_argument('-v', '--verbose', default=0, action='count', help='Enable verbose detail')
+parser.add_argument('--pool-size', default=10, type=int, help='Maximum number of keep-alive connections held open per device (default: 10)')
+parser.add_argument('--connect-timeout', default=10, type=float, help='Seconds to wait for a connection to the device (default: 10)')
+parser.add_argument('--read-timeout', default=300, type=float, help='Seconds to wait for a response from the device (default: 300)')
+parser.add_argument('--ca-bundle', default=None, help='Verify the device certificate against this CA bundle (default: no verification)')
+parser.add_argument('--client-cert', default=None, help='Client certificate (PEM, including key) presented to the device')
+parser.add_argument('--retries', default=2, type=int, help='Times a call that failed to reach the device (or got a 502/503/504) is retried, with jittered exponential backoff (default: 2)')
+parser.add_argument('--backoff', default=0.5, type=float, help='Seconds the first retry backs off at most, doubled for every further retry (default: 0.5)')
+parser.add_argument('--breaker-threshold', default=5, type=int, help='Calls failing in a row after which a device is degraded and its remaining calls skipped (default: 5)')
+parser.add_argument('--breaker-cooldown', default=60, type=float, help='Seconds a degraded device is skipped before a trial call is let through (default: 60)')
+parser.add_argument('--token-cache', nargs='?', const=DEFAULT_PATH, default=None, metavar='FILE', help='Reuse AxAPI sessions of earlier runs kept in FILE and hand the sessions back there instead of logging off, the sessions stay open on the devices until they time out (default FILE: ' + DEFAULT_PATH + ')')
+parser.add_argument('--token-lifetime', default=DEFAULT_LIFETIME, type=float, help='Seconds a session may sit idle before it is no longer reused, keep it below the admin idle timeout of the devices (default: ' + str(DEFAULT_LIFETIME) + ')')
+parser.add_argument('--protocol', default='https', choices=['https', 'http'], help='Protocol used to reach AxAPI, http is only meant for local stand-ins such as Fake_Axapi.py (default: https)')
+
+parser.add_argument('--cache-size', default=1024, type=int, help='Responses kept in the per-device response cache, 0 disables it (default: 1024)')
+parser.add_argument('--cache-ttl', default=300, type=float, help='Seconds a cached response stays fresh unless overridden per endpoint (default: 300)')
+parser.add_argument('--workers', default=1, type=int, help='Number of devices checked in parallel (default: 1, one device at a time)')
+parser.add_argument('--processes', default=1, type=int, help='Number of worker processes the devices are sharded across, largest expected size first (default: 1, no worker processes)')
+outputs = parser.add_mutually_exclusive_group()
+outputs.add_argument('--output-dir', default=None, help='Write each device report to <output-dir>/<device>.txt instead of stdout')
+outputs.add_argument('--archive', default=None, metavar='FILE', help='Write the device reports to a compressed archive with a per-section index instead of stdout, zstd when FILE ends in .zst, gzip otherwise')
+parser.add_argument('-f', '--format', default='yaml', choices=['yaml', 'jsonl', 'msgpack'], help='Also write one record per API response in this format alongside the YAML report (default: yaml, report only)')
+parser.add_argument('--collect-file', default=None, help='File the --format records are written to, gzipped if it ends in .gz (default: health_check_<start time>.<format>)')
+parser.add_argument('--record', default=None, metavar='DIR', help='Record every exchange with each device to a capture archive in DIR')
+parser.add_argument('--replay', default=None, metavar='DIR', help='Serve every call from the capture archive in DIR instead of the devices')
+parser.add_argument('--openmetrics-file', default=None, help='Write the collected counters to this node_exporter textfile (OpenMetrics/Prometheus)')
+parser.add_argument('--checkpoint', default=None, metavar='DIR', help='Record the report output of every completed method and partition to DIR as the run goes')
+parser.add_argument('--resume', action='store_true', help='With --checkpoint, replay the units an interrupted run completed and only collect the missing ones')
+parser.add_argument('--config-store', default=None, metavar='DIR', help='Keep the collected configs in DIR and skip downloading them again while the device reports them unchanged')
+parser.add_argument('--pace', action='store_true', help='Adapt the delay to the control CPU and AxAPI latency of each device instead of always waiting -w seconds')
+parser.add_argument('--min-wait', default=0.0, type=float, help='With --pace, the shortest delay used (default: 0)')
+parser.add_argument('--max-wait', default=10.0, type=float, help='With --pace, the longest delay used (default: 10)')
+parser.add_argument('--cpu-low', default=30, type=int, help='With --pace, control CPU percent at or below which the delay is shortened (default: 30)')
+parser.add_argument('--cpu-high', default=70, type=int, help='With --pace, control CPU percent at or above which the delay is lengthened (default: 70)')
+parser.add_argument('--pace-interval', default=5.0, type=float, help='With --pace, seconds between control CPU samples (default: 5)')
+parser.add_argument('--metrics', action='store_true', help='Print per-endpoint latency percentiles, a per-section breakdown and the slowest calls at the end of the run')
+parser.add_argument('--metrics-file', default=None, metavar='FILE', help='Write the call metrics of the run to FILE as JSON')
+parser.add_argument('--metrics-top', default=10, type=int, help='Number of slowest calls listed in the metrics (default: 10)')
+parser.add_argument('--async', dest='use_async', action='store_true', help='Drive every device from a single asyncio event loop (requires aiohttp)')
+parser.add_argument('--max-in-flight', default=4, type=int, help='With --async, the most requests outstanding against one device at a time (default: 4)')
+
+# parsed in main() so the module can be imported without side effects
+args = None
+
+# clideploy show commands of the HealthCheck methods, by where they run, prefetched by the partition planner in one
+# batched call per partition instead of one call per command
+CLI_COMMANDS = {
+    'interface_trunk_vlan_check': {'shared': ['show lacp trunk detail',
+                                              'show interfaces transceiver ethernet 9 details']},
+    'sessions_check': {'partition': ['show slb ssl error', 'show slb tcp stack']},
+    'health_monitor_check': {'partition': ['show health monitor', 'show health stat']},
+}
+
+
+def main(argv=None):
+    global args, collection, metrics, exporter, config_store, archive, checkpoint, token_cache, progress
+    args = parser.parse_args(argv)
+    if args.resume and not args.checkpoint:
+        parser.error('--resume requires --checkpoint')
+    if args.processes > 1 and (args.format != 'yaml' or args.metrics or args.metrics_file or args.openmetrics_file or
+                               args.use_async):
+        parser.error('--processes can not be combined with --format, --metrics, --metrics-file, '
+                     '--openmetrics-file or --async')
+    if args.inventory:
+        try:
+            entries = load_inventory(args.inventory, args.username, args.password,
+                                     args.tags.split(',') if args.tags else None)
+        except (IOError, ValueError) as e:
+            parser.error(str(e))
+    else:
+        if args.device:
+            devices = args.device.split(',')
+        elif args.replay:
+            devices = captured_devices(args.replay)
+        else:
+            devices = ['192.168.0.152']
+        entries = [inventory_entry(device, args.username, args.password) for device in devices]
+    # the summary keeps the order given, the devices are started largest first
+    devices = [entry['device'] for entry in entries]
+    entries = lpt_order(entries)
 
-try:
-    args = parser.parse_args()
-    devices = args.device.split(',')
-    password = args.password
-    username = args.username
-    wait = args.wait
-    verbose = args.verbose
-    repeat = args.repeat
-
-except Exception as e:
-    print(e)
-
-
-def main():
     requests.packages.urllib3.disable_warnings()
 
     # set the default logging format
     logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
 
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
     start = datetime.datetime.now()
     print('\n\nHealth Check script started at: ' + str(start) + '\n\n')
 
-    for device in devices:
-        device = Acos(device, username, password, verbose)
+    if args.format != 'yaml':
+        collect_file = args.collect_file or 'health_check_' + start.strftime('%Y%m%d-%H%M%S') + '.' + args.format
+        collection = CollectionWriter(collect_file, args.format)
+    if args.metrics or args.metrics_file:
+        metrics = CallMetrics(args.metrics_top)
+    if args.openmetrics_file:
+        exporter = OpenMetricsExporter()
+    if args.config_store:
+        config_store = ConfigStore(args.config_store)
+    if args.archive:
+        archive = ReportArchive(args.archive)
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint)
+    token_cache = open_token_cache()
+
+    # the devices are checked --processes or --workers at a time
+    progress = Progress(entries, args.processes if args.processes > 1 else args.workers) if len(entries) > 1 else None
+
+    results = []
+    if args.use_async and not args.replay:
+        results = asyncio.run(run_fleet_async(entries))
+    elif args.processes > 1:
+        results = run_fleet_processes(entries, argv)
+    elif args.workers > 1:
+        # one worker per device, each writing to its own output stream so reports never interleave
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(run_device, entry, True) for entry in entries]
+            for future in as_completed(futures):
+                results.append(finished(future.result()))
+    else:
+        for entry in entries:
+            results.append(finished(run_device(entry, False)))
+
+    if collection is not None:
+        collection.close()
+        print(str(collection.records) + ' ' + args.format + ' records written to ' + collection.path)
+    if archive is not None:
+        archive.close()
+        members, sections, size, compressed = archive.totals()
+        print('Reports of ' + str(members) + ' devices archived to ' + archive.path + ': ' + str(sections) +
+              ' sections, ' + str(size) + ' bytes compressed to ' + str(compressed))
+    if token_cache is not None and args.processes <= 1:
+        print('Token cache ' + token_cache.path + ': ' + str(token_cache.reused) + ' sessions reused, ' +
+              str(token_cache.created) + ' authenticated')
+    if checkpoint is not None and args.processes <= 1:
+        # the worker processes of --processes keep their own counts
+        print('Checkpoint ' + checkpoint.root + ': ' + str(checkpoint.recorded) + ' units recorded, ' +
+              str(checkpoint.replayed) + ' replayed')
+
+    end = datetime.datetime.now()
+    elapsed = end - start
+    print('\n\nHealth Check Script ended at: ' + str(end) + '\n\n')
+    print('Time Elapsed: ' + str(elapsed) + '\n\n')
+    print_summary(devices, results)
+
+    if exporter is not None:
+        exporter.write_textfile(args.openmetrics_file)
+        print('\nOpenMetrics written to ' + args.openmetrics_file)
+
+    if metrics is not None:
+        if args.metrics:
+            print('')
+            metrics.print_report(sys.stdout)
+        if args.metrics_file:
+            metrics.write_json(args.metrics_file)
+            print('\nCall metrics written to ' + args.metrics_file)
+
+
+def finished(result):
+    """reports the progress of the run once a device is done"""
+    if progress is not None:
+        progress.finished(result)
+    return result
+
+
+def init_process(argv):
+    """sets up a worker process of run_fleet_processes"""
+    global args, config_store, checkpoint, token_cache, process_worker
+    args = parser.parse_args(argv)
+    if args.config_store:
+        config_store = ConfigStore(args.config_store)
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint)
+    token_cache = open_token_cache()
+    process_worker = True
+
+
+def open_token_cache():
+    """returns the token cache of the run, None unless --token-cache is given or when the calls are replayed"""
+    if args.token_cache is None or args.replay:
+        return None
+    return TokenCache(args.token_cache, args.token_lifetime)
+
+
+def run_device_process(entry):
+    return run_device(entry, True)
+
+
+def run_fleet_processes(entries, argv):
+    """shards the devices across --processes worker processes, handing out the largest devices first"""
+    results = []
+    # spawned rather than forked, the parent may already run the archive thread
+    with ProcessPoolExecutor(max_workers=args.processes, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_process, initargs=(argv,)) as executor:
+        # submitted largest first, so each process that frees up takes the largest device left
+        futures = [executor.submit(run_device_process, entry) for entry in entries]
+        for future in as_completed(futures):
+            result = future.result()
+            report = result.pop('report', None)
+            if report is not None:
+                out = open_output(result['device'], True)
+                report.replay(out)
+                close_output(out)
+            results.append(finished(result))
+    return results
+
+
+def open_output(address, parallel):
+    """returns the stream a device report is written to"""
+    if archive is not None:
+        return archive.open_member(address)
+    elif args.output_dir:
+        return open(os.path.join(args.output_dir, address.replace(':', '_') + '.txt'), 'w')
+    elif process_worker:
+        # handed back to the parent with its section boundaries, which writes it to stdout or the archive
+        return SectionBuffer()
+    elif parallel:
+        # buffered and written to stdout in one piece once the device is finished
+        return io.StringIO()
+    return sys.stdout
+
+
+def close_output(out):
+    """flushes a buffered device report to stdout and closes per-device files, a worker process's report is
+    returned instead"""
+    if isinstance(out, SectionBuffer):
+        return out
+    if isinstance(out, io.StringIO):
+        with output_lock:
+            sys.stdout.write(out.getvalue())
+            sys.stdout.flush()
+    elif out is not sys.stdout:
+        out.close()
+
+
+def connection_options():
+    """keyword arguments shared by Acos and AsyncAcos"""
+    return {'pool_size': args.pool_size, 'connect_timeout': args.connect_timeout, 'read_timeout': args.read_timeout,
+            'verify': args.ca_bundle if args.ca_bundle else False, 'cert': args.client_cert,
+            'protocol': args.protocol, 'cache': ResponseCache(args.cache_size, args.cache_ttl),
+            'retry': RetryPolicy(args.retries, args.backoff),
+            'breaker': CircuitBreaker(args.breaker_threshold, args.breaker_cooldown), 'token_cache': token_cache}
+
+
+def build_pacer():
+    """returns the pacer for one device"""
+    if args.pace:
+        return AdaptivePacer(args.wait, args.min_wait, args.max_wait, args.cpu_low, args.cpu_high, args.pace_interval)
+    return FixedPacer(args.wait)
+
+
+def healthcheck_methods(healthcheck):
+    """returns the bound health check methods in the order they are run"""
+    # get a list of class methods from healthcheck
+    methods_tuples = inspect.getmembers(healthcheck, predicate=inspect.ismethod)
+    methods = []
+
+    # iterate through each of the method tuples (name, method) and extract the method, skipping the
+    # _<name>_before/_partition/_after parts the partition planner runs
+    for method_tuple in methods_tuples:
+        if not method_tuple[0].startswith('_'):
+            methods.append(method_tuple[1])
+    return methods
+
+
+def run_device(entry, parallel):
+    """runs every health check method against one inventory device and returns its status for the summary"""
+    address = entry['device']
+    result = {'device': address, 'status': 'OK', 'elapsed': None, 'error': '', 'cache': None}
+    out = open_output(address, parallel)
+    start = time.monotonic()
+    if args.replay:
+        device = ReplayAcos(address, entry['username'], entry['password'], args.verbose, capture_dir=args.replay,
+                            **connection_options())
+    else:
+        device = Acos(address, entry['username'], entry['password'], args.verbose, **connection_options())
+    device.out = out
+    if collection is not None:
+        device.call_hooks.append(collection.write)
+    if metrics is not None:
+        device.call_hooks.append(metrics.record)
+    if exporter is not None:
+        device.call_hooks.append(exporter.record)
+    pacer = build_pacer()
+    device.call_hooks.append(pacer.observe)
+    recorder = open_recorder(args.record, device) if args.record else None
+    planner = None
+    token = None
+    try:
         device.set_logging_env()
+        if resume_device(device):
+            # every unit was collected by an earlier run, nothing left to read from the device
+            raise DeviceResumed()
         token = device.auth()
 
         # get a list of partitions (we will iterate over it multiple times later on
@@ -75,32 +397,194 @@ def main():
         device.build_section_header("A10 Application Devlivery Controller::AxAPIv3.0")
         device.build_section_header("Data from device at IP::"+device.device)
 
-
         healthcheck = HealthCheck()
+        methods = healthcheck_methods(healthcheck)
 
-        # get a list of class methods from healthcheck
-        methods_tuples = inspect.getmembers(healthcheck, predicate=inspect.ismethod)
-        methods = []
-
-        # iterate through each of the method tuples (name, method) and extract the method
-        for method_tuple in methods_tuples:
-            methods.append(method_tuple[1])
-
-        # run each of the methods, with the appropriate amount of delay
-        # if you want to run specific methods, comment out this for loop and call them below
-        for method in methods:
-            sleep(wait)
-            method(device)
+        # run each of the methods, with the appropriate amount of delay, entering each partition once
+        # if you want to run specific methods, pass a shorter list to the planner or call them below
+        planner = PartitionPlanner(healthcheck, methods, CLI_COMMANDS, checkpoint)
+        planner.run(device, pacer)
 
         # example individual call
         # healthcheck.get_running_config(device)
 
+        print_connection_stats(device)
+    except DeviceResumed:
+        result['error'] = 'resumed from the checkpoint'
+    except Exception as e:
+        failed(result, device, e)
+    finally:
+        if token is not None:
+            # on the error path too, so neither the admin session nor its token cache lease is left open
+            device.auth_logoff(token)
+        result['cache'] = device.cache.stats()
+        device.close()
+        if recorder is not None:
+            recorder.close()
+        report = close_output(out)
+    degraded(result, device, planner)
+    if report is not None:
+        result['report'] = report
+    result['elapsed'] = datetime.timedelta(seconds=round(time.monotonic() - start, 3))
+    return result
+
+
+async def run_fleet_async(entries):
+    """checks every device from one event loop, --workers devices at a time"""
+    # the blocking HealthCheck sections run on these threads, their device calls run on the loop
+    executor = ThreadPoolExecutor(max_workers=max(args.workers, 1))
+    limit = asyncio.Semaphore(max(args.workers, 1))
+
+    async def limited(entry):
+        async with limit:
+            return finished(await run_device_async(entry, executor))
+
+    try:
+        return await asyncio.gather(*[limited(entry) for entry in entries])
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def run_device_async(entry, executor):
+    """async counterpart of run_device, backed by an AsyncAcos"""
+    from Acos_Async import AsyncAcos, run_blocking
+
+    address = entry['device']
+    result = {'device': address, 'status': 'OK', 'elapsed': None, 'error': '', 'cache': None}
+    out = open_output(address, True)
+    start = time.monotonic()
+    device = AsyncAcos(address, entry['username'], entry['password'], args.verbose, max_in_flight=args.max_in_flight,
+                       **connection_options())
+    device.out = out
+    if collection is not None:
+        device.call_hooks.append(collection.write)
+    if metrics is not None:
+        device.call_hooks.append(metrics.record)
+    if exporter is not None:
+        device.call_hooks.append(exporter.record)
+    pacer = build_pacer()
+    device.call_hooks.append(pacer.observe)
+    recorder = open_recorder(args.record, device) if args.record else None
+    planner = None
+    token = None
+    try:
+        device.set_logging_env()
+        if resume_device(device):
+            raise DeviceResumed()
+        await device.open()
+        token = await device.auth()
+        device.partitions = await device.get_partition_list()
 
-        device.auth_logoff(token)
-    end = datetime.datetime.now()
-    elapsed = end - start
-    print('\n\nHealth Check Script ended at: ' + str(end) + '\n\n')
-    print('Time Elapsed: ' + str(elapsed) + '\n\n')
+        device.build_section_header("A10 Application Devlivery Controller::AxAPIv3.0")
+        device.build_section_header("Data from device at IP::"+device.device)
+
+        healthcheck = HealthCheck()
+        planner = PartitionPlanner(healthcheck, healthcheck_methods(healthcheck), CLI_COMMANDS, checkpoint)
+        await run_blocking(device, planner.run, pacer, executor=executor)
+
+        print_connection_stats(device)
+    except DeviceResumed:
+        result['error'] = 'resumed from the checkpoint'
+    except Exception as e:
+        failed(result, device, e)
+    finally:
+        if token is not None:
+            # on the error path too, so neither the admin session nor its token cache lease is left open
+            await device.auth_logoff(token)
+        result['cache'] = device.cache.stats()
+        await device.close()
+        if recorder is not None:
+            recorder.close()
+        close_output(out)
+    degraded(result, device, planner)
+    result['elapsed'] = datetime.timedelta(seconds=round(time.monotonic() - start, 3))
+    return result
+
+
+class DeviceResumed(Exception):
+    """Raised to skip the rest of a device's run when its whole report was replayed from the checkpoint"""
+
+
+def resume_device(device):
+    """prepares the checkpoint of a device; when resuming a device whose every method is done, writes its report
+    from the checkpoint and returns True"""
+    if checkpoint is None:
+        return False
+    if not args.resume:
+        # a new run starts over, units left behind by an earlier run are not reused
+        checkpoint.clear(device.device)
+        return False
+    checkpoint.clean(device.device)
+    methods = healthcheck_methods(HealthCheck())
+    if not checkpoint.complete(device.device, [method.__name__ for method in methods]):
+        return False
+    device.build_section_header("A10 Application Devlivery Controller::AxAPIv3.0")
+    device.build_section_header("Data from device at IP::"+device.device)
+    for method in methods:
+        checkpoint.replay(device.device, method.__name__, None, device.out)
+    device.report.text('Report of ' + device.device + ' replayed from the checkpoint in ' + checkpoint.root)
+    return True
+
+
+def failed(result, device, error):
+    """records why a device's health check stopped, the other devices carry on"""
+    # a device whose circuit breaker opened is degraded, its report holds everything read up to then
+    result['status'] = 'DEGRADED' if isinstance(error, DeviceDegraded) else 'FAILED'
+    result['error'] = str(error)
+    device.logger.error('Health check failed: ' + str(error))
+
+
+def degraded(result, device, planner):
+    """marks a device degraded when some of its methods or endpoints were skipped"""
+    endpoints = sorted(device.breaker.degraded_endpoints())
+    skipped = planner.skipped if planner is not None else []
+    result['degraded'] = endpoints
+    if result['status'] == 'OK' and (endpoints or skipped):
+        result['status'] = 'DEGRADED'
+        result['error'] = str(len(skipped)) + ' part(s) skipped'
+        if endpoints:
+            result['error'] += ', degraded endpoints: ' + ', '.join(endpoints)
+
+
+def print_connection_stats(device):
+    """prints how well the keep-alive session to the device was reused"""
+    stats = device.connection_stats()
+    if stats['requests']:
+        reuse = 100.0 * stats['reused'] / stats['requests']
+    else:
+        reuse = 0.0
+    device.report.text('AxAPI connection reuse for ' + device.device + ': ' + str(stats['requests']) +
+                       ' requests over ' + str(stats['connections']) + ' connection(s), ' + str(stats['reused']) +
+                       ' reused ({:.1f}%)'.format(reuse))
+
+
+def print_summary(devices, results):
+    """prints the wall time and status of every device, in the order given on the command line"""
+    by_device = {result['device']: result for result in results}
+    print('{:*^100s}'.format(''))
+    print('{:*^100s}'.format('Run Summary'))
+    print('{:*^100s}'.format(''))
+    print('{:<40s} {:<10s} {:<16s} {}'.format('Device', 'Status', 'Wall Time', 'Error'))
+    for device in devices:
+        result = by_device[device]
+        print('{:<40s} {:<10s} {:<16s} {}'.format(result['device'], result['status'], str(result['elapsed']),
+                                                  result['error']))
+    print_cache_summary(results)
+
+
+def print_cache_summary(results):
+    """prints the response cache hit/miss counters of every device and their totals"""
+    totals = {'hits': 0, 'misses': 0, 'evictions': 0}
+    print('')
+    print('{:<40s} {:>10s} {:>10s} {:>10s}'.format('Response Cache', 'Hits', 'Misses', 'Evictions'))
+    for result in results:
+        if not result['cache']:
+            continue
+        for counter in totals:
+            totals[counter] += result['cache'][counter]
+        print('{:<40s} {:>10d} {:>10d} {:>10d}'.format(result['device'], result['cache']['hits'],
+                                                       result['cache']['misses'], result['cache']['evictions']))
+    print('{:<40s} {:>10d} {:>10d} {:>10d}'.format('Total', totals['hits'], totals['misses'], totals['evictions']))
 
 
 class HealthCheck(object):
@@ -109,339 +593,444 @@ class HealthCheck(object):
     def get_startup_config(self, device):
         """gets the startup config"""
         device.build_section_header("ALL-PARTITIONS STARTUP CONFIGURATION")
+        if self._config_unchanged(device, 'startup'):
+            return
         start = device.get_startup_configs()
-        print(device.pretty_print_json_as_yaml(start))
+        device.report.yaml(start)
+        self._store_config(device, 'startup', start)
 
     def get_running_config(self, device):
         """gets the running config"""
         device.build_section_header("RUNNING-CONFIG")
+        if self._config_unchanged(device, 'running'):
+            return
         running = device.get_running_configs()
-        print(device.pretty_print_json_as_yaml(running))
+        device.report.yaml(running)
+        self._store_config(device, 'running', running)
 
     def get_json_config(self, device):
         """gets the json config"""
         device.build_section_header("JSON CONFIG")
+        if self._config_unchanged(device, 'json'):
+            return
         json_cfg = device.get_json_config()
-        print(device.pretty_print_json_as_yaml(json_cfg))
+        device.report.yaml(json_cfg)
+        self._store_config(device, 'json', json_cfg)
+
+    def _config_stamps(self, device):
+        """the configuration stamps of the device, one request per run thanks to the response cache"""
+        stamps = device.get_config_stamps()
+        if isinstance(stamps, dict) and isinstance(stamps.get('command output'), str):
+            return stamps['command output']
+        return ''
+
+    def _config_unchanged(self, device, kind):
+        """with --config-store, reports a config the device has not changed since it was stored and returns True"""
+        if config_store is None:
+            return False
+        manifest = config_store.unchanged(device.device, kind, self._config_stamps(device))
+        if manifest is None:
+            return False
+        device.report.text('Unchanged since ' + str(datetime.datetime.fromtimestamp(int(manifest['collected']))) +
+                           ', ' + str(manifest['bytes']) + ' bytes in ' + str(len(manifest['sections'])) +
+                           ' sections kept in ' + config_store.root)
+        device.report.text('')
+        return True
+
+    def _collect_only(self, device, getter):
+        """with --format or --record, reads an endpoint the report has no section for, so the rules of
+        Health_Check_Interpreter.py find it in the collection or capture; the report itself is left unchanged"""
+        if collection is not None or args.record:
+            getter()
+
+    def _store_config(self, device, kind, response):
+        """with --config-store, stores the sections of a freshly downloaded config that changed"""
+        if config_store is None or not isinstance(response, dict):
+            return
+        if isinstance(response.get('command output'), str):
+            text = response['command output']
+        elif kind == 'json':
+            # the json config comes back already parsed
+            text = json.dumps(response)
+        else:
+            return
+        changed, total = config_store.save(device.device, kind, text, self._config_stamps(device))
+        device.logger.info('Stored ' + kind + ' config: ' + str(changed) + ' of ' + str(total) + ' sections changed')
 
     def vcs_check(self, device):
         """gets vcs data"""
         device.build_section_header("VCS: /vcs/")
-        print(device.pretty_print_json_as_yaml("a10-url: /vcs/images/"))
-        print(device.pretty_print_json_as_yaml(device.get_vcs_images()))
-        print(device.pretty_print_json_as_yaml("a10-url: /vcs/summary"))
-        print(device.pretty_print_json_as_yaml(device.get_vcs_summary()))
+        device.report.text("a10-url: /vcs/images/")
+        device.report.yaml(device.get_vcs_images())
+        device.report.text("a10-url: /vcs/summary")
+        device.report.yaml(device.get_vcs_summary())
 
     def vrrpa_check(self, device):
         """check vrrp-a data"""
         for partition in device.partitions:
             device.change_partition(partition)
-            vrrpa = device.get_vrrpa()
-            vrrpa_state = vrrpa['vrrp-a']['state']
-            vrrpa_stats = device.get_vrrpa_stats()
-            device.build_section_header("Redundancy Check::Partition::" + partition + "::/vrrp-a/state")
-            print(device.pretty_print_json_as_yaml("a10-url /vrrp-a/state: "))
-            print(device.pretty_print_json_as_yaml(vrrpa_state))
-            device.build_section_header("Redundancy Check::Partition::" + partition + "::show vrrp-a detail")
-            print(device.pretty_print_json_as_yaml("a10-url /vrrp-a/: "))
-            print(device.pretty_print_json_as_yaml(vrrpa))
-            device.build_section_header("Redundancy Check::Partition::" + partition + "::show vrrp-a statistics")
-            print(device.pretty_print_json_as_yaml("a10-url /vrrp-a/state/stats/: "))
-            print(device.pretty_print_json_as_yaml(vrrpa_stats))
+            self._vrrpa_check_partition(device, partition)
         device.change_partition('shared')
 
+    def _vrrpa_check_partition(self, device, partition):
+        """vrrp-a data for one partition"""
+        vrrpa = device.get_vrrpa()
+        vrrpa_state = vrrpa['vrrp-a']['state']
+        vrrpa_stats = device.get_vrrpa_stats()
+        device.build_section_header("Redundancy Check::Partition::" + partition + "::/vrrp-a/state")
+        device.report.text("a10-url /vrrp-a/state: ")
+        device.report.yaml(vrrpa_state)
+        device.build_section_header("Redundancy Check::Partition::" + partition + "::show vrrp-a detail")
+        device.report.text("a10-url /vrrp-a/: ")
+        device.report.yaml(vrrpa)
+        device.build_section_header("Redundancy Check::Partition::" + partition + "::show vrrp-a statistics")
+        device.report.text("a10-url /vrrp-a/state/stats/: ")
+        device.report.yaml(vrrpa_stats)
+
     def hardware_health_check(self, device):
         """Perform hardware health check"""
         device.build_section_header("Health Check::Memory::show memory:")
-        print(device.pretty_print_json_as_yaml("a10-url /system/memory/oper: "))
-        print(device.pretty_print_json_as_yaml(device.get_memory()))
+        device.report.text("a10-url /system/memory/oper: ")
+        device.report.yaml(device.get_memory())
         device.build_section_header("Health Check:HW/DISK:CF::show hardware:")
-        print(device.pretty_print_json_as_yaml("a10-url /hardware: "))
-        print(device.pretty_print_json_as_yaml(device.get_hardware()))
+        device.report.text("a10-url /hardware: ")
+        device.report.yaml(device.get_hardware())
         device.build_section_header("Health Check:HW/DISK:CF::show disk:")
-        print(device.pretty_print_json_as_yaml("a10-url /hardware/oper: "))
-        print(device.pretty_print_json_as_yaml(device.get_disk()))
+        device.report.text("a10-url /hardware/oper: ")
+        device.report.yaml(device.get_disk())
         device.build_section_header("Health Check::HW/DISK:CF::show slb hw-compression:")
-        print(device.pretty_print_json_as_yaml("a10-url /slb/hw-compress/stats: "))
-        print(device.pretty_print_json_as_yaml(device.get_slb_hw_compression()))
+        device.report.text("a10-url /slb/hw-compress/stats: ")
+        device.report.yaml(device.get_slb_hw_compression())
         device.build_section_header("Health Check::HW/DISK:CF:show environment:")
-        print(device.pretty_print_json_as_yaml("a10-url /sytem/environment/: "))
-        print(device.pretty_print_json_as_yaml(device.get_environment()))
+        device.report.text("a10-url /sytem/environment/: ")
+        device.report.yaml(device.get_environment())
         device.build_section_header("Health Check::HW/DISK:CF::Full System Tree")
-        print(device.pretty_print_json_as_yaml("a10-url /sytem/oper: "))
-        print(device.pretty_print_json_as_yaml(device.get_system_oper()))
+        device.report.text("a10-url /sytem/oper: ")
+        device.report.yaml(device.get_system_oper())
 
     def interface_trunk_vlan_check(self, device):
         """gets interface data"""
+        self._interface_trunk_vlan_check_before(device)
+        for partition in device.partitions:
+            device.change_partition(partition)
+            self._interface_trunk_vlan_check_partition(device, partition)
+        device.change_partition('shared')
+
+    def _interface_trunk_vlan_check_before(self, device):
+        """trunk and lacp data, runs before the partitions"""
         #Valid cmds for shared partition only
         device.build_section_header("Interface/Trunk/Vlan::show trunk :")
-        print(device.pretty_print_json_as_yaml("a10-url /interface/trunk/stats: "))
-        print(device.pretty_print_json_as_yaml(device.get_trunk()))
+        device.report.text("a10-url /interface/trunk/stats: ")
+        device.report.yaml(device.get_trunk())
         device.build_section_header("Interface/Trunk/Vlan::show lacp trunk detail:")
-        print(device.pretty_print_json_as_yaml("a10-url cli-deploy show lacp trunk detail: "))
-        print(device.pretty_print_json_as_yaml(device.get_lacp()))
+        device.report.text("a10-url cli-deploy show lacp trunk detail: ")
+        device.report.yaml(device.get_lacp())
         device.build_section_header("Interface/Trunk/Vlan::show lacp counters ")
-        print(device.pretty_print_json_as_yaml("a10-url /network/lacp/stats: "))
-        print(device.pretty_print_json_as_yaml(device.get_lacp_counters()))
+        device.report.text("a10-url /network/lacp/stats: ")
+        device.report.yaml(device.get_lacp_counters())
         # TODO: need to maybe to check to verify if transceivers are present, else this will give error
         # TODO: will also need to loop through valid fiber interfaces and pass to get_interfaces_transceiver.
         device.build_section_header("Interface/Trunk/Vlan::show interfaces transceiver eth X details:")
-        print(device.pretty_print_json_as_yaml("a10-url cli-deploy show interfaces transceiver eth X details: "))
-        print(device.pretty_print_json_as_yaml(device.get_interfaces_transceiver()))
-
-        for partition in device.partitions:
-            device.change_partition(partition)
-            device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show interfaces:")
-            print(device.pretty_print_json_as_yaml("a10-url /interface/ethernet/stats: "))
-            print(device.pretty_print_json_as_yaml(device.get_interface_ethernet()))
-            device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show interfaces ve:")
-            print(device.pretty_print_json_as_yaml("a10-url /interface/ve/stats: "))
-            print(device.pretty_print_json_as_yaml(device.get_interface_ve()))
-            device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show vlans ")
-            print(device.pretty_print_json_as_yaml("a10-url /network/vlan/: "))
-            print(device.pretty_print_json_as_yaml(device.get_vlans()))
-            device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show vlan counters ")
-            print(device.pretty_print_json_as_yaml("a10-url /network/vlan/stats: "))
-            print(device.pretty_print_json_as_yaml(device.get_vlan_stats()))
-        device.change_partition('shared')
+        device.report.text("a10-url cli-deploy show interfaces transceiver eth X details: ")
+        device.report.yaml(device.get_interfaces_transceiver())
+
+    def _interface_trunk_vlan_check_partition(self, device, partition):
+        """interface and vlan data for one partition"""
+        device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show interfaces:")
+        device.report.text("a10-url /interface/ethernet/stats: ")
+        device.report.yaml(device.get_interface_ethernet())
+        device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show interfaces ve:")
+        device.report.text("a10-url /interface/ve/stats: ")
+        device.report.yaml(device.get_interface_ve())
+        device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show vlans ")
+        device.report.text("a10-url /network/vlan/: ")
+        device.report.yaml(device.get_vlans())
+        device.build_section_header("Interface/Trunk/Vlan::" + partition + "::show vlan counters ")
+        device.report.text("a10-url /network/vlan/stats: ")
+        device.report.yaml(device.get_vlan_stats())
 
     def system_resource_check(self, device):
         """gets systems resources data"""
         for partition in device.partitions:
             device.change_partition(partition)
-            resource_accounting = device.get_resource_acct()
-            # statically mapping to a list position by index is gross, but Im not smart enough to do it by keyword apparently
-            resource_accounting_network = resource_accounting['resource-accounting']['oper']['partition-resource']['partition-name' == partition]['res-type'][0]
-            resource_accounting_apps = resource_accounting['resource-accounting']['oper']['partition-resource']['partition-name' == partition]['res-type'][1]
-            resource_accounting_system = resource_accounting['resource-accounting']['oper']['partition-resource']['partition-name' == partition]['res-type'][2]
-            device.build_section_header("System Resources::Partition::" + partition + "::System Accounting Applications:")
-            print(device.pretty_print_json_as_yaml("a10-url /system/resource-accounting/oper"))
-            print(device.pretty_print_json_as_yaml(resource_accounting_apps))
-            device.build_section_header("System Resources::Partition::" + partition + "::System Accounting Network:")
-            print(device.pretty_print_json_as_yaml("a10-url /system/resource-accounting/oper"))
-            print(device.pretty_print_json_as_yaml(resource_accounting_network))
-            device.build_section_header("System Resources::Partition::" + partition + "::System Accounting:")
-            print(device.pretty_print_json_as_yaml("a10-url /system/resource-accounting/oper"))
-            print(device.pretty_print_json_as_yaml(resource_accounting_system))
-            device.build_section_header("System Resources::Partition::" + partition + "::System ICMP Stats:")
-            print(device.pretty_print_json_as_yaml("a10-url /system/icmp/stats: "))
-            print(device.pretty_print_json_as_yaml(device.get_icmp_stats()))
-            device.build_section_header("System Resources::Partition::" + partition + "::System Bandwidth Stats:")
-            print(device.pretty_print_json_as_yaml("a10-url /system/bandwidth/stats: "))
-            print(device.pretty_print_json_as_yaml(device.get_system_bandwidth_stats()))
+            self._system_resource_check_partition(device, partition)
         device.change_partition('shared')
 
+    def _system_resource_check_partition(self, device, partition):
+        """system resources data for one partition"""
+        resource_accounting = device.get_resource_acct()
+        # statically mapping to a list position by index is gross, but Im not smart enough to do it by keyword apparently
+        resource_accounting_network = resource_accounting['resource-accounting']['oper']['partition-resource']['partition-name' == partition]['res-type'][0]
+        resource_accounting_apps = resource_accounting['resource-accounting']['oper']['partition-resource']['partition-name' == partition]['res-type'][1]
+        resource_accounting_system = resource_accounting['resource-accounting']['oper']['partition-resource']['partition-name' == partition]['res-type'][2]
+        device.build_section_header("System Resources::Partition::" + partition + "::System Accounting Applications:")
+        device.report.text("a10-url /system/resource-accounting/oper")
+        device.report.yaml(resource_accounting_apps)
+        device.build_section_header("System Resources::Partition::" + partition + "::System Accounting Network:")
+        device.report.text("a10-url /system/resource-accounting/oper")
+        device.report.yaml(resource_accounting_network)
+        device.build_section_header("System Resources::Partition::" + partition + "::System Accounting:")
+        device.report.text("a10-url /system/resource-accounting/oper")
+        device.report.yaml(resource_accounting_system)
+        device.build_section_header("System Resources::Partition::" + partition + "::System ICMP Stats:")
+        device.report.text("a10-url /system/icmp/stats: ")
+        device.report.yaml(device.get_icmp_stats())
+        device.build_section_header("System Resources::Partition::" + partition + "::System Bandwidth Stats:")
+        device.report.text("a10-url /system/bandwidth/stats: ")
+        device.report.yaml(device.get_system_bandwidth_stats())
+
     def system_check(self, device):
         """does a systems check"""
         device.build_section_header("Sessions Check::CPU::Data CPU:")
-        print(device.pretty_print_json_as_yaml("a10-url system/data-cpu/stats: "))
-        print(device.pretty_print_json_as_yaml(device.get_data_cpu()))
+        device.report.text("a10-url system/data-cpu/stats: ")
+        device.report.yaml(device.get_data_cpu())
         device.build_section_header("Sessions Check::CPU::Control CPU:")
-        print(device.pretty_print_json_as_yaml("a10-url system/control-cpu/stats:"))
-        print(device.pretty_print_json_as_yaml(device.get_control_cpu()))
+        device.report.text("a10-url system/control-cpu/stats:")
+        device.report.yaml(device.get_control_cpu())
         device.build_section_header("Sessions Check::Spikes::show system cpu-load-sharing:")
-        print(device.pretty_print_json_as_yaml("a10-url /system/cpu-load-sharing: "))
-        print(device.pretty_print_json_as_yaml(device.get_cpu_load_sharing()))
+        device.report.text("a10-url /system/cpu-load-sharing: ")
+        device.report.yaml(device.get_cpu_load_sharing())
         device.build_section_header("Sessions Check::Spikes::show cpu history:")
-        print(device.pretty_print_json_as_yaml("a10-url /system/data-cpu/: "))
-        print(device.pretty_print_json_as_yaml(device.get_cpu_history()))
+        device.report.text("a10-url /system/data-cpu/: ")
+        device.report.yaml(device.get_cpu_history())
 
     def sessions_check(self, device):
         """gets sessions data"""
-        device.build_section_header("Sessions Check::show system statistics:")
-        print(device.pretty_print_json_as_yaml("a10-url /system/session/stats: "))
-        print(device.pretty_print_json_as_yaml(device.get_session()))
-
+        self._sessions_check_before(device)
         for partition in device.partitions:
             device.change_partition(partition)
-            device.build_section_header("Sessions Check::" + partition + "::show ip route:")
-            print(device.pretty_print_json_as_yaml("a10-url ip/fib/oper: "))
-            print(device.pretty_print_json_as_yaml(device.get_ip_route()))
-            device.build_section_header("Sessions Check::" + partition + "::show ip stats:")
-            print(device.pretty_print_json_as_yaml("a10-url /ip/stats: "))
-            print(device.pretty_print_json_as_yaml(device.get_ip_stats()))
-            device.build_section_header("Sessions Check::" + partition + "show slb switch (TCP STATS):")
-            print(device.pretty_print_json_as_yaml("a10-url /slb/switch/stats"))
-            switch_stats = device.get_slb_switch()
-            switch_stats = switch_stats['switch']['stats']
-            for key, value in switch_stats.items():
-                if 'tcp' in key:
-                    print(device.pretty_print_json_as_yaml(key + ':' + str(value)))
-
-            device.build_section_header("Sessions Check::" + partition + "show slb switch (UDP STATS):")
-            print(device.pretty_print_json_as_yaml("a10-url /slb/switch/stats: "))
-            for key, value in switch_stats.items():
-                if 'udp' in key:
-                    print(device.pretty_print_json_as_yaml(key + ':' + str(value)))
-
-            device.build_section_header("Sessions Check::" + partition + "show slb tcp stack:")
-            print("a10-url system/tcp: ")
-            print(device.pretty_print_json_as_yaml(device.get_slb_tcp_stack()))
-
-            device.build_section_header("Sessions Check::" + partition + "show slb ssl error:")
-            print("a10-url cli-deploy show slb ssl error: ")
-            print(device.pretty_print_json_as_yaml(device.get_slb_ssl_error()))
-
-            device.build_section_header("Sessions Check::" + partition + "show slb ssl stats:")
-            print("a10-url cli-deploy show slb ssl stats: ")
-            print(device.pretty_print_json_as_yaml(device.get_slb_ssl_stats()))
-
-            device.build_section_header("Sessions Check::" + partition + "show slb l4 detail:")
-            print("a10-url /slb/l4/stats: ")
-            print(device.pretty_print_json_as_yaml(device.get_slb_l4()))
+            self._sessions_check_partition(device, partition)
         device.change_partition('shared')
+        self._sessions_check_after(device)
+
+    def _sessions_check_before(self, device):
+        """sessions data, runs before the partitions"""
+        device.build_section_header("Sessions Check::show system statistics:")
+        device.report.text("a10-url /system/session/stats: ")
+        device.report.yaml(device.get_session())
+        # the session table capacity, read with the session stats by the Health_Check_Interpreter.py session rule
+        self._collect_only(device, device.get_system_resources_usage)
+
+    def _sessions_check_partition(self, device, partition):
+        """sessions data for one partition"""
+        device.build_section_header("Sessions Check::" + partition + "::show ip route:")
+        device.report.text("a10-url ip/fib/oper: ")
+        device.report.yaml(device.get_ip_route())
+        device.build_section_header("Sessions Check::" + partition + "::show ip stats:")
+        device.report.text("a10-url /ip/stats: ")
+        device.report.yaml(device.get_ip_stats())
+        device.build_section_header("Sessions Check::" + partition + "show slb switch (TCP STATS):")
+        device.report.text("a10-url /slb/switch/stats")
+        switch_stats = device.get_slb_switch()
+        switch_stats = switch_stats['switch']['stats']
+        for key, value in switch_stats.items():
+            if 'tcp' in key:
+                device.report.yaml(key + ':' + str(value))
+
+        device.build_section_header("Sessions Check::" + partition + "show slb switch (UDP STATS):")
+        device.report.text("a10-url /slb/switch/stats: ")
+        for key, value in switch_stats.items():
+            if 'udp' in key:
+                device.report.yaml(key + ':' + str(value))
+
+        device.build_section_header("Sessions Check::" + partition + "show slb tcp stack:")
+        device.report.text("a10-url system/tcp: ")
+        device.report.yaml(device.get_slb_tcp_stack())
+
+        device.build_section_header("Sessions Check::" + partition + "show slb ssl error:")
+        device.report.text("a10-url cli-deploy show slb ssl error: ")
+        device.report.yaml(device.get_slb_ssl_error())
+
+        device.build_section_header("Sessions Check::" + partition + "show slb ssl stats:")
+        device.report.text("a10-url cli-deploy show slb ssl stats: ")
+        device.report.yaml(device.get_slb_ssl_stats())
+
+        device.build_section_header("Sessions Check::" + partition + "show slb l4 detail:")
+        device.report.text("a10-url /slb/l4/stats: ")
+        device.report.yaml(device.get_slb_l4())
+
+    def _sessions_check_after(self, device):
+        """shared partition data, runs after the partitions"""
         # this may fail on some devices prior to 4.1.1-P6/7, shared partition only
         device.build_section_header("Sessions Check::show ip anomaly-drop statistics :")
-        print(device.pretty_print_json_as_yaml("a10-url /ip/anomaly-drop/stats"))
-        print(device.pretty_print_json_as_yaml(device.get_ip_anomaly_drop()))
+        device.report.text("a10-url /ip/anomaly-drop/stats")
+        device.report.yaml(device.get_ip_anomaly_drop())
 
     def system_errors_check(self, device):
         """gets systems errors data"""
         device.build_section_header(" System Errors::show log | i Errors: ")
-        print("a10-url syslog/oper: ")
-        logs = device.pretty_print_json_as_yaml(device.get_logging_data()).split('\n')
-        keyword_list = ['Error', 'Warning', 'Critical']
-        for line in logs:
-            if any(word in line for word in keyword_list):
-                print(line)
+        device.report.text("a10-url syslog/oper: ")
+        # one entry per message template of the Warning and more severe entries, not every matching line
+        device.report.yaml(analyze_syslog(device.get_logging_data()))
 
     def health_monitor_check(self, device):
         """gets health monitor data"""
         for partition in device.partitions:
             device.change_partition(partition)
-            device.build_section_header(" Health Monitor Status::" + partition + "::show health monitor: ")
-            print("a10-url /health/monitor: ")
-            print(device.pretty_print_json_as_yaml(device.get_health_monitor()))
-            device.build_section_header("Health Monitor Status::" + partition + "show health stat:")
-            print("a10-url cli-deploy show health stat: ")
-            health_stat = (device.get_health_monitor_status())
-            print(device.pretty_print_json_as_yaml(health_stat))
-            device.build_section_header("Health Monitor Status::" + partition + "::show health down-reason N:")
-            print("a10-url cli-deploy show health down-reason N: ")
-            # the health_stat.values() is passed to the other method, but not used.  That seems incorrect.
-            dr_list = device.get_hm_down_reasons()
-            if '0' in dr_list:
-                dr_list.remove('0')
-            else:
-                for dr in list(set(dr_list)):
-                    print(device.pretty_print_json_as_yaml(device.get_health_monitor_reason(dr)))
+            self._health_monitor_check_partition(device, partition)
         device.change_partition('shared')
 
+    def _health_monitor_check_partition(self, device, partition):
+        """health monitor data for one partition"""
+        device.build_section_header(" Health Monitor Status::" + partition + "::show health monitor: ")
+        device.report.text("a10-url /health/monitor: ")
+        device.report.yaml(device.get_health_monitor())
+        device.build_section_header("Health Monitor Status::" + partition + "show health stat:")
+        device.report.text("a10-url cli-deploy show health stat: ")
+        health_stat = (device.get_health_monitor_status())
+        device.report.yaml(health_stat)
+        device.build_section_header("Health Monitor Status::" + partition + "::show health down-reason N:")
+        device.report.text("a10-url cli-deploy show health down-reason N: ")
+        # the health_stat.values() is passed to the other method, but not used.  That seems incorrect.
+        dr_list = device.get_hm_down_reasons()
+        if '0' in dr_list:
+            dr_list.remove('0')
+        else:
+            device.prefetch_clideploy(['show health down-reason ' + dr for dr in dr_list])
+            for dr in list(set(dr_list)):
+                device.report.yaml(device.get_health_monitor_reason(dr))
+
     def performance_data_check(self, device):
         """gets performance data"""
         device.build_section_header("Performance Data: /system/performance:")
-        i = 0  # Iterator
-        print("a10-url /system/performance: ")
-        for i in range(0, args.repeat):
-            print(device.pretty_print_json_as_yaml(device.get_performance()))
-            sleep(1.0)
-            args.repeat -= 1
+        device.report.text("a10-url /system/performance: ")
+        # every device takes its own args.repeat samples on a fixed clock
+        series, lateness = sample_performance(device, args.repeat, args.sample_interval)
+        if any(perf_stats(response) for offset, response in series):
+            device.report.series(perf_series(series, args.sample_interval, lateness))
+        else:
+            # nothing to chart, most likely an error response, show what the device said
+            for offset, response in series:
+                device.report.yaml(response)
 
     def application_services_check(self, device):
-        device.build_section_header('Application Services')
-        device.build_section_header("Application Services::show slb server:")
-        print("a10-url /slb/server/oper: ")
-        print(device.pretty_print_json_as_yaml(device.get_slb_server_oper()))
-        device.build_section_header("Application Services::show slb service-group:")
-        print("a10-url /slb/service-group/oper: ")
-        print(device.pretty_print_json_as_yaml(device.get_slb_service_group_oper()))
-        device.build_section_header("Application Services::show slb virtual-server:")
-        print("a10-url /slb/virtual-server/oper: ")
-        print(device.pretty_print_json_as_yaml(device.get_slb_virtual_server_oper()))
+        """gets slb object data"""
+        self._application_services_check_before(device)
         # iterate through each partition
         for partition in device.partitions:
             # change to the first partition
             device.change_partition(partition)
-            device.build_section_header('PARTITION: ' + partition)
-            # instantiate empty list of servers
-            servers = []
-            # get json list of servers
-            slb_servers = device.get_slb_servers()
-
-            try:
-                # for each server in the list (if isn't empty) add the name as a value
-                if slb_servers:
-                    for server in slb_servers['server-list']:
-                        servers.append(server['name'])
-
-                    # for each named server print a header then the stat information
-                    for server in servers:
-                        server_stats = device.get_slb_server_stats(server)
-                        device.build_section_header('Stats for partition: ' + partition + '::SLB SERVER ' + server)
-                        print(device.pretty_print_json_as_yaml(server_stats))
-
-            except KeyError:
-                print('There are no SLB Servers configured on partition ' + partition)
-
-            # instantiate an empty list of service-groups
-            service_groups = []
-            # get the json list of service-groups
-            slb_service_groups = device.get_slb_service_groups()
-
-            try:
-                # for each service-group in the list (if it isn't empty) add the name as a value
-                if slb_service_groups:
-                    for service_group in slb_service_groups['service-group-list']:
-                        service_groups.append(service_group['name'])
-
-                    # for each named service-group print a header then the stat information
-                    for service_group in service_groups:
-                        service_group_stats = device.get_slb_service_group_stats(service_group)
-                        device.build_section_header(
-                            'Stats for partition: ' + partition + '::SLB SERVICE-GROUP ' + service_group)
-                        print(device.pretty_print_json_as_yaml(service_group_stats))
-
-            except KeyError:
-                print('There are no SLB Service-Groups on partition ' + partition)
-
-            # instantiate an empty list of virtual-servers
-            virtual_servers = []
-            # get teh json list of virtual-servers
-            slb_virtual_servers = device.get_slb_virtual_servers()
-
-            try:
-                # for each virtual-server in the list (if it isn't empty) add the name as a value
-                if slb_virtual_servers:
-                    for virtual_server in slb_virtual_servers['virtual-server-list']:
-                        virtual_servers.append(virtual_server['name'])
-
-                    # for each named virtual-server print a header then the stat information
-                    for virtual_server in virtual_servers:
-                        virtual_server_stats = device.get_slb_virtual_server_stats(virtual_server)
-                        device.build_section_header(
-                            'Stats for partition: ' + partition + '::SLB VIRTUAL-SERVER ' + virtual_server)
-                        print(device.pretty_print_json_as_yaml(virtual_server_stats))
-
-            except KeyError:
-                print('There are no SLB Virtual Servers configured on partition ' + partition)
-
+            self._application_services_check_partition(device, partition)
         device.change_partition('shared')
 
+    def _application_services_check_before(self, device):
+        """slb oper data, runs before the partitions"""
+        device.build_section_header('Application Services')
+        device.build_section_header("Application Services::show slb server:")
+        device.report.text("a10-url /slb/server/oper: ")
+        device.report.yaml(device.get_slb_server_oper())
+        device.build_section_header("Application Services::show slb service-group:")
+        device.report.text("a10-url /slb/service-group/oper: ")
+        device.report.yaml(device.get_slb_service_group_oper())
+        device.build_section_header("Application Services::show slb virtual-server:")
+        device.report.text("a10-url /slb/virtual-server/oper: ")
+        device.report.yaml(device.get_slb_virtual_server_oper())
+
+    def _application_services_check_partition(self, device, partition):
+        """slb object stats for one partition"""
+        device.build_section_header('PARTITION: ' + partition)
+        if partition != 'shared':
+            # the shared oper data is read above, this is what the interpreter's down-servers rule reads from a
+            # collection of the partitions
+            self._collect_only(device, device.get_slb_server_oper)
+        # instantiate empty list of servers
+        servers = []
+        # get json list of servers
+        slb_servers = device.get_slb_servers()
+
+        try:
+            # for each server in the list (if isn't empty) add the name as a value
+            if slb_servers:
+                for server in slb_servers['server-list']:
+                    servers.append(server['name'])
+
+                # stats for every server in one request, per-server calls only for what it didn't return
+                bulk_stats = device.get_slb_server_stats_bulk()
+
+                # for each named server print a header then the stat information
+                for server in servers:
+                    server_stats = bulk_stats.get(server) or device.get_slb_server_stats(server)
+                    device.build_section_header('Stats for partition: ' + partition + '::SLB SERVER ' + server)
+                    device.report.yaml(server_stats)
+
+        except KeyError:
+            device.report.text('There are no SLB Servers configured on partition ' + partition)
+
+        # instantiate an empty list of service-groups
+        service_groups = []
+        # get the json list of service-groups
+        slb_service_groups = device.get_slb_service_groups()
+
+        try:
+            # for each service-group in the list (if it isn't empty) add the name as a value
+            if slb_service_groups:
+                for service_group in slb_service_groups['service-group-list']:
+                    service_groups.append(service_group['name'])
+
+                # stats for every service-group in one request, per-group calls only for what it didn't return
+                bulk_stats = device.get_slb_service_group_stats_bulk()
+
+                # for each named service-group print a header then the stat information
+                for service_group in service_groups:
+                    service_group_stats = (bulk_stats.get(service_group) or
+                                           device.get_slb_service_group_stats(service_group))
+                    device.build_section_header(
+                        'Stats for partition: ' + partition + '::SLB SERVICE-GROUP ' + service_group)
+                    device.report.yaml(service_group_stats)
+
+        except KeyError:
+            device.report.text('There are no SLB Service-Groups on partition ' + partition)
+
+        # instantiate an empty list of virtual-servers
+        virtual_servers = []
+        # get teh json list of virtual-servers
+        slb_virtual_servers = device.get_slb_virtual_servers()
+
+        try:
+            # for each virtual-server in the list (if it isn't empty) add the name as a value
+            if slb_virtual_servers:
+                for virtual_server in slb_virtual_servers['virtual-server-list']:
+                    virtual_servers.append(virtual_server['name'])
+
+                # stats for every virtual-server in one request, per-vip calls only for what it didn't return
+                bulk_stats = device.get_slb_virtual_server_stats_bulk()
+
+                # for each named virtual-server print a header then the stat information
+                for virtual_server in virtual_servers:
+                    virtual_server_stats = (bulk_stats.get(virtual_server) or
+                                            device.get_slb_virtual_server_stats(virtual_server))
+                    device.build_section_header(
+                        'Stats for partition: ' + partition + '::SLB VIRTUAL-SERVER ' + virtual_server)
+                    device.report.yaml(virtual_server_stats)
+
+        except KeyError:
+            device.report.text('There are no SLB Virtual Servers configured on partition ' + partition)
+
     def monitoring_check(self, device):
         device.build_section_header('Monitoring Review::show run logging')
-        print("a10-url /logging: ")
-        print(device.pretty_print_json_as_yaml(device.get_logging()))
+        device.report.text("a10-url /logging: ")
+        device.report.yaml(device.get_logging())
 
     def security_check(self, device):
         """gets the information for the security check"""
         device.build_section_header('Security Check::show management')
-        print("a10-url enable-management: ")
-        print(device.pretty_print_json_as_yaml(device.get_management_services()))
+        device.report.text("a10-url enable-management: ")
+        device.report.yaml(device.get_management_services())
         device.build_section_header('Security Check::show slb conn-rate-limit src-ip statistics')
-        print("a10-url /slb/common/conn-rate-limit: ")
-        print(device.pretty_print_json_as_yaml(device.get_slb_conn_rate_limit_data()))
+        device.report.text("a10-url /slb/common/conn-rate-limit: ")
+        device.report.yaml(device.get_slb_conn_rate_limit_data())
         device.build_section_header('Security Check::show ip anomaly-drop statistics')
-        print("a10-url ip/anomaly-drop/stats: ")
-        print(device.pretty_print_json_as_yaml(device.get_ip_anomaly_drop()))
+        device.report.text("a10-url ip/anomaly-drop/stats: ")
+        device.report.yaml(device.get_ip_anomaly_drop())
 
     def version_check(self, device):
         """gets the information for the version check"""
         device.build_section_header('Version Check::show version')
-        print('a10-url /system/version')
-        print(device.pretty_print_json_as_yaml(device.get_version()))
+        device.report.text('a10-url /system/version')
+        device.report.yaml(device.get_version())
         device.build_section_header('Version Check::show bootimage')
-        print('a10-url cli-deploy show bootimage')
-        print(device.pretty_print_json_as_yaml(device.get_bootimage()))
+        device.report.text('a10-url cli-deploy show bootimage')
+        device.report.yaml(device.get_bootimage())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+'''
+Summary:
+    Benchmark suite for the health check. A local AxAPI stand-in (Fake_Axapi.py) is started for every scale, and
+    each HealthCheck method and the full Health_Check.main run are timed against it, so regressions and
+    improvements show up as numbers instead of impressions.
+
+    A scale is the number of servers, service groups and virtual servers in every partition, e.g.
+
+        ./Health_Check_Benchmark.py --scales 10,1000,10000 --partitions 2 --latency 0.002
+
+    Each measurement is the best of --rounds runs. The AxAPI requests issued for it are counted by the stand-in.
+    performance_data_check includes its one second sampling interval between each of the --repeat samples.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import Health_Check
+from Acos import Acos, ResponseCache
+from Fake_Axapi import FakeDevice, start_server
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+parser = argparse.ArgumentParser(description='Times the health check methods against a local AxAPI stand-in at several object counts.')
+parser.add_argument('--scales', default='10,1000,10000', help='Comma separated slb object counts per kind and partition (default: 10,1000,10000)')
+parser.add_argument('--partitions', default=1, type=int, help='Number of L3V partitions besides shared on the stand-in (default: 1)')
+parser.add_argument('--latency', default=0.0, type=float, help='Seconds the stand-in adds to every response (default: 0)')
+parser.add_argument('--rounds', default=3, type=int, help='Runs per measurement, the fastest one is reported (default: 3)')
+parser.add_argument('-r', '--repeat', default=1, type=int, help='Samples taken by performance_data_check (default: 1)')
+parser.add_argument('-m', '--methods', default=None, help='Comma separated HealthCheck methods to time (default: all of them)')
+parser.add_argument('--skip-main', action='store_true', help='Only time the individual methods, not the full Health_Check.main run')
+parser.add_argument('--json', default=None, metavar='FILE', help='Also write the results to FILE as JSON')
+
+
+def healthcheck_args(address, repeat, extra=()):
+    """returns the Health_Check arguments for a run against the stand-in"""
+    return ['-d', address, '--protocol', 'http', '-w', '0', '-r', str(repeat)] + list(extra)
+
+
+class Benchmark(object):
+    """Times the health check against one stand-in device"""
+    def __init__(self, scale, partitions, latency, rounds, repeat):
+        self.scale = scale
+        self.rounds = rounds
+        self.repeat = repeat
+        self.fake = FakeDevice(partitions=partitions, latency=latency, servers=scale, service_groups=scale,
+                               virtual_servers=scale)
+        self.server = start_server(self.fake)
+        self.address = '127.0.0.1:' + str(self.server.server_port)
+        self.logger = logging.getLogger('Benchmark')
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def measure(self, function):
+        """returns the fastest of self.rounds runs of function and the requests it issued"""
+        best = None
+        requests = 0
+        for i in range(self.rounds):
+            before = self.fake.requests
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            requests = self.fake.requests - before
+            if best is None or elapsed < best:
+                best = elapsed
+        return {'seconds': round(best, 4), 'requests': requests}
+
+    def open_device(self):
+        """returns an authenticated Acos for the stand-in writing its report to devnull"""
+        device = Acos(self.address, 'admin', 'a10', 0, protocol='http', cache=ResponseCache(0))
+        device.out = open(os.devnull, 'w')
+        device.set_logging_env()
+        device.token = device.auth()
+        device.partitions = device.get_partition_list()
+        return device
+
+    def close_device(self, device):
+        device.auth_logoff(device.token)
+        device.out.close()
+        device.close()
+
+    def time_methods(self, names=None):
+        """returns {method name: measurement} for the HealthCheck methods, each run on its own"""
+        results = {}
+        healthcheck = Health_Check.HealthCheck()
+        Health_Check.args = Health_Check.parser.parse_args(healthcheck_args(self.address, self.repeat))
+        device = self.open_device()
+        try:
+            for method in Health_Check.healthcheck_methods(healthcheck):
+                if names and method.__name__ not in names:
+                    continue
+
+                results[method.__name__] = self.measure(lambda: method(device))
+                self.logger.debug(method.__name__ + ' at scale ' + str(self.scale) + ': ' +
+                                  str(results[method.__name__]))
+        finally:
+            self.close_device(device)
+        return results
+
+    def time_main(self):
+        """returns the measurement of a full Health_Check.main run"""
+        with tempfile.TemporaryDirectory() as output_dir:
+            def run():
+                argv = healthcheck_args(self.address, self.repeat, ['--output-dir', output_dir])
+                # the summary and timings main prints would drown out the benchmark table
+                with contextlib.redirect_stdout(io.StringIO()):
+                    Health_Check.main(argv)
+            return self.measure(run)
+
+
+def print_table(scales, results):
+    """prints one row per method with the seconds and requests for every scale"""
+    rows = []
+    for scale in scales:
+        for name in results[str(scale)]:
+            if name not in rows:
+                rows.append(name)
+    print('{:<32} '.format('Method') + ''.join('{:>22} '.format(str(scale) + ' objects') for scale in scales))
+    print('{:-<32} '.format('') + ''.join('{:->22} '.format('') for scale in scales))
+    for name in rows:
+        line = '{:<32} '.format(name)
+        for scale in scales:
+            result = results[str(scale)].get(name)
+            if result is None:
+                line += '{:>22} '.format('-')
+            else:
+                line += '{:>22} '.format('{:.4f}s {:>6} req'.format(result['seconds'], result['requests']))
+        print(line)
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
+    scales = [int(scale) for scale in args.scales.split(',')]
+    names = args.methods.split(',') if args.methods else None
+
+    results = {}
+    for scale in scales:
+        benchmark = Benchmark(scale, args.partitions, args.latency, args.rounds, args.repeat)
+        try:
+            results[str(scale)] = benchmark.time_methods(names)
+            if not args.skip_main:
+                results[str(scale)]['main'] = benchmark.time_main()
+        finally:
+            benchmark.close()
+
+    print('Partitions: ' + str(args.partitions) + ', latency: ' + str(args.latency) + 's, best of ' +
+          str(args.rounds) + ' round(s)\n')
+    print_table(scales, results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'partitions': args.partitions, 'latency': args.latency, 'rounds': args.rounds,
+                       'repeat': args.repeat, 'results': results}, f, indent=2)
+        print('\nResults written to ' + args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+
+'''
+Summary:
+    Long-running collector for fleet-wide polling. One authenticated AxAPI session is kept open per device and a set
+    of Acos getters is polled on independent fixed-clock schedules, e.g.
+
+        ./Health_Check_Collector.py -d 10.0.1.221,10.0.1.222 \
+            --poll get_performance=5,get_data_cpu=30,get_slb_server_oper=60 --partitions all
+
+    Schedules of a device that fall due within --coalesce seconds of each other are run together as a single tick,
+    so each partition is entered once per tick. A token that expired on the device is renewed transparently and the
+    call retried. A call that fails is retried with backoff; a getter that keeps failing is skipped for a while and a
+    device that keeps failing is left alone until its circuit breaker lets a trial call through. Every response is
+    written as a JSON lines (or msgpack) record, the same format as Health_Check.py --format, until the collector is
+    stopped with Ctrl-C/SIGTERM or --duration runs out.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import argparse
+import datetime
+import heapq
+import logging
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from Acos import Acos, AcosError, CircuitBreaker, DeviceDegraded, ResponseCache, RetryPolicy
+from Collection_Writer import CollectionWriter, FORMATS
+from Metrics_Exporter import OpenMetricsExporter
+from Token_Cache import DEFAULT_LIFETIME, DEFAULT_PATH, TokenCache
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+DEFAULT_POLL = 'get_performance=5,get_data_cpu=30,get_slb_server_oper=60'
+
+parser = argparse.ArgumentParser(description='Polls A10 devices continuously and writes every response as a collection record.')
+parser.add_argument('-d', '--device', default='192.168.0.152', help='A10 device hostname or IP address. Multiple devices may be included separated by a comma.')
+parser.add_argument('-p', '--password', default='a10', help='user password')
+parser.add_argument('-u', '--username', default='admin', help='username (default: admin)')
+parser.add_argument('-v', '--verbose', default=0, action='count', help='Enable verbose detail')
+parser.add_argument('--poll', default=DEFAULT_POLL, help='Comma separated <Acos getter>=<seconds> schedules (default: ' + DEFAULT_POLL + ')')
+parser.add_argument('--partitions', default='shared', help="Partitions polled: 'shared', 'all', or a comma separated list (default: shared)")
+parser.add_argument('--coalesce', default=1.0, type=float, help='Schedules due within this many seconds of each other run in the same tick (default: 1)')
+parser.add_argument('--workers', default=8, type=int, help='Devices polled at the same time (default: 8)')
+parser.add_argument('--duration', default=0, type=float, help='Stop after this many seconds, 0 runs until interrupted (default: 0)')
+parser.add_argument('-f', '--format', default='jsonl', choices=FORMATS, help='Record format (default: jsonl)')
+parser.add_argument('--collect-file', default=None, help='File the records are written to, gzipped if it ends in .gz (default: collector_<start time>.<format>)')
+parser.add_argument('--openmetrics-port', default=None, type=int, help='Serve the polled counters as OpenMetrics on http://<host>:<port>/metrics')
+parser.add_argument('--openmetrics-host', default='127.0.0.1', help='Address the OpenMetrics endpoint listens on, 0.0.0.0 to let other hosts scrape it (default: 127.0.0.1)')
+parser.add_argument('--openmetrics-file', default=None, help='Write the polled counters to this node_exporter textfile')
+parser.add_argument('--counter-rates', default=0, type=int, metavar='N', help='When stopped, list the N fastest moving counters of every polled stats endpoint, see Counter_Delta.py (requires numpy, default: 0, off)')
+parser.add_argument('--openmetrics-interval', default=15, type=float, help='Seconds between textfile rewrites (default: 15)')
+parser.add_argument('--protocol', default='https', choices=['https', 'http'], help='Protocol used to reach AxAPI (default: https)')
+parser.add_argument('--ca-bundle', default=None, help='Verify the device certificate against this CA bundle (default: no verification)')
+parser.add_argument('--connect-timeout', default=10, type=float, help='Seconds to wait for a connection to the device (default: 10)')
+parser.add_argument('--read-timeout', default=60, type=float, help='Seconds to wait for a response from the device (default: 60)')
+parser.add_argument('--retries', default=2, type=int, help='Times a call that failed to reach the device is retried, with jittered exponential backoff (default: 2)')
+parser.add_argument('--token-cache', nargs='?', const=DEFAULT_PATH, default=None, metavar='FILE', help='Start from the AxAPI sessions kept in FILE by Health_Check.py and hand the sessions back there when stopped instead of logging off (default FILE: ' + DEFAULT_PATH + ')')
+parser.add_argument('--token-lifetime', default=DEFAULT_LIFETIME, type=float, help='Seconds a session may sit idle before it is no longer reused (default: ' + str(DEFAULT_LIFETIME) + ')')
+parser.add_argument('--breaker-cooldown', default=60, type=float, help='Seconds a failing device or getter is skipped before it is tried again (default: 60)')
+
+
+def parse_schedules(spec):
+    """returns [(getter name, interval)] from '<getter>=<seconds>,...'"""
+    schedules = []
+    for item in spec.split(','):
+        name, separator, interval = item.strip().partition('=')
+        if not separator or not name.startswith('get_') or not callable(getattr(Acos, name, None)):
+            raise ValueError('Not an Acos getter schedule: ' + item)
+        if float(interval) <= 0:
+            raise ValueError('Schedule interval must be positive: ' + item)
+        schedules.append((name, float(interval)))
+    return schedules
+
+
+class SessionAcos(Acos):
+    """Acos that renews its token and retries once when the device reports the session as invalid"""
+    def __init__(self, *args, **kwargs):
+        Acos.__init__(self, *args, **kwargs)
+        self.token = None
+        self.reauths = 0
+
+    def login(self):
+        self.token = self.auth()
+        return self.token
+
+    def send(self, module, method, payload=''):
+        status_code, r, transfer = Acos.send(self, module, method, payload)
+        if status_code == 401 and module.strip('/') not in ('auth', 'logoff') and self.token is not None:
+            partition = self.partition
+            self.logger.info('Session expired, authenticating again')
+            self.reauths += 1
+            self.login()
+            if partition != 'shared' and not module.startswith('active-partition/'):
+                Acos.change_partition(self, partition)
+            status_code, r, transfer = Acos.send(self, module, method, payload)
+        return status_code, r, transfer
+
+
+class Schedule(object):
+    """One getter polled every interval seconds on a fixed clock"""
+    def __init__(self, getter, interval, start):
+        self.getter = getter
+        self.interval = interval
+        self.due = start
+        self.polls = 0
+        self.missed = 0
+
+    def advance(self, now):
+        """moves to the next due time, skipping the ones that already went by"""
+        self.due += self.interval
+        while self.due <= now:
+            self.due += self.interval
+            self.missed += 1
+
+
+class DevicePoller(object):
+    """Keeps a session open to one device and runs its due schedules"""
+    def __init__(self, device, schedules, partitions='shared', coalesce=1.0):
+        self.device = device
+        self.wanted = partitions
+        self.coalesce = coalesce
+        start = time.monotonic()
+        self.schedules = [Schedule(getter, interval, start) for getter, interval in schedules]
+        self.partitions = None
+        self.ticks = 0
+        self.failures = 0
+
+    def due(self):
+        return min(schedule.due for schedule in self.schedules)
+
+    def connect(self):
+        self.device.login()
+        if self.wanted == 'all':
+            self.partitions = self.device.get_partition_list()
+        else:
+            self.partitions = self.wanted.split(',')
+
+    def tick(self):
+        """runs every schedule due now or within the coalesce window, one partition at a time"""
+        now = time.monotonic()
+        due = [schedule for schedule in self.schedules if schedule.due <= now + self.coalesce]
+        try:
+            if self.device.token is None:
+                self.connect()
+            for partition in self.partitions:
+                if partition != self.device.partition:
+                    self.device.change_partition(partition)
+                for schedule in due:
+                    self.device.section = schedule.getter
+                    try:
+                        getattr(self.device, schedule.getter)()
+                    except DeviceDegraded:
+                        raise
+                    except AcosError as e:
+                        # only this getter failed, the other schedules of the tick still run
+                        self.failures += 1
+                        self.device.logger.error('Poll of ' + schedule.getter + ' failed: ' + str(e))
+                        continue
+                    schedule.polls += 1
+            self.ticks += 1
+        except Exception as e:
+            # start over with a new session on the next tick, the circuit breaker keeps a degraded device from being
+            # retried before its cooldown passed
+            self.failures += 1
+            self.device.logger.error('Poll failed: ' + str(e))
+            self.logoff()
+        finally:
+            self.device.section = None
+            now = time.monotonic()
+            for schedule in due:
+                schedule.advance(now)
+
+    def logoff(self):
+        """ends the admin session of the device, if any, so a failed tick doesn't leave it open on the device"""
+        if self.device.token is None:
+            return
+        try:
+            self.device.auth_logoff(self.device.token)
+        except Exception as e:
+            self.device.logger.error('Logoff failed: ' + str(e))
+        self.device.token = None
+
+    def close(self):
+        self.logoff()
+        self.device.close()
+
+
+class Collector(object):
+    """Runs the ticks of every device poller as they fall due, never two at once for the same device"""
+    def __init__(self, pollers, workers=8):
+        self.pollers = pollers
+        self.workers = workers
+        self.stop = threading.Event()
+        self.logger = logging.getLogger('Collector')
+
+    def run(self, duration=0):
+        deadline = time.monotonic() + duration if duration else None
+        # (due, poller index) of every poller that is not currently running a tick
+        idle = [(poller.due(), n) for n, poller in enumerate(self.pollers)]
+        heapq.heapify(idle)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self.stop.is_set():
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+                for n, future in list(running.items()):
+                    if future.done():
+                        del running[n]
+                        heapq.heappush(idle, (self.pollers[n].due(), n))
+                if idle and idle[0][0] <= now:
+                    due, n = heapq.heappop(idle)
+                    running[n] = executor.submit(self.pollers[n].tick)
+                    continue
+                # sleep until the next poller is due, waking up regularly to collect finished ticks
+                wait = min(idle[0][0] - now, 0.1) if idle else 0.1
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                self.stop.wait(max(wait, 0))
+            for future in running.values():
+                future.result()
+
+
+def write_textfile(exporter, path, interval, stop):
+    """rewrites the OpenMetrics textfile every interval seconds until stop is set"""
+    while not stop.wait(interval):
+        exporter.write_textfile(path)
+
+
+def print_summary(pollers):
+    print('{:<40} {:>8} {:>8} {:>8} {:>8} {:>8}'.format('Device', 'Ticks', 'Polls', 'Missed', 'Reauths', 'Failed'))
+    for poller in pollers:
+        print('{:<40} {:>8} {:>8} {:>8} {:>8} {:>8}'.format(
+            poller.device.device, poller.ticks, sum(schedule.polls for schedule in poller.schedules),
+            sum(schedule.missed for schedule in poller.schedules), poller.device.reauths, poller.failures))
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    requests.packages.urllib3.disable_warnings()
+    logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
+    try:
+        schedules = parse_schedules(args.poll)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = datetime.datetime.now()
+    collect_file = args.collect_file or 'collector_' + start.strftime('%Y%m%d-%H%M%S') + '.' + args.format
+    collection = CollectionWriter(collect_file, args.format)
+
+    exporter = None
+    if args.openmetrics_port or args.openmetrics_file:
+        exporter = OpenMetricsExporter()
+    counter_rates = None
+    if args.counter_rates > 0:
+        # numpy is only needed for the counter rates
+        from Counter_Delta import CounterRates
+        counter_rates = CounterRates()
+
+    token_cache = None if args.token_cache is None else TokenCache(args.token_cache, args.token_lifetime)
+    pollers = []
+    for address in args.device.split(','):
+        # every poll must reach the device, so the response cache is off
+        device = SessionAcos(address, args.username, args.password, args.verbose, pool_size=2,
+                             connect_timeout=args.connect_timeout, read_timeout=args.read_timeout,
+                             verify=args.ca_bundle if args.ca_bundle else False, protocol=args.protocol,
+                             cache=ResponseCache(0), retry=RetryPolicy(args.retries),
+                             breaker=CircuitBreaker(cooldown=args.breaker_cooldown,
+                                                    endpoint_cooldown=args.breaker_cooldown),
+                             token_cache=token_cache)
+        device.set_logging_env()
+        device.call_hooks.append(collection.write)
+        if exporter is not None:
+            device.call_hooks.append(exporter.record)
+        if counter_rates is not None:
+            device.call_hooks.append(counter_rates.record)
+        pollers.append(DevicePoller(device, schedules, args.partitions, args.coalesce))
+
+    collector = Collector(pollers, args.workers)
+    signal.signal(signal.SIGTERM, lambda signum, frame: collector.stop.set())
+    if args.openmetrics_port:
+        exporter.serve(args.openmetrics_host, args.openmetrics_port)
+        print('OpenMetrics served on http://' + args.openmetrics_host + ':' + str(args.openmetrics_port) + '/metrics')
+    if args.openmetrics_file:
+        writer = threading.Thread(target=write_textfile, daemon=True,
+                                  args=(exporter, args.openmetrics_file, args.openmetrics_interval, collector.stop))
+        writer.start()
+    print('Collector started at: ' + str(start) + ', writing to ' + collect_file)
+    try:
+        collector.run(args.duration)
+    except KeyboardInterrupt:
+        collector.stop.set()
+    finally:
+        for poller in pollers:
+            poller.close()
+        collection.close()
+        if args.openmetrics_file:
+            exporter.write_textfile(args.openmetrics_file)
+
+    print('Collector stopped at: ' + str(datetime.datetime.now()) + ', ' + str(collection.records) +
+          ' records written to ' + collect_file)
+    print_summary(pollers)
+    if counter_rates is not None:
+        print('')
+        counter_rates.print_top(args.counter_rates)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,13 @@
 Summary:
     This script will parse objects grabbed by the Health_Check.py tool and provide feedback based on the output
 
+    The checks are declared as rules in Rule_Engine.py (endpoints, thresholds and predicate). The endpoints all rules
+    need are read once per device, the devices are checked in parallel and every finding is reported with its
+    severity, e.g.
+
+        ./Health_Check_Interpreter.py -d 10.0.1.221,10.0.1.222 --json findings.json
+        ./Health_Check_Interpreter.py --collection health_check_20261016-101500.jsonl
+
 Requires:
     - Python 3.x
     - aXAPI v3
@@ -11,6 +18,7 @@ Requires:
 
 Revisions:
     - 0.1 - initial script generation by A10 engineers: Brandon Marlow, Terry Jones
+    - 0.2 - checks declared as rules and evaluated across devices in parallel
 
 '''
 
@@ -19,22 +27,35 @@ import argparse
 import logging
 import json
 from Health_Check import Acos
+from Acos import AcosError
+from Acos_Replay import ReplayAcos
+from Collection_Writer import index_records, load_records
+from Rule_Engine import RuleEngine, SEVERITIES, collected_data
+from Token_Cache import DEFAULT_LIFETIME, DEFAULT_PATH, TokenCache
 
 parser = argparse.ArgumentParser(description='Running this script will issue whatever commands are presented to this script.  All commands are issued from configuration mode.')
 devices = parser.add_mutually_exclusive_group()
-devices.add_argument('-d', '--device', default='10.0.1.221', help='A10 device hostname or IP address. Multiple devices may be included seperated by a comma.')
+devices.add_argument('-d', '--device', default=None, help='A10 device hostname or IP address. Multiple devices may be included seperated by a comma. (default: 10.0.1.221, or every device in --collection)')
 parser.add_argument('-p', '--password', default='a10', help='user password')
 parser.add_argument('-u', '--username', default='admin', help='username (default: admin)')
 parser.add_argument('-v', '--verbose', default=0, action='count', help='Enable verbose detail')
+parser.add_argument('--replay', default=None, metavar='DIR', help='Read the device responses from the capture archive in DIR (see Health_Check.py --record)')
+parser.add_argument('--collection', default=None, metavar='FILE', help='Evaluate the responses in a collection file (see Health_Check.py --format) instead of reading the devices')
+parser.add_argument('--protocol', default='https', choices=['https', 'http'], help='Protocol used to reach AxAPI, http is only meant for local stand-ins such as Fake_Axapi.py (default: https)')
+parser.add_argument('--workers', default=8, type=int, help='Number of devices checked in parallel (default: 8)')
+parser.add_argument('--severity', default='info', choices=SEVERITIES, help='Only report findings of this severity or worse (default: info, everything)')
+parser.add_argument('--json', default=None, metavar='FILE', help='Also write the findings to FILE as JSON')
+parser.add_argument('--token-cache', nargs='?', const=DEFAULT_PATH, default=None, metavar='FILE', help='Reuse the AxAPI sessions kept in FILE by Health_Check.py and the collector instead of logging off (default FILE: ' + DEFAULT_PATH + ')')
+parser.add_argument('--token-lifetime', default=DEFAULT_LIFETIME, type=float, help='Seconds a session may sit idle before it is no longer reused (default: ' + str(DEFAULT_LIFETIME) + ')')
 
 
 
 try:
     args = parser.parse_args()
-    devices = args.device.split(',')
     password = args.password
     username = args.username
     verbose = args.verbose
+    replay = args.replay
 
 except Exception as e:
     print(e)
@@ -42,155 +63,73 @@ except Exception as e:
 # set the default logging format
 logging.basicConfig(format="%(name)s: %(levelname)s: %(message)s")
 
+engine = RuleEngine()
+token_cache = None if args.token_cache is None or replay else TokenCache(args.token_cache, args.token_lifetime)
 
 
-def main():
-    urllib3.disable_warnings()
-
-    for device in devices:
-        device = Acos(device, username, password)
-        device.set_logging_env()
+def check_device(address):
+    """reads the endpoints of every rule from one device and returns its findings"""
+    if replay:
+        device = ReplayAcos(address, username, password, verbose, capture_dir=replay)
+    else:
+        device = Acos(address, username, password, verbose, protocol=args.protocol, token_cache=token_cache)
+    device.set_logging_env()
+    token = None
+    try:
         token = device.auth()
-        device.set_logging_env()
-
-        ##################################################################################
-        # Capture Current Configs
-        ##################################################################################
-
-
-
-
-        ##################################################################################
-        # Redundancy Check
-        ##################################################################################
-
-        ##################################################################################
-        # Health Check
-        ##################################################################################
-
-
-
-        ##################################################################################
-        # Interface/Trunk/Vlan Check
-        ##################################################################################
-
-
-        ##################################################################################
-        # System Resources
-        ##################################################################################
-
-
-
-        ##################################################################################
-        # Sessions Check
-        ##################################################################################
-
-
-
-        ##################################################################################
-        # System Errors
-        ##################################################################################
-
-
-
-        ##################################################################################
-        # Health Monitor Status
-        ##################################################################################
-
-
-
-
-        ##################################################################################
-        # Performance Data
-        ##################################################################################
-
-
-
-        ##################################################################################
-        # Application Services
-        ##################################################################################
-
-
-
-        ##################################################################################
-        # Monitoring Review
-        ##################################################################################
-
-
-
-        ##################################################################################
-        # Security Check
-        ##################################################################################
-
-        conn_rate_limit = device.get_slb_conn_rate_limit_data()
-
-        admin_services = device.get_management_services()
-
-        #print(json.dumps(admin_services, indent=4))
-
-        device.build_section_header('Management Services Reivew')
-
-        # services to check
-        services = ['ping', 'ssh', 'telnet', 'http', 'https', 'snmp']
-        data_service_enabled = False
-        for service in services:
-            try:
-
-                interfaces = admin_services['enable-management']['service'][service]['eth-cfg']
-
-                interface_list = []
-
-                for interface in interfaces:
-
-                    if interface['ethernet-start'] == interface['ethernet-end']:
-                        interface_list.append(interface['ethernet-start'])
-                        data_service_enabled = True
-
-                    else:
-                        interface_range = range(interface['ethernet-start'], interface['ethernet-end'] + 1)
-                        for item in interface_range:
-                            interface_list.append(item)
-                            data_service_enabled = True
-
-                print(service.upper() + ' service is enabled on the following interfaces: ' + str(interface_list))
-
-            except KeyError:
-                print(service.upper() + ' is not enabled on any data-plane interfaces.')
-
-
-        mgmt_services = []
-        for service in services:
-
-            try:
-                mgmt_service = admin_services['enable-management']['service'][service]['management']
-
-                if mgmt_service == 1:
-                    mgmt_services.append(service.upper())
-
-
-            except KeyError:
-                pass
-
-        print('The following services are enabled on the management interface: ' + str(mgmt_services))
-
-        if data_service_enabled:
-            print('')
-            print('Please note that by default no management services are enabled on data interfaces.')
-            print('The current configuration has management services enabled on data interfaces.')
-            print('Please review that the management services running on the data plane are necessary.')
-
-
-        ##################################################################################
-        # Version/Bootimage Check
-        ##################################################################################
+        data = engine.collect(device)
+    except AcosError as e:
+        # report it and carry on with the other devices
+        return [{'device': address, 'partition': None, 'rule': 'collection', 'severity': 'critical',
+                 'message': 'Could not read the device: ' + str(e), 'value': None}]
+    finally:
+        if token is not None:
+            # on the error path too, so the admin session isn't left open on the device
+            device.auth_logoff(token)
+            device.logger.info('Successfully Logged off of device')
+        device.close()
+    return engine.evaluate(address, data)
+
+
+def print_findings(addresses, findings):
+    """prints the findings of every device, worst first"""
+    for address in addresses:
+        print('{:*^100s}'.format(''))
+        print('{:*^100s}'.format(address))
+        print('{:*^100s}'.format(''))
+        device_findings = [finding for finding in findings if finding['device'] == address]
+        if not device_findings:
+            print('No findings')
+        for finding in device_findings:
+            print('{:<10s} {:<12s} {:<22s} {}'.format(finding['severity'].upper(), str(finding['partition']),
+                                                     finding['rule'], finding['message']))
+        print('')
 
 
+def main():
+    urllib3.disable_warnings()
 
-        ##################################################################################
-        # Logoff
-        ##################################################################################
-        device.auth_logoff(token)
-        device.logger.info('Successfully Logged off of device')
+    if args.collection:
+        index = index_records(load_records(args.collection))
+        addresses = args.device.split(',') if args.device else sorted(index)
+        findings = engine.check(addresses, lambda address: engine.evaluate(address, collected_data(index, address)),
+                                args.workers)
+    else:
+        addresses = (args.device or '10.0.1.221').split(',')
+        findings = engine.check(addresses, check_device, args.workers)
+
+    worst = SEVERITIES.index(args.severity)
+    findings = [finding for finding in findings if SEVERITIES.index(finding['severity']) <= worst]
+    print_findings(addresses, findings)
+    counts = dict((severity, sum(1 for finding in findings if finding['severity'] == severity))
+                  for severity in SEVERITIES)
+    print(str(len(addresses)) + ' device(s) checked against ' + str(len(engine.rules)) + ' rules: ' +
+          ', '.join(str(counts[severity]) + ' ' + severity for severity in SEVERITIES))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(findings, f, indent=2)
+        print('Findings written to ' + args.json)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,143 @@
+'''
+Summary:    This script contains the fleet inventory and scheduling used by Health_Check.py --inventory. An inventory
+            lists every device with its own credentials, tags and an expected-size hint (any relative measure of
+            the work a device takes, e.g. its number of SLB objects), as YAML:
+
+                defaults:
+                  username: admin
+                  password-env: A10_PASSWORD      # read the password from this environment variable
+                devices:
+                  - device: 10.0.1.221
+                    tags: [dc1, prod]
+                    size: 20000
+                  - device: 10.0.1.222
+                    username: monitor
+                    password: secret
+                    size: 500
+
+            or as CSV with a header row: device,username,password,password-env,tags,size (tags separated by ';').
+
+            Devices are started largest first (longest processing time first), which keeps the longest device from
+            being the last one started and so keeps the total wall time of a sharded run close to the shortest
+            possible. Progress reports the devices and expected work done and the estimated time left.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import csv
+import datetime
+import os
+import sys
+import time
+import yaml
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+FIELDS = ('device', 'username', 'password', 'password-env', 'tags', 'size')
+
+
+def inventory_entry(device, username, password, tags=(), size=1):
+    return {'device': device, 'username': username, 'password': password, 'tags': list(tags), 'size': size}
+
+
+def parse_tags(tags):
+    if tags is None:
+        return []
+    if isinstance(tags, str):
+        return [tag.strip() for tag in tags.replace(';', ',').split(',') if tag.strip()]
+    return [str(tag) for tag in tags]
+
+
+def build_entry(item, defaults, line):
+    """returns an inventory entry from one YAML mapping or CSV row, filling in the defaults"""
+    settings = dict(defaults)
+    settings.update(dict((key, value) for key, value in item.items() if value not in (None, '')))
+    unknown = set(settings) - set(FIELDS)
+    if unknown:
+        raise ValueError('Inventory ' + line + ': unknown field(s) ' + ', '.join(sorted(str(key) for key in unknown)))
+    if not settings.get('device'):
+        raise ValueError('Inventory ' + line + ': no device')
+    if item.get('password'):
+        password = item['password']
+    elif settings.get('password-env'):
+        password = os.environ.get(settings['password-env'])
+        if password is None:
+            raise ValueError('Inventory ' + line + ': environment variable ' + settings['password-env'] +
+                             ' is not set')
+    else:
+        password = settings.get('password')
+    try:
+        size = float(settings.get('size', 1))
+    except (TypeError, ValueError):
+        raise ValueError('Inventory ' + line + ': size must be a number')
+    return inventory_entry(str(settings['device']), settings.get('username'), password,
+                           parse_tags(settings.get('tags')), size)
+
+
+def load_inventory(path, username='admin', password='a10', tags=None):
+    """returns the inventory entries of a YAML or CSV file, only those with one of tags when tags are given;
+    username and password are used for devices the inventory has no credentials for"""
+    defaults = {'username': username, 'password': password}
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            items = [(row, 'line ' + str(n)) for n, row in enumerate(csv.DictReader(f), 2)]
+        else:
+            inventory = yaml.safe_load(f) or {}
+            if isinstance(inventory, list):
+                inventory = {'devices': inventory}
+            defaults.update(inventory.get('defaults') or {})
+            items = [(item if isinstance(item, dict) else {'device': item}, 'device ' + str(n))
+                     for n, item in enumerate(inventory.get('devices') or [], 1)]
+    entries = [build_entry(item, defaults, line) for item, line in items]
+    if tags:
+        wanted = set(tags)
+        entries = [entry for entry in entries if wanted.intersection(entry['tags'])]
+    return entries
+
+
+def lpt_order(entries):
+    """returns the entries largest expected size first, keeping the inventory order between equal sizes"""
+    return sorted(entries, key=lambda entry: -entry['size'])
+
+
+class Progress(object):
+    """Tracks finished devices and estimates the time left from the expected size of the remaining ones, checked
+    workers at a time"""
+    def __init__(self, entries, workers=1, stream=None):
+        self.total = len(entries)
+        self.workers = max(workers, 1)
+        self.total_size = sum(entry['size'] for entry in entries) or 1
+        self.sizes = dict((entry['device'], entry['size']) for entry in entries)
+        self.stream = stream or sys.stderr
+        self.start = time.monotonic()
+        self.done = 0
+        self.done_size = 0.0
+        # seconds the finished devices took, each on its own
+        self.busy = 0.0
+
+    def eta(self):
+        """returns the estimated seconds left, or None before the first device finished"""
+        if not self.done_size:
+            return None
+        # the time a device takes per unit of expected size, shared out over the workers still busy
+        workers = min(self.workers, self.total - self.done) or 1
+        return self.busy * (self.total_size - self.done_size) / self.done_size / workers
+
+    def finished(self, result):
+        """records a finished device and reports the progress"""
+        self.done += 1
+        self.done_size += self.sizes.get(result['device'], 0)
+        if result.get('elapsed') is not None:
+            self.busy += result['elapsed'].total_seconds()
+        elapsed = datetime.timedelta(seconds=round(time.monotonic() - self.start))
+        eta = self.eta()
+        remaining = 'ETA ' + str(datetime.timedelta(seconds=round(eta))) if eta is not None else 'ETA unknown'
+        self.stream.write('Progress: ' + str(self.done) + '/' + str(self.total) + ' devices, ' +
+                          '{:.0f}%'.format(100.0 * self.done_size / self.total_size) + ' of the expected work, ' +
+                          'elapsed ' + str(elapsed) + ', ' + remaining + ' (' + result['device'] + ' ' +
+                          result['status'] + ')\n')
+        self.stream.flush()
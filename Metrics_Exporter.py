@@ -0,0 +1,261 @@
+'''
+Summary:    This script contains the OpenMetrics/Prometheus exporter for the counters returned by AxAPI. The exporter
+            is an Acos call hook: every interface, vlan, data CPU, session, SLB L4, SLB performance, SLB object stats
+            and SLB oper response it sees is translated once into finished sample lines with device, partition and
+            object labels, replacing the previous lines of the same device, partition, endpoint and object. The
+            stats of a single SLB object (slb/server/<name>/stats...) replace that object's lines of the list-level
+            endpoint, so an object is never exported twice. A scrape only joins those lines, and the label sets and
+            metric names are cached the first time they are built (the label sets up to LABEL_CACHE_SIZE of them),
+            so thousands of SLB objects per scrape cost string joins rather than formatting.
+
+            The metrics are served from a local HTTP endpoint (/metrics, OpenMetrics or Prometheus text depending
+            on the Accept header) or written atomically to a textfile for the node_exporter textfile collector.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import os
+import re
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+OPENMETRICS_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# endpoint -> (metric prefix, list key or None for a single stats object, object key field, object label, default type)
+STATS_SOURCES = {
+    'interface/ethernet/stats': ('interface_ethernet', 'ethernet-list', 'ifnum', 'interface', 'counter'),
+    'network/vlan/stats': ('vlan', 'vlan-list', 'vlan-num', 'vlan', 'counter'),
+    'system/session/stats': ('session', None, None, None, 'counter'),
+    'slb/l4/stats': ('slb_l4', None, None, None, 'counter'),
+    'slb/perf/stats': ('slb_perf', None, None, None, 'gauge'),
+    'slb/server/stats': ('slb_server', 'server-list', 'name', 'name', 'counter'),
+    'slb/service-group/stats': ('slb_service_group', 'service-group-list', 'name', 'name', 'counter'),
+    'slb/virtual-server/stats': ('slb_virtual_server', 'virtual-server-list', 'name', 'name', 'counter'),
+}
+# endpoint -> (metric prefix, list key)
+OPER_SOURCES = {
+    'slb/server/oper': ('slb_server', 'server-list'),
+    'slb/service-group/oper': ('slb_service_group', 'service-group-list'),
+    'slb/virtual-server/oper': ('slb_virtual_server', 'virtual-server-list'),
+}
+# slb/<kind>/<name>/stats, exported as the <name> entry of the slb/<kind>/stats list
+OBJECT_STATS = re.compile(r'^(slb/(server|service-group|virtual-server))/[^/]+/stats$')
+DATA_CPU = 'system/data-cpu/stats'
+# label sets kept formatted, the cache starts over once it holds this many
+LABEL_CACHE_SIZE = 50000
+
+# counter fields that actually hold a current value or a rate
+GAUGE_FIELD = re.compile(r'per-sec|per_sec|curr|bandwidth|peak|conn_count|usage')
+DATA_CPU_FIELD = re.compile(r'^cpu-?(\d+)$')
+UP_STATES = {'up', 'all up', 'functional up'}
+INVALID_NAME = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def number(value):
+    """returns value formatted as a sample value, or None when it is not a number"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return repr(value)
+
+
+class OpenMetricsExporter(object):
+    """Turns AxAPI responses into OpenMetrics samples, safe to share between device threads"""
+    def __init__(self, prefix='a10'):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        # family -> {(device, partition, endpoint, object): [sample lines]}
+        self.families = {}
+        # family -> 'counter' or 'gauge'
+        self.types = {}
+        # (device, partition, endpoint) -> {(device, partition, endpoint, object): families holding its lines}
+        self.written = {}
+        # (metric prefix, field, type) -> (family, sample name)
+        self.names = {}
+        # label items tuple -> '{device="..",...}'
+        self.labels = {}
+
+    def record(self, record):
+        """updates the samples from a call record, usable directly as an Acos call hook"""
+        endpoint = record['endpoint']
+        if record['status'] not in (200, None) or not isinstance(record['response'], dict):
+            return
+        if endpoint in STATS_SOURCES or endpoint in OPER_SOURCES or endpoint == DATA_CPU:
+            self.update(record['device'], record['partition'], endpoint, record['response'])
+            return
+        match = OBJECT_STATS.match(endpoint)
+        if match:
+            # {'server': {...}} is the entry the list-level endpoint returns in {'server-list': [...]}
+            kind = match.group(2)
+            entry = record['response'].get(kind)
+            if isinstance(entry, dict) and 'name' in entry:
+                self.update(record['device'], record['partition'], match.group(1) + '/stats', {kind + '-list': [entry]},
+                            entry['name'])
+
+    def name(self, metric, field, kind):
+        key = (metric, field, kind)
+        names = self.names.get(key)
+        if names is None:
+            family = self.prefix + '_' + metric + '_' + INVALID_NAME.sub('_', field).strip('_').lower()
+            names = (family, family + '_total' if kind == 'counter' else family)
+            self.names[key] = names
+        return names
+
+    def label_set(self, items):
+        labels = self.labels.get(items)
+        if labels is None:
+            if len(self.labels) >= LABEL_CACHE_SIZE:
+                # objects come and go on a long running collector, don't keep the labels of every one ever seen
+                self.labels.clear()
+            labels = '{' + ','.join(key + '="' + escape(value) + '"' for key, value in items) + '}'
+            self.labels[items] = labels
+        return labels
+
+    def update(self, device, partition, endpoint, response, name=None):
+        """replaces the samples of (device, partition, endpoint) with the ones in response, only those of the
+        object name when the response holds the stats of a single object"""
+        base = (('device', device), ('partition', partition))
+        samples = []
+        if endpoint in STATS_SOURCES:
+            self.stats_samples(samples, base, response, *STATS_SOURCES[endpoint])
+        elif endpoint in OPER_SOURCES:
+            self.oper_samples(samples, base, response, *OPER_SOURCES[endpoint])
+        else:
+            self.data_cpu_samples(samples, base, response)
+
+        kinds = {}
+        lines = {}
+        for family, kind, item, line in samples:
+            kinds[family] = kind
+            lines.setdefault((device, partition, endpoint, item), {}).setdefault(family, []).append(line)
+        scope = (device, partition, endpoint)
+        with self.lock:
+            self.types.update(kinds)
+            written = self.written.setdefault(scope, {})
+            # the lines a list response replaces are those of every object, a single object's only its own
+            old = list(written) if name is None else [key for key in [scope + (name,)] if key in written]
+            for key in old:
+                for family in written.pop(key):
+                    if family not in lines.get(key, ()):
+                        self.families[family].pop(key, None)
+            for key, families in lines.items():
+                written[key] = set(families)
+                for family, series_lines in families.items():
+                    self.families.setdefault(family, {})[key] = series_lines
+
+    def stats_samples(self, samples, base, response, metric, list_key, object_key, label, default_kind):
+        if list_key is None:
+            root = next(iter(response.values()), None)
+            entries = [(None, base, root.get('stats'))] if isinstance(root, dict) else []
+        else:
+            entries = []
+            for entry in response.get(list_key) or []:
+                if isinstance(entry, dict) and object_key in entry:
+                    entries.append((entry[object_key], base + ((label, entry[object_key]),), entry.get('stats')))
+        for item, items, stats in entries:
+            if not isinstance(stats, dict):
+                continue
+            labels = self.label_set(items)
+            for field, value in stats.items():
+                value = number(value)
+                if value is None:
+                    continue
+                kind = 'gauge' if default_kind == 'gauge' or GAUGE_FIELD.search(field) else 'counter'
+                family, sample = self.name(metric, field, kind)
+                samples.append((family, kind, item, sample + labels + ' ' + value))
+
+    def oper_samples(self, samples, base, response, metric, list_key):
+        family, sample = self.name(metric, 'up', 'gauge')
+        port_family, port_sample = self.name(metric, 'port_up', 'gauge')
+        for entry in response.get(list_key) or []:
+            if not isinstance(entry, dict) or 'name' not in entry:
+                continue
+            items = base + (('name', entry['name']),)
+            state = (entry.get('oper') or {}).get('state')
+            if state is not None:
+                up = '1' if str(state).lower() in UP_STATES else '0'
+                samples.append((family, 'gauge', entry['name'], sample + self.label_set(items) + ' ' + up))
+            for port in entry.get('port-list') or []:
+                state = (port.get('oper') or {}).get('state') if isinstance(port, dict) else None
+                if state is None:
+                    continue
+                port_items = items + (('port', port.get('port-number')), ('protocol', port.get('protocol')))
+                up = '1' if str(state).lower() in UP_STATES else '0'
+                samples.append((port_family, 'gauge', entry['name'],
+                                port_sample + self.label_set(port_items) + ' ' + up))
+
+    def data_cpu_samples(self, samples, base, response):
+        stats = (response.get('data-cpu') or {}).get('stats')
+        if not isinstance(stats, dict):
+            return
+        family, sample = self.name('data_cpu', 'usage_percent', 'gauge')
+        for field, value in stats.items():
+            match = DATA_CPU_FIELD.match(field)
+            value = number(value)
+            if match and value is not None:
+                samples.append((family, 'gauge', None,
+                                sample + self.label_set(base + (('cpu', match.group(1)),)) + ' ' + value))
+
+    def render(self, openmetrics=True):
+        """returns every family in OpenMetrics (or Prometheus 0.0.4 text) format"""
+        out = []
+        with self.lock:
+            for family in sorted(self.families):
+                series = self.families[family]
+                if not series:
+                    continue
+                kind = self.types[family]
+                if kind == 'counter' and not openmetrics:
+                    # the 0.0.4 text format types the sample name itself
+                    out.append('# TYPE ' + family + '_total counter')
+                else:
+                    out.append('# TYPE ' + family + ' ' + kind)
+                for lines in series.values():
+                    out.extend(lines)
+        if openmetrics:
+            out.append('# EOF')
+        return '\n'.join(out) + '\n'
+
+    def write_textfile(self, path):
+        """writes the metrics for the node_exporter textfile collector, replacing the file atomically"""
+        temporary = path + '.' + str(os.getpid()) + '.tmp'
+        with open(temporary, 'w') as f:
+            f.write(self.render(openmetrics=False))
+        os.replace(temporary, path)
+
+    def serve(self, host='127.0.0.1', port=9734):
+        """serves /metrics on a background thread and returns the server"""
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        server.exporter = self
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """answers scrapes from the exporter attached to the server"""
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+        body = self.server.exporter.render(openmetrics).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
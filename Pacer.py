@@ -0,0 +1,120 @@
+'''
+Summary:    This script contains the pacers that decide how long the health check waits before each method and
+            partition. FixedPacer is the classic -w behaviour. AdaptivePacer starts from -w and samples the control
+            CPU of the device (system/control-cpu/stats) at most every sample_interval seconds, together with the
+            AxAPI latency it observes as a call hook. It halves the wait while the control plane is idle and doubles
+            it when the control CPU or the latency climbs, always within the operator's min/max bounds, and logs
+            every change. A control CPU sample that fails is treated as unknown and leaves the wait as it was.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import time
+from time import sleep
+from Acos import AcosError, DeviceDegraded
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# smallest wait the adaptive pacer backs off to from no wait at all
+BACKOFF_STEP = 0.5
+# waits below this are rounded down to the minimum when speeding up
+MIN_STEP = 0.05
+# weight of the newest latency ratio in the moving average
+LATENCY_WEIGHT = 0.3
+
+
+def control_cpu_usage(response):
+    """returns the busiest control CPU in percent from a system/control-cpu/stats response, or None"""
+    try:
+        stats = response['control-cpu']['stats']
+    except (KeyError, TypeError):
+        return None
+    usage = [value for key, value in stats.items()
+             if key.startswith('cpu') and key != 'cpu-count' and isinstance(value, (int, float))]
+    return max(usage) if usage else None
+
+
+class FixedPacer(object):
+    """Waits the same number of seconds before every step"""
+    def __init__(self, wait):
+        self.wait = wait
+
+    def observe(self, record):
+        pass
+
+    def pace(self, device):
+        sleep(self.wait)
+
+
+class AdaptivePacer(object):
+    """Adjusts the wait between steps to the control CPU and AxAPI latency of a device"""
+    def __init__(self, wait, min_wait=0.0, max_wait=10.0, cpu_low=30, cpu_high=70, sample_interval=5.0,
+                 latency_factor=2.0):
+        self.min_wait = min_wait
+        self.max_wait = max_wait
+        self.wait = min(max(wait, min_wait), max_wait)
+        self.cpu_low = cpu_low
+        self.cpu_high = cpu_high
+        self.sample_interval = sample_interval
+        self.latency_factor = latency_factor
+        self.sampled = None
+        # fastest latency seen per endpoint and the moving average of latency / fastest
+        self.baselines = {}
+        self.latency_ratio = 1.0
+        self.decisions = 0
+
+    def observe(self, record):
+        """tracks how much slower than usual the device answers, usable directly as an Acos call hook"""
+        if record['cached'] or not record['latency']:
+            return
+        endpoint = record['endpoint']
+        baseline = self.baselines.get(endpoint)
+        if baseline is None or record['latency'] < baseline:
+            self.baselines[endpoint] = record['latency']
+        if baseline is not None:
+            ratio = record['latency'] / baseline
+            self.latency_ratio = LATENCY_WEIGHT * ratio + (1 - LATENCY_WEIGHT) * self.latency_ratio
+
+    def pace(self, device):
+        """waits before the next step, re-evaluating the wait when a control CPU sample is due"""
+        now = time.monotonic()
+        if self.sampled is None or now - self.sampled >= self.sample_interval:
+            self.sampled = now
+            try:
+                response = device.get_control_cpu()
+            except DeviceDegraded:
+                raise
+            except AcosError as e:
+                # the pacer runs outside the planner's attempt(), a failed sample must not fail the device
+                device.logger.warning('Pacing: control CPU sample failed, keeping the wait at ' +
+                                      '{:.2f}'.format(self.wait) + 's: ' + str(e))
+            else:
+                self.adjust(device, control_cpu_usage(response))
+        sleep(self.wait)
+
+    def adjust(self, device, cpu):
+        """doubles the wait when the device is loaded, halves it when it is idle"""
+        loaded = (cpu is not None and cpu >= self.cpu_high) or self.latency_ratio >= self.latency_factor
+        idle = (cpu is None or cpu <= self.cpu_low) and self.latency_ratio < (1 + self.latency_factor) / 2
+        if loaded:
+            wait = max(self.wait * 2, BACKOFF_STEP)
+            reason = 'backing off'
+        elif idle:
+            wait = self.wait / 2
+            if wait < MIN_STEP:
+                wait = self.min_wait
+            reason = 'speeding up'
+        else:
+            return
+        wait = min(max(wait, self.min_wait), self.max_wait)
+        if wait == self.wait:
+            return
+        self.decisions += 1
+        device.logger.info('Pacing: control CPU ' + ('unknown' if cpu is None else str(cpu) + '%') +
+                           ', latency ' + '{:.1f}'.format(self.latency_ratio) + 'x baseline, ' + reason +
+                           ' from ' + '{:.2f}'.format(self.wait) + 's to ' + '{:.2f}'.format(wait) + 's')
+        self.wait = wait
@@ -0,0 +1,220 @@
+'''
+Summary:    This script contains the planner used by Health_Check.py to run the HealthCheck methods against a device
+            so each partition is entered once per run instead of once per method.
+
+            A partition-scoped method <name> is split into an optional _<name>_before(device), a
+            _<name>_partition(device, partition) and an optional _<name>_after(device). The planner enters each
+            partition once and runs every _<name>_partition part there, spooling each part's report output. The
+            methods are then run in their usual order from the shared partition, and the spooled partition output is
+            written back in between the before and after parts, so the report reads exactly as it does when the
+            methods are run one by one.
+
+            The clideploy show commands the methods are known to run (cli_commands) are prefetched in one batched
+            call on entering each partition and again on returning to the shared partition, see
+            Acos.prefetch_clideploy.
+
+            With a checkpoint every partition part and every method is a unit of work: its report output is recorded
+            as it is written and kept once the unit succeeded. Units completed by an earlier run are replayed from the
+            checkpoint, and a partition is only entered when one of its parts is still missing.
+
+            A method or partition part whose calls fail after every retry (Acos.AcosError) is skipped with a note in
+            the report and the planner carries on with the next one. Only DeviceDegraded, raised once the circuit
+            breaker of the device opened, ends the run of the device.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import logging
+from tempfile import SpooledTemporaryFile
+from Acos import AcosError, DeviceDegraded
+from Checkpoint import READ_SIZE
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# partition output larger than this is spooled to disk instead of being held in memory
+SPOOL_SIZE = 4 * 1024 * 1024
+
+
+class SectionSpool(object):
+    """Spools the report output of a partition part together with its section boundaries, like
+    Checkpoint.UnitRecorder, so the sections still reach an archive member when the output is written back"""
+    def __init__(self):
+        self.file = SpooledTemporaryFile(max_size=SPOOL_SIZE, mode='w+', newline='')
+        self.size = 0
+        # [[offset, section name]]
+        self.sections = []
+
+    def write(self, text):
+        self.file.write(text)
+        self.size += len(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def begin_section(self, name):
+        self.sections.append([self.size, name])
+
+    def replay(self, stream):
+        """writes the spooled output to stream, starting its sections when stream is an archive member"""
+        self.file.seek(0)
+        position = 0
+        for offset, name in self.sections + [[self.size, None]]:
+            while position < offset:
+                text = self.file.read(min(READ_SIZE, offset - position))
+                if not text:
+                    break
+                stream.write(text)
+                position += len(text)
+            if name is not None and hasattr(stream, 'begin_section'):
+                stream.begin_section(name)
+
+    def close(self):
+        self.file.close()
+
+
+class PartitionPlanner(object):
+    """Groups the partition-scoped work of the health check methods by partition"""
+    def __init__(self, healthcheck, methods, cli_commands=None, checkpoint=None):
+        self.healthcheck = healthcheck
+        self.methods = methods
+        # {method name: {'partition' or 'shared': [show commands]}}
+        self.cli_commands = cli_commands or {}
+        # Checkpoint.Checkpoint the completed units are recorded to and replayed from, None to run everything
+        self.checkpoint = checkpoint
+        self.logger = logging.getLogger('PartitionPlanner')
+        # [(what, error)] of the methods, parts and partitions skipped in the last run
+        self.skipped = []
+
+    def part(self, method, phase):
+        """returns the _<name>_<phase> part of a method, or None when it doesn't have one"""
+        return getattr(self.healthcheck, '_' + method.__name__ + '_' + phase, None)
+
+    def is_partitioned(self, method):
+        return self.part(method, 'partition') is not None
+
+    def commands(self, phase, methods):
+        """returns the clideploy commands run by methods in the partitions or in shared"""
+        commands = []
+        for method in methods:
+            commands.extend(self.cli_commands.get(method.__name__, {}).get(phase, []))
+        return commands
+
+    def done(self, device, method, partition=None):
+        return self.checkpoint is not None and self.checkpoint.done(device.device, method.__name__, partition)
+
+    def run(self, device, pacer):
+        """runs every method against the device, entering each partition once and letting pacer wait before
+        each partition and method"""
+        pending = [method for method in self.methods if not self.done(device, method)]
+        partitioned = [method for method in pending if self.is_partitioned(method)]
+        spooled = {}
+        self.skipped = []
+        try:
+            for partition in device.partitions:
+                # parts completed by an earlier run are replayed from the checkpoint instead
+                todo = [method for method in partitioned if not self.done(device, method, partition)]
+                if not todo:
+                    continue
+                pacer.pace(device)
+                if self.attempt(device, 'Partition ' + partition, device.change_partition, partition):
+                    continue
+                self.attempt(device, 'Prefetch in ' + partition, device.prefetch_clideploy,
+                             self.commands('partition', todo), report=False)
+                for method in todo:
+                    device.section = method.__name__
+                    spooled[(method.__name__, partition)] = self.run_spooled(device, method, partition)
+            # the shared methods still run when this fails, their calls are skipped like any other
+            self.attempt(device, 'Partition shared', device.change_partition, 'shared')
+            self.attempt(device, 'Prefetch in shared', device.prefetch_clideploy, self.commands('shared', pending),
+                         report=False)
+            self.logger.debug('Entered ' + str(len(device.partitions)) + ' partition(s) once for ' +
+                              str(len(partitioned)) + ' partition-scoped method(s)')
+
+            for method in self.methods:
+                device.section = method.__name__
+                if method not in pending:
+                    self.checkpoint.replay(device.device, method.__name__, None, device.out)
+                elif method in partitioned:
+                    self.recorded(device, method, None, self.run_partitioned, device, method, spooled)
+                else:
+                    pacer.pace(device)
+                    self.recorded(device, method, None, self.attempt, device, method.__name__, method, device)
+        finally:
+            device.section = None
+            for spool, error in spooled.values():
+                spool.close()
+
+    def recorded(self, device, method, partition, function, *args):
+        """runs function(*args), which returns None when it succeeded, with the report output recorded to the
+        checkpoint as the unit of method in partition"""
+        if self.checkpoint is None:
+            return function(*args)
+        out = device.out
+        recorder = self.checkpoint.record(device.device, method.__name__, partition, out)
+        device.out = recorder
+        error = True
+        try:
+            error = function(*args)
+        finally:
+            device.out = out
+            self.checkpoint.commit(recorder, error is None)
+        return error
+
+    def run_spooled(self, device, method, partition):
+        """runs one partition part with its report output going to a spool file, returns the spool and the error
+        the part failed with"""
+        part = self.part(method, 'partition')
+        out = device.out
+        spool = SectionSpool()
+        device.out = spool
+        try:
+            error = self.recorded(device, method, partition, self.attempt, device, part.__name__ + ' in ' + partition,
+                                  part, device, partition)
+        finally:
+            device.out = out
+        return spool, error
+
+    def run_partitioned(self, device, method, spooled):
+        """writes a partition-scoped method's report in the order the method itself would have, returns None when
+        every part of it succeeded"""
+        before = self.part(method, 'before')
+        after = self.part(method, 'after')
+        if before is not None:
+            error = self.attempt(device, before.__name__, before, device)
+            if error is not None:
+                # the partition parts depend on what the before part printed and set up
+                return error
+        error = None
+        for partition in device.partitions:
+            if (method.__name__, partition) in spooled:
+                spool, part_error = spooled[(method.__name__, partition)]
+                spool.replay(device.out)
+                error = error or part_error
+            elif self.done(device, method, partition):
+                self.checkpoint.replay(device.device, method.__name__, partition, device.out)
+            else:
+                # the partition could not be entered, the note is in the report already
+                error = True
+        if after is not None:
+            error = self.attempt(device, after.__name__, after, device) or error
+        return error
+
+    def attempt(self, device, what, function, *args, report=True):
+        """runs function(*args), returning None when it succeeded and the error when it failed with an AcosError,
+        after noting in the report that what was skipped"""
+        try:
+            function(*args)
+        except DeviceDegraded:
+            raise
+        except AcosError as e:
+            device.logger.error(what + ' skipped: ' + str(e))
+            self.skipped.append((what, str(e)))
+            if report:
+                device.report.text(what + ' skipped: ' + str(e))
+            return e
+        return None
@@ -0,0 +1,92 @@
+'''
+Summary:    This script contains the sampler behind performance_data_check. slb/perf/stats is read on a fixed clock
+            (sample k is due at start + k * interval, however long the requests and the rendering take), each
+            sample is timestamped at the middle of its request, and the series is reduced to a compact time series:
+            the per-second gauges as they were sampled, per-interval rates for the cumulative counters, and
+            min/avg/max for every field.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import re
+import time
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# slb/perf/stats fields that already are rates or current values, anything else is a cumulative counter
+GAUGE = re.compile(r'per-sec|curr|bandwidth')
+
+
+def perf_stats(response):
+    """returns the numeric fields of a slb/perf/stats response"""
+    try:
+        stats = response['perf']['stats']
+    except (KeyError, TypeError):
+        return {}
+    return dict((name, value) for name, value in stats.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool))
+
+
+def sample_performance(device, samples, interval=1.0):
+    """returns [(offset seconds, slb/perf/stats response)] sampled on a fixed clock, and the worst lateness"""
+    series = []
+    lateness = 0.0
+    start = time.monotonic()
+    for k in range(samples):
+        due = start + k * interval
+        now = time.monotonic()
+        if now < due:
+            time.sleep(due - now)
+        before = time.monotonic()
+        lateness = max(lateness, before - due)
+        response = device.get_performance()
+        after = time.monotonic()
+        series.append(((before + after) / 2 - start, response))
+    return series, lateness
+
+
+def perf_series(series, interval, lateness):
+    """returns the compact time series report of sample_performance"""
+    offsets = [round(offset, 3) for offset, response in series]
+    stats = [perf_stats(response) for offset, response in series]
+    names = []
+    for sample in stats:
+        for name in sample:
+            if name not in names:
+                names.append(name)
+
+    values = {}
+    rates = {}
+    summary = {}
+    for name in names:
+        points = [sample.get(name) for sample in stats]
+        if GAUGE.search(name):
+            values[name] = points
+            summarized = [point for point in points if point is not None]
+        else:
+            # per interval rate, a counter that went backwards was cleared or wrapped and has no rate
+            rate = []
+            for k in range(1, len(points)):
+                elapsed = offsets[k] - offsets[k - 1]
+                if points[k] is None or points[k - 1] is None or points[k] < points[k - 1] or elapsed <= 0:
+                    rate.append(None)
+                else:
+                    rate.append(round((points[k] - points[k - 1]) / elapsed, 2))
+            rates[name] = rate
+            summarized = [point for point in rate if point is not None]
+        if summarized:
+            summary[name] = {'min': min(summarized), 'avg': round(sum(summarized) / len(summarized), 2),
+                             'max': max(summarized)}
+
+    report = {'samples': len(series), 'interval': interval, 'max lateness ms': round(lateness * 1000, 1),
+              'offsets': offsets}
+    if values:
+        report['values'] = values
+    if rates:
+        report['rates per second'] = rates
+    report['summary'] = summary
+    return report
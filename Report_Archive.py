@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+'''
+Summary:
+    Streaming compressed archive for health check reports. Every device report is one member of the archive and
+    every report section (build_section_header) is compressed as its own gzip member or zstd frame, so the archive
+    is an ordinary multi-member .gz (or .zst) file that zcat/zstdcat turn back into the plain reports, while a JSON
+    index next to it (<archive>.idx) records the offset and length of every device and section. One section is
+    read back by decompressing just its bytes:
+
+        ./Report_Archive.py list fleet.gz
+        ./Report_Archive.py extract fleet.gz -d 10.0.1.221 -s RUNNING-CONFIG
+
+    Devices only queue the text they write; encoding and compression run on a background thread. The frames of a
+    device are spooled to a temporary file and appended to the archive when the device finishes, so members never
+    interleave even when devices run in parallel.
+
+Requires:
+    - zstandard (only for .zst archives)
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import argparse
+import io
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import zlib
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# text queued by a device is handed to the compression thread in chunks of about this many characters
+CHUNK = 256 * 1024
+# chunks waiting to be compressed before a writing device blocks
+QUEUE_SIZE = 64
+COPY_SIZE = 1024 * 1024
+
+
+def detect_compression(path):
+    if path.endswith('.zst') or path.endswith('.zstd'):
+        return 'zstd'
+    return 'gzip'
+
+
+def compressor(compression, level):
+    """returns a new compressobj producing one complete gzip member or zstd frame"""
+    if compression == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=level or 3).compressobj()
+    return zlib.compressobj(level or 6, zlib.DEFLATED, 31)
+
+
+def decompress(compression, data):
+    """decompresses one or more consecutive gzip members or zstd frames"""
+    if compression == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True).read()
+    out = []
+    while data:
+        decompressor = zlib.decompressobj(31)
+        out.append(decompressor.decompress(data))
+        data = decompressor.unused_data
+    return b''.join(out)
+
+
+class ArchiveMember(object):
+    """The text stream one device report is written to, usable as Acos.out"""
+    def __init__(self, archive, device):
+        self.archive = archive
+        self.device = device
+        self.pending = []
+        self.pending_size = 0
+        self.closed = False
+        # only touched by the compression thread
+        self.spool = None
+        self.compressor = None
+        self.sections = []
+
+    def write(self, text):
+        self.pending.append(text)
+        self.pending_size += len(text)
+        if self.pending_size >= CHUNK:
+            self.queue_pending()
+        return len(text)
+
+    def flush(self):
+        # sections are compressed as they fill up, a flush from the YAML emitter does not end a frame
+        pass
+
+    def begin_section(self, name):
+        """starts a new independently compressed section, called by ReportWriter.header"""
+        self.queue_pending()
+        self.archive.put(('section', self, name))
+
+    def queue_pending(self):
+        if self.pending:
+            self.archive.put(('data', self, ''.join(self.pending)))
+            self.pending = []
+            self.pending_size = 0
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.queue_pending()
+            self.archive.put(('close', self, None))
+
+
+class SectionBuffer(object):
+    """Holds a report in memory together with its section boundaries, for reports produced in a worker process
+    and written out by the parent"""
+    def __init__(self):
+        # [[section name or None, [text]]]
+        self.sections = [[None, []]]
+
+    def write(self, text):
+        self.sections[-1][1].append(text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def begin_section(self, name):
+        self.sections.append([name, []])
+
+    def __getstate__(self):
+        return {'sections': [[name, [''.join(text)]] for name, text in self.sections]}
+
+    def replay(self, stream):
+        """writes the report to stream, starting the same sections when stream is an archive member"""
+        for name, text in self.sections:
+            if name is not None and hasattr(stream, 'begin_section'):
+                stream.begin_section(name)
+            for chunk in text:
+                stream.write(chunk)
+
+
+class ReportArchive(object):
+    """Compressed archive of device reports, written by a background thread"""
+    def __init__(self, path, compression=None, level=None):
+        self.path = path
+        self.compression = compression or detect_compression(path)
+        self.level = level
+        if self.compression == 'zstd':
+            # fail now rather than on the compression thread
+            import zstandard
+        self.file = open(path, 'wb')
+        self.members = []
+        self.size = 0
+        self.error = None
+        self.queue = queue.Queue(QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.run, name='ReportArchive', daemon=True)
+        self.thread.start()
+
+    def open_member(self, device):
+        return ArchiveMember(self, device)
+
+    def put(self, job):
+        if self.error is not None:
+            raise IOError('Report archive failed: ' + str(self.error))
+        self.queue.put(job)
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            if self.error is not None:
+                continue
+            try:
+                self.handle(*job)
+            except Exception as e:
+                self.error = e
+
+    def handle(self, kind, member, value):
+        if kind == 'section':
+            self.end_section(member)
+            self.start_section(member, value)
+        elif kind == 'data':
+            if member.compressor is None:
+                # text written before the first section header
+                self.start_section(member, '')
+            data = value.encode()
+            member.sections[-1]['size'] += len(data)
+            member.spool.write(member.compressor.compress(data))
+        else:
+            self.end_section(member)
+            self.append_member(member)
+
+    def start_section(self, member, name):
+        if member.spool is None:
+            member.spool = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(self.path)))
+        member.compressor = compressor(self.compression, self.level)
+        member.sections.append({'name': name, 'offset': member.spool.tell(), 'length': 0, 'size': 0})
+
+    def end_section(self, member):
+        if member.compressor is not None:
+            member.spool.write(member.compressor.flush())
+            member.compressor = None
+            section = member.sections[-1]
+            section['length'] = member.spool.tell() - section['offset']
+
+    def append_member(self, member):
+        """copies the finished frames of a device to the end of the archive"""
+        offset = self.size
+        length = 0
+        if member.spool is not None:
+            member.spool.seek(0)
+            while True:
+                data = member.spool.read(COPY_SIZE)
+                if not data:
+                    break
+                self.file.write(data)
+                length += len(data)
+            member.spool.close()
+            member.spool = None
+        for section in member.sections:
+            section['offset'] += offset
+        self.size += length
+        self.members.append({'device': member.device, 'offset': offset, 'length': length,
+                             'size': sum(section['size'] for section in member.sections),
+                             'sections': member.sections})
+
+    def close(self):
+        """waits for every queued section to be compressed, then writes the index"""
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+        if self.error is not None:
+            raise IOError('Report archive failed: ' + str(self.error))
+        index = {'version': 1, 'compression': self.compression, 'members': self.members}
+        temporary = self.path + '.idx.' + str(os.getpid()) + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(temporary, self.path + '.idx')
+
+    def totals(self):
+        """returns (members, sections, uncompressed bytes, compressed bytes)"""
+        return (len(self.members), sum(len(member['sections']) for member in self.members),
+                sum(member['size'] for member in self.members), self.size)
+
+
+def read_index(path):
+    with open(path + '.idx') as f:
+        return json.load(f)
+
+
+def extract(path, device=None, section=None):
+    """yields (device, section name, text) of the matching sections, decompressing only those"""
+    index = read_index(path)
+    with open(path, 'rb') as f:
+        for member in index['members']:
+            if device is not None and member['device'] != device:
+                continue
+            for entry in member['sections']:
+                if section is not None and entry['name'] != section:
+                    continue
+                f.seek(entry['offset'])
+                text = decompress(index['compression'], f.read(entry['length'])).decode()
+                yield member['device'], entry['name'], text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lists or extracts the reports in a Health_Check.py --archive file.')
+    parser.add_argument('command', choices=['list', 'extract'], help='list the devices and sections, or extract them')
+    parser.add_argument('archive', help='Archive written by Health_Check.py --archive')
+    parser.add_argument('-d', '--device', default=None, help='Only this device')
+    parser.add_argument('-s', '--section', default=None, help='Only the sections with this header, e.g. RUNNING-CONFIG')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        index = read_index(args.archive)
+        for member in index['members']:
+            if args.device is not None and member['device'] != args.device:
+                continue
+            print('{:<40} {:>12} bytes {:>12} compressed {:>6} sections'.format(
+                member['device'], member['size'], member['length'], len(member['sections'])))
+            for entry in member['sections']:
+                if args.section is None or entry['name'] == args.section:
+                    print('    {:<60} {:>12} {:>12}'.format(entry['name'][:60], entry['size'], entry['length']))
+        return
+    for device, name, text in extract(args.archive, args.device, args.section):
+        sys.stdout.write(text)
+
+
+if __name__ == '__main__':
+    main()
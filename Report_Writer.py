@@ -0,0 +1,109 @@
+'''
+Summary:    This script contains the writer used to stream health check report sections for a device straight to a
+            file handle. Structured responses are emitted with PyYAML's C emitter when libyaml is available, and the
+            plain text returned by clideploy (running configs, json-config...) is written out one line at a time, so
+            no full YAML copy of a response is ever built in memory.
+
+Requires:
+            - PyYAML
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import io
+import json
+import re
+import yaml
+
+try:
+    # libyaml backed emitter, several times faster than the pure python one
+    from yaml import CSafeDumper as Dumper
+except ImportError:
+    from yaml import SafeDumper as Dumper
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# lines that can be written as plain YAML scalars, anything else is written double quoted
+PLAIN_LINE = re.compile(r'[A-Za-z_/(][A-Za-z0-9 _./()=+-]*[A-Za-z0-9_./()=+-]\Z|[A-Za-z_/(]\Z')
+# plain scalars YAML would read back as something other than a string
+RESERVED_WORDS = {'y', 'n', 'yes', 'no', 'on', 'off', 'true', 'false', 'null'}
+
+
+def iter_lines(text):
+    """yields the lines of text one at a time without building a list of them"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def yaml_scalar(line):
+    """returns line as a YAML scalar, plain when that is safe and double quoted otherwise"""
+    if PLAIN_LINE.match(line) and line.lower() not in RESERVED_WORDS:
+        return line
+    if line.isprintable():
+        return "'" + line.replace("'", "''") + "'"
+    # control characters need escaping, and a json string is also a valid double quoted YAML scalar
+    return json.dumps(line, ensure_ascii=False)
+
+
+class ReportWriter(object):
+    """Streams report sections for one device to a file handle"""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def header(self, section):
+        """writes a section header, in the same format as always"""
+        # an archive member compresses every section on its own so it can be extracted alone
+        if hasattr(self.stream, 'begin_section'):
+            self.stream.begin_section(section)
+        self.stream.write('{:*^100s}\n'.format(''))
+        self.stream.write('{:*^100s}\n'.format(section))
+        self.stream.write('{:*^100s}\n'.format(''))
+
+    def text(self, line):
+        """writes a line of plain text"""
+        self.stream.write(line + '\n')
+
+    def yaml(self, data):
+        """writes a response as YAML followed by a blank line"""
+        self.data(data)
+        self.stream.write('\n')
+
+    def data(self, data):
+        """writes a response as YAML"""
+        # the dict top level is 'command output' we know it is from clideploy
+        # and just a bunch of text so we pretty it up
+        if isinstance(data, dict) and isinstance(data.get('command output'), str):
+            self.command_output(data['command output'])
+        else:
+            yaml.dump(data, self.stream, Dumper=Dumper, default_flow_style=False, sort_keys=False,
+                      allow_unicode=True)
+
+    def series(self, data):
+        """writes a time series with every list on a single flow style line, followed by a blank line"""
+        yaml.dump(data, self.stream, Dumper=Dumper, default_flow_style=None, sort_keys=False, width=120)
+        self.stream.write('\n')
+
+    def command_output(self, body):
+        """writes clideploy text as a YAML list of lines, one line at a time"""
+        write = self.stream.write
+        write('command output:\n')
+        for line in iter_lines(body):
+            line = line.rstrip('\r').replace('!', '').replace('exit-module', '')
+            write('- ' + yaml_scalar(line) + '\n')
+
+
+def dumps(data):
+    """returns the YAML the writer would stream for data, for callers that need it as a string"""
+    buffer = io.StringIO()
+    ReportWriter(buffer).data(data)
+    return buffer.getvalue()
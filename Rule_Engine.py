@@ -0,0 +1,252 @@
+'''
+Summary:    This script contains the rule engine behind Health_Check_Interpreter.py. Every check is declared as a Rule:
+            the AxAPI endpoints it reads, whether they are read in the shared partition or in every partition, the
+            warning/critical thresholds and the predicate applied to the responses. The engine works out the union
+            of the endpoints all rules need, reads each of them once per device (and partition), evaluates every
+            rule against those responses and returns structured findings:
+
+                {'device': ..., 'partition': ..., 'rule': ..., 'severity': 'critical', 'message': ..., 'value': ...}
+
+            The responses can come from live devices, a capture archive (--replay) or a collection file
+            (Health_Check.py --format), and devices are checked in parallel. A rule whose endpoints are missing from
+            the responses, e.g. not collected by the run that wrote the file, is reported as an info finding rather
+            than passing silently.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+from concurrent.futures import ThreadPoolExecutor
+from Acos import AcosError, DeviceDegraded
+from Pacer import control_cpu_usage
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+SEVERITIES = ('critical', 'warning', 'info')
+
+# services that may be enabled for management, as listed by enable-management
+MANAGEMENT_SERVICES = ('ping', 'ssh', 'telnet', 'http', 'https', 'snmp')
+# system/session/stats fields holding the current number of sessions, depending on the ACOS release
+SESSION_FIELDS = ('total-curr-conn', 'curr_conn', 'conn_count')
+UP_STATES = ('up', 'all up', 'functional up')
+
+
+class Rule(object):
+    """One declared check: the endpoints it reads, its thresholds and the predicate run on the responses"""
+    def __init__(self, name, endpoints, predicate, scope='shared', warning=None, critical=None, description=''):
+        self.name = name
+        self.endpoints = tuple(endpoints)
+        self.predicate = predicate
+        # 'shared' rules read the shared partition once, 'partition' rules every partition
+        self.scope = scope
+        self.warning = warning
+        self.critical = critical
+        self.description = description
+
+    def level(self, value):
+        """returns the severity of a value against the thresholds, or None below them"""
+        if value is None:
+            return None
+        if self.critical is not None and value >= self.critical:
+            return 'critical'
+        if self.warning is not None and value >= self.warning:
+            return 'warning'
+        return None
+
+    def evaluate(self, responses):
+        """yields (severity, message, value) for the responses of this rule's endpoints"""
+        arguments = [responses.get(endpoint) for endpoint in self.endpoints]
+        missing = [endpoint for endpoint, argument in zip(self.endpoints, arguments) if argument is None]
+        if missing:
+            # endpoint missing on this release, failed or not collected, say so rather than pass silently
+            yield 'info', 'Not checked, no ' + ', '.join(missing) + ' response', missing
+            return
+        for finding in self.predicate(self, *arguments):
+            yield finding
+
+
+def usage_percent(value):
+    """returns a usage given as a number or a '25.0%' string as a float"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().rstrip('%'))
+        except ValueError:
+            return None
+    return None
+
+
+def check_control_cpu(rule, response):
+    usage = control_cpu_usage(response)
+    severity = rule.level(usage)
+    if severity:
+        yield severity, 'Control CPU at ' + str(usage) + '%', usage
+
+
+def check_data_cpu(rule, response):
+    try:
+        stats = response['data-cpu']['stats']
+    except (KeyError, TypeError):
+        return
+    for field, value in stats.items():
+        usage = usage_percent(value) if field.startswith('cpu') and field != 'cpu-count' else None
+        severity = rule.level(usage)
+        if severity:
+            yield severity, 'Data ' + field + ' at ' + str(usage) + '%', usage
+
+
+def check_memory(rule, response):
+    try:
+        usage = usage_percent(response['memory']['oper']['Usage'])
+    except (KeyError, TypeError):
+        return
+    severity = rule.level(usage)
+    if severity:
+        yield severity, 'Memory usage at ' + str(usage) + '%', usage
+
+
+def check_session_table(rule, sessions, resources):
+    try:
+        stats = sessions['session']['stats']
+        capacity = resources['resource-usage']['oper']['l4-session-count']
+    except (KeyError, TypeError):
+        return
+    current = next((stats[field] for field in SESSION_FIELDS if isinstance(stats.get(field), int)), None)
+    if current is None or not capacity:
+        return
+    usage = round(100.0 * current / capacity, 2)
+    severity = rule.level(usage)
+    if severity:
+        yield severity, 'Session table ' + str(usage) + '% full (' + str(current) + ' of ' + str(capacity) + ')', usage
+
+
+def check_vrrpa(rule, response):
+    try:
+        state = response['vrrp-a']['state']['state']
+    except (KeyError, TypeError):
+        return
+    if state not in ('Active', 'Standby'):
+        yield 'critical', 'VRRP-A state is ' + str(state), state
+
+
+def check_down_servers(rule, response):
+    down = []
+    entries = response.get('server-list') if isinstance(response, dict) else None
+    for entry in entries or []:
+        state = (entry.get('oper') or {}).get('state') if isinstance(entry, dict) else None
+        if state is not None and str(state).lower() not in UP_STATES:
+            down.append(entry.get('name'))
+    severity = rule.level(len(down))
+    if severity:
+        yield severity, str(len(down)) + ' server(s) down: ' + ', '.join(str(name) for name in down[:20]), len(down)
+
+
+def check_data_port_management(rule, response):
+    try:
+        services = response['enable-management']['service']
+    except (KeyError, TypeError):
+        return
+    for service in MANAGEMENT_SERVICES:
+        interfaces = []
+        for interface in (services.get(service) or {}).get('eth-cfg') or []:
+            start = interface.get('ethernet-start')
+            end = interface.get('ethernet-end', start)
+            if isinstance(start, int) and isinstance(end, int):
+                interfaces.extend(range(start, end + 1))
+        if interfaces:
+            yield ('warning', service.upper() + ' management is enabled on data interfaces ' + str(interfaces) +
+                   ', by default no management services are enabled on data interfaces', interfaces)
+    management = [service.upper() for service in MANAGEMENT_SERVICES
+                  if (services.get(service) or {}).get('management') == 1]
+    yield 'info', 'Services enabled on the management interface: ' + ', '.join(management or ['none']), management
+
+
+RULES = [
+    Rule('control-cpu', ['system/control-cpu/stats'], check_control_cpu, warning=70, critical=90,
+         description='Control CPU usage'),
+    Rule('data-cpu', ['system/data-cpu/stats'], check_data_cpu, warning=80, critical=95,
+         description='Data CPU usage'),
+    Rule('memory', ['system/memory/oper'], check_memory, warning=80, critical=90,
+         description='Memory usage'),
+    Rule('session-table', ['system/session/stats', 'system/resource-usage/oper'], check_session_table, warning=70,
+         critical=90, description='L4 session table usage'),
+    Rule('vrrp-a', ['vrrp-a'], check_vrrpa, scope='partition', description='VRRP-A state is Active or Standby'),
+    Rule('down-servers', ['slb/server/oper'], check_down_servers, scope='partition', warning=1,
+         description='Real servers operationally down'),
+    Rule('data-port-management', ['enable-management'], check_data_port_management,
+         description='Management services enabled on data interfaces'),
+]
+
+
+class RuleEngine(object):
+    """Reads the endpoints the rules need once per device and evaluates every rule"""
+    def __init__(self, rules=None):
+        self.rules = list(RULES if rules is None else rules)
+
+    def endpoints(self, scope):
+        """returns the union of the endpoints the rules of a scope read, in a stable order"""
+        endpoints = []
+        for rule in self.rules:
+            if rule.scope == scope:
+                endpoints.extend(endpoint for endpoint in rule.endpoints if endpoint not in endpoints)
+        return endpoints
+
+    def read(self, device, endpoint, responses):
+        """reads one endpoint into responses, leaving it out when it failed so only the rules reading it are
+        skipped"""
+        try:
+            responses[endpoint] = device.axapi_call(endpoint, 'GET')
+        except DeviceDegraded:
+            raise
+        except AcosError as e:
+            device.logger.error('Skipped ' + endpoint + ': ' + str(e))
+
+    def collect(self, device):
+        """returns {partition: {endpoint: response}} read from an authenticated Acos"""
+        data = {'shared': {}}
+        for endpoint in self.endpoints('shared'):
+            self.read(device, endpoint, data['shared'])
+        partition_endpoints = self.endpoints('partition')
+        if partition_endpoints:
+            for partition in device.get_partition_list():
+                if partition != 'shared':
+                    device.change_partition(partition)
+                responses = data.setdefault(partition, {})
+                for endpoint in partition_endpoints:
+                    self.read(device, endpoint, responses)
+            device.change_partition('shared')
+        return data
+
+    def evaluate(self, device, data):
+        """returns the findings of every rule for one device's {partition: {endpoint: response}}"""
+        findings = []
+        for rule in self.rules:
+            partitions = ['shared'] if rule.scope == 'shared' else list(data)
+            for partition in partitions:
+                for severity, message, value in rule.evaluate(data.get(partition, {})):
+                    findings.append({'device': device, 'partition': partition, 'rule': rule.name,
+                                     'severity': severity, 'message': message, 'value': value})
+        rank = dict((severity, n) for n, severity in enumerate(SEVERITIES))
+        findings.sort(key=lambda finding: rank.get(finding['severity'], len(SEVERITIES)))
+        return findings
+
+    def check(self, devices, check_device, workers=8):
+        """runs check_device(device) -> findings for every device in parallel, returning the findings in the
+        order of the devices"""
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            results = list(executor.map(check_device, devices))
+        return [finding for findings in results for finding in findings]
+
+
+def collected_data(index, device):
+    """returns {partition: {endpoint: response}} for one device of Collection_Writer.index_records()"""
+    data = {'shared': {}}
+    for (partition, endpoint), response in index.get(device, {}).items():
+        data.setdefault(partition, {})[endpoint] = response
+    return data
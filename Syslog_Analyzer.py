@@ -0,0 +1,104 @@
+'''
+Summary:    This script contains the syslog analysis behind system_errors_check. The structured entries of a syslog/oper
+            response are matched one at a time with a single precompiled expression that splits out the timestamp,
+            severity, module and message, so the log buffer is never rendered to YAML. Entries of a reported
+            severity are indexed by severity, module and message template (the message with its addresses, numbers,
+            object names and quoted values replaced by <*>), and each template is reported once with its count and
+            the timestamps of its first and last occurrence. Entries that don't match the expression are counted and
+            the first UNPARSED_SHOWN of them are listed as they are, as a log format the expression doesn't know
+            would otherwise hide its errors from the report.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import re
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+# ACOS severities from most to least severe, the reported ones are listed in this order
+SEVERITIES = ('Emergency', 'Alert', 'Critical', 'Error', 'Warning', 'Notice', 'Info', 'Debug')
+REPORTED = ('Emergency', 'Alert', 'Critical', 'Error', 'Warning')
+
+# Feb 26 2018 14:02:31 Error [HMON]:Server rs-shared-1 is down.
+LOG_LINE = re.compile(r'(?P<month>[A-Z][a-z]{2}) +(?P<day>\d{1,2}) (?P<year>\d{4}) (?P<time>\d\d:\d\d:\d\d) '
+                      r'(?P<severity>[A-Z][a-z]+) +\[(?P<module>[^\]]*)\]:?\s*(?P<message>.*)')
+# quoted values and any word holding a digit: addresses, ports, counts, object names such as rs-web-1
+VARIABLE = re.compile(r'"[^"]*"|\'[^\']*\'|[^\s,;()\[\]=]*\d[^\s,;()\[\]=]*')
+# unparsed entries are listed raw, at most UNPARSED_SHOWN of them
+UNPARSED_SHOWN = 50
+MONTHS = dict((month, n) for n, month in enumerate(('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep',
+                                                     'Oct', 'Nov', 'Dec'), 1))
+
+
+def log_lines(response):
+    """yields the text of every entry of a syslog/oper response"""
+    try:
+        lines = response['syslog']['oper']['lines']
+    except (KeyError, TypeError):
+        return
+    for entry in lines or []:
+        if isinstance(entry, dict):
+            entry = entry.get('line')
+        if isinstance(entry, str):
+            yield entry
+
+
+def template(message):
+    """returns message with its variable parts replaced by <*>"""
+    return VARIABLE.sub('<*>', message)
+
+
+def analyze_syslog(response, reported=REPORTED):
+    """returns the templates of the reported severities with their counts and first/last timestamps"""
+    wanted = set(reported)
+    # (severity, module, template) -> [count, first key, first, last key, last, example]
+    templates = {}
+    by_severity = {}
+    entries = 0
+    unparsed = 0
+    unparsed_lines = []
+    for line in log_lines(response):
+        entries += 1
+        match = LOG_LINE.match(line)
+        if match is None:
+            unparsed += 1
+            if len(unparsed_lines) < UNPARSED_SHOWN:
+                unparsed_lines.append(line)
+            continue
+        severity = match.group('severity')
+        if severity not in wanted:
+            continue
+        by_severity[severity] = by_severity.get(severity, 0) + 1
+        message = match.group('message')
+        key = (severity, match.group('module'), template(message))
+        # sortable without parsing the timestamp, the log buffer is not guaranteed to be in time order
+        when = (match.group('year'), MONTHS.get(match.group('month'), 0), int(match.group('day')), match.group('time'))
+        stamp = line[:match.end('time')]
+        found = templates.get(key)
+        if found is None:
+            templates[key] = [1, when, stamp, when, stamp, message]
+            continue
+        found[0] += 1
+        if when < found[1]:
+            found[1] = when
+            found[2] = stamp
+        if when > found[3]:
+            found[3] = when
+            found[4] = stamp
+
+    rank = dict((severity, n) for n, severity in enumerate(SEVERITIES))
+    ordered = sorted(templates.items(), key=lambda item: (rank.get(item[0][0], len(SEVERITIES)), -item[1][0]))
+    report = {'entries': entries, 'matched': sum(by_severity.values()),
+              'by severity': dict((severity, by_severity[severity]) for severity in reported
+                                  if severity in by_severity)}
+    if unparsed:
+        report['unparsed'] = unparsed
+        report['unparsed lines'] = unparsed_lines
+    report['templates'] = [{'severity': severity, 'module': module, 'template': text, 'count': found[0],
+                            'first': found[2], 'last': found[4], 'example': found[5]}
+                           for (severity, module, text), found in ordered]
+    return report
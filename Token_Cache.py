@@ -0,0 +1,168 @@
+'''
+Summary:    This script contains the on-disk cache of AxAPI session tokens shared by Health_Check.py,
+            Health_Check_Interpreter.py and Health_Check_Collector.py. Instead of logging off at the end of a run the
+            session is handed back to the cache, and the next run (or the next script) against the same device and
+            user takes it over while the device still considers it alive, saving an auth/logoff pair and an admin
+            session on ADCs close to their session limit.
+
+            ACOS ends a session once it sat idle for the admin idle timeout (10 minutes by default), so every token
+            is kept with the time it was last used and is only handed out while it sat idle for less than the
+            lifetime. A token that is handed out is leased to the run using it, so two runs never share a session and
+            switch its partition under each other; a lease left behind by a run that died lapses with the token.
+            Before a token is reused the device is asked to enter the shared partition with it (Acos.auth), one cheap
+            call that both validates the session and puts it back where a new session starts out.
+
+            The cache is only used when asked for (--token-cache), as the sessions it keeps stay open on the devices
+            until their idle timeout. It is a JSON file readable by its owner only, updated under a lock file:
+
+                {"version": 2, "salt": "<random hex>",
+                 "tokens": {"<base url>|<username>|<credentials hmac>": [{"token": ..., "created": ...,
+                                                                          "last_used": ..., "leased": false}]}}
+
+            The credentials HMAC keeps a run with other credentials for the same user, e.g. after a password change,
+            from taking over a session authenticated with the old ones. It is keyed with the random salt of the file,
+            so the same password gives unrelated keys in every cache file and none can be looked up in a precomputed
+            table. The tokens of a version 1 file, keyed without a salt, are dropped.
+
+Revisions:
+            Date        Changes
+            10.16.2026  Initial release: agent
+
+
+'''
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks on Windows, runs sharing a cache there should not overlap
+    fcntl = None
+
+__version__ = '1.0'
+__author__ = 'A10 Networks'
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.a10_health_check', 'tokens.json')
+# a minute short of the default ACOS admin idle timeout, a token is not handed out when it sat idle for longer
+DEFAULT_LIFETIME = 540
+# sessions kept per device and user, further sessions handed back are logged off
+POOL_SIZE = 2
+
+
+# bytes of the random salt generated for every new cache file
+SALT_SIZE = 16
+
+
+def token_key(salt, base_url, username, password):
+    credentials = hmac.new(bytes.fromhex(salt), (str(username) + '\n' + str(password)).encode(),
+                           hashlib.sha256).hexdigest()
+    return base_url + '|' + str(username) + '|' + credentials[:32]
+
+
+class TokenCache(object):
+    """AxAPI session tokens kept on disk between runs, one small pool per device and user"""
+    def __init__(self, path=DEFAULT_PATH, lifetime=DEFAULT_LIFETIME, pool_size=POOL_SIZE):
+        self.path = path
+        self.lifetime = lifetime
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+        # the salt of the file, read on first use
+        self.salt = None
+        self.reused = 0
+        self.created = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def update(self, change):
+        """runs change(tokens) on the cached tokens under the lock, writes them back and returns what change
+        returned"""
+        with self.lock:
+            with open(os.open(self.path + '.lock', os.O_CREAT | os.O_RDWR, 0o600)) as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                salt, tokens = self.load()
+                if salt is None:
+                    # a new file, or one written before keys were salted whose keys can't be matched anyway
+                    salt = os.urandom(SALT_SIZE).hex()
+                    tokens = {}
+                self.salt = salt
+                now = time.time()
+                for key in list(tokens):
+                    tokens[key] = [entry for entry in tokens[key] if now - entry['last_used'] < self.lifetime]
+                    if not tokens[key]:
+                        del tokens[key]
+                result = change(tokens)
+                self.save(salt, tokens)
+                return result
+
+    def load(self):
+        """returns the salt and tokens of the file, (None, {}) when there is no file or no salt in it"""
+        try:
+            with open(self.path) as f:
+                cache = json.load(f)
+            return cache.get('salt'), cache.get('tokens', {})
+        except (IOError, ValueError, AttributeError):
+            return None, {}
+
+    def save(self, salt, tokens):
+        temporary = self.path + '.' + str(os.getpid()) + '.tmp'
+        # created owner-only, the tokens are as good as the credentials while they live
+        with open(os.open(temporary, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump({'version': 2, 'salt': salt, 'tokens': tokens}, f)
+        os.replace(temporary, self.path)
+
+    def key(self, base_url, username, password):
+        """returns the key the sessions of a device and user are kept under in this cache"""
+        if self.salt is None:
+            # creates the file and its salt when there is none yet
+            self.update(lambda tokens: None)
+        return token_key(self.salt, base_url, username, password)
+
+    def acquire(self, key):
+        """leases the most recently used live token of key, or returns None"""
+        def change(tokens):
+            free = [entry for entry in tokens.get(key, []) if not entry['leased']]
+            if not free:
+                return None
+            entry = max(free, key=lambda entry: entry['last_used'])
+            entry['leased'] = True
+            entry['last_used'] = time.time()
+            return entry['token']
+        return self.update(change)
+
+    def add(self, key, token):
+        """records a token that was just authenticated, leased to the caller"""
+        def change(tokens):
+            now = time.time()
+            tokens.setdefault(key, []).append({'token': token, 'created': now, 'last_used': now, 'leased': True})
+        self.created += 1
+        self.update(change)
+
+    def release(self, key, token):
+        """hands a leased token back for the next run; returns False when the pool is full and the caller should
+        log it off instead"""
+        def change(tokens):
+            entries = tokens.setdefault(key, [])
+            entry = next((entry for entry in entries if entry['token'] == token), None)
+            if len([other for other in entries if not other['leased']]) >= self.pool_size:
+                if entry is not None:
+                    entries.remove(entry)
+                return False
+            if entry is None:
+                # a run longer than the lifetime, the token was pruned while in use but was used up to now
+                entry = {'token': token, 'created': time.time()}
+                entries.append(entry)
+            entry['leased'] = False
+            entry['last_used'] = time.time()
+            return True
+        return self.update(change)
+
+    def discard(self, key, token):
+        """forgets a token the device no longer accepts"""
+        def change(tokens):
+            tokens[key] = [entry for entry in tokens.get(key, []) if entry['token'] != token]
+        self.update(change)
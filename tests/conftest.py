@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# the scripts are run from the repository root and import each other as top-level modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Fake_Axapi import FakeDevice, start_server
+
+
+@pytest.fixture
+def fake_device():
+    """the canned state served by the fake fixture, tests may change it before using the stand-in"""
+    return FakeDevice(partitions=2)
+
+
+@pytest.fixture
+def fake(fake_device):
+    """an AxAPI stand-in with two L3V partitions, yields its host:port"""
+    server = start_server(fake_device)
+    yield '127.0.0.1:' + str(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def health_check(fake):
+    """runs Health_Check.py against the stand-in with the given options and returns its report"""
+    def run(*options):
+        command = [sys.executable, os.path.join(ROOT, 'Health_Check.py'), '-d', fake, '--protocol', 'http',
+                   '-w', '0', '-r', '2', '--sample-interval', '0'] + list(options)
+        result = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, timeout=300)
+        assert result.returncode == 0, result.stdout
+        return result.stdout
+    return run
@@ -0,0 +1,160 @@
+import asyncio
+import os
+
+import pytest
+
+import Acos as acos_module
+from Acos import Acos, AcosError, ResponseCache, index_object_stats, split_clideploy
+from Acos_Async import AsyncAcos
+
+# device output in the ACOS format, for the parsers
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def test_calls_share_one_keep_alive_connection(fake):
+    device = Acos(fake, 'admin', 'a10', 0, protocol='http')
+    token = device.auth()
+    try:
+        for getter in (device.get_vrrpa, device.get_memory, device.get_hardware, device.get_disk, device.get_version):
+            getter()
+    finally:
+        device.auth_logoff(token)
+    stats = device.connection_stats()
+    device.close()
+    assert stats == {'requests': 7, 'connections': 1, 'reused': 6}
+
+
+@pytest.mark.parametrize('kind', ['server', 'service_group', 'virtual_server'])
+def test_bulk_stats_match_the_per_object_calls(fake, kind):
+    device = Acos(fake, 'admin', 'a10', 0, protocol='http')
+    token = device.auth()
+    try:
+        for partition in ('shared', 'P1'):
+            device.change_partition(partition)
+            bulk = getattr(device, 'get_slb_' + kind + '_stats_bulk')()
+            objects = getattr(device, 'get_slb_' + kind + 's')()[kind.replace('_', '-') + '-list']
+            names = [entry['name'] for entry in objects]
+            assert sorted(bulk) == sorted(names)
+            # the report sections print the bulk entry in place of the per-object response
+            for name in names:
+                assert bulk[name] == getattr(device, 'get_slb_' + kind + '_stats')(name)
+    finally:
+        device.auth_logoff(token)
+        device.close()
+
+
+def test_bulk_stats_of_an_older_release_fall_back_to_per_object_calls():
+    assert index_object_stats({'response': {'status': 'fail', 'err': {'code': 1023460352}}}, 'server') == {}
+    assert index_object_stats('', 'server') == {}
+
+
+def test_cached_response_expires_after_its_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(acos_module.time, 'monotonic', lambda: clock[0])
+    cache = ResponseCache(ttls={'vrrp-a': 10})
+    cache.put('shared', 'vrrp-a', {'vrrp-a': {}})
+    cache.put('shared', 'slb/perf/stats', {'perf': {}})
+    clock[0] += 9
+    assert cache.get('shared', 'vrrp-a') == (True, {'vrrp-a': {}})
+    # sampled endpoints are never cached
+    assert cache.get('shared', 'slb/perf/stats') == (False, None)
+    clock[0] += 1
+    assert cache.get('shared', 'vrrp-a') == (False, None)
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 0, 'entries': 0}
+
+
+def test_cache_evicts_the_least_recently_used_response():
+    cache = ResponseCache(max_entries=2)
+    cache.put('shared', 'vrrp-a', 1)
+    cache.put('shared', 'memory', 2)
+    cache.get('shared', 'vrrp-a')
+    cache.put('shared', 'disk', 3)
+    assert cache.get('shared', 'memory') == (False, None)
+    assert cache.get('shared', 'vrrp-a') == (True, 1)
+    assert cache.get('shared', 'disk') == (True, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cache_keys_on_the_partition_but_not_for_shared_only_endpoints():
+    cache = ResponseCache()
+    cache.put('P1', 'slb/server', 'P1 servers')
+    cache.put('P1', 'system/session/stats', 'sessions')
+    cache.put('P1', 'vrrp-a', {'response': {'status': 'fail'}})
+    assert cache.get('P2', 'slb/server') == (False, None)
+    assert cache.get('P2', 'system/session/stats') == (True, 'sessions')
+    # errors are never cached
+    assert cache.get('P1', 'vrrp-a') == (False, None)
+
+
+def test_refused_partition_change_keeps_the_partition(fake):
+    device = Acos(fake, 'admin', 'a10', 0, protocol='http')
+    token = device.auth()
+    try:
+        with pytest.raises(AcosError):
+            device.change_partition('missing')
+        assert device.partition == 'shared'
+        device.change_partition('P1')
+        assert device.partition == 'P1'
+    finally:
+        device.auth_logoff(token)
+        device.close()
+
+
+def test_refused_partition_change_keeps_the_partition_async(fake):
+    async def check():
+        device = AsyncAcos(fake, 'admin', 'a10', 0, protocol='http')
+        await device.open()
+        token = await device.auth()
+        try:
+            with pytest.raises(AcosError):
+                await device.change_partition('missing')
+            assert device.partition == 'shared'
+        finally:
+            await device.auth_logoff(token)
+            await device.close()
+    asyncio.run(check())
+
+
+def test_batched_clideploy_output_is_split_per_command():
+    with open(os.path.join(DATA, 'clideploy_down_reasons.txt'), newline='') as f:
+        response = {'command output': f.read()}
+    commands = ['show health down-reason 15', 'show health down-reason 31', 'show health down-reason 50']
+    outputs = split_clideploy(response, commands)
+    assert [output.split() for output in outputs] == [
+        'Reason code 15: L4 TCP port closed (RST received from the server)'.split(),
+        'Reason code 31: HTTP status code mismatch Expected: 200 Received: 503'.split(),
+        'Reason code 50: Health check timed out'.split()]
+    # a command the device didn't echo
+    assert split_clideploy(response, commands + ['show health down-reason 51']) is None
+
+
+def test_batched_clideploy_serves_the_getters_from_one_call(fake):
+    device = Acos(fake, 'admin', 'a10', 0, protocol='http')
+    calls = []
+    device.call_hooks.append(calls.append)
+    token = device.auth()
+    try:
+        device.prefetch_clideploy(['show health down-reason 15', 'show health down-reason 31'])
+        assert device.get_health_monitor_reason('31') == {'command output': 'Down reason 31: TCP connection refused'}
+        assert device.get_health_monitor_reason('15') == {'command output': 'Down reason 15: TCP connection refused'}
+        assert [record['cached'] for record in calls if record['endpoint'] == 'clideploy'] == [False, True, True]
+        assert device.batch_clideploy
+    finally:
+        device.auth_logoff(token)
+        device.close()
+
+
+def test_unsplit_clideploy_output_falls_back_to_one_call_per_command(fake, fake_device):
+    # a release that doesn't echo the commands of a batch
+    fake_device.clideploy = lambda commands, partition: '\r\n'.join(
+        fake_device.cli_output(command, partition) for command in commands)
+    device = Acos(fake, 'admin', 'a10', 0, protocol='http')
+    token = device.auth()
+    try:
+        device.prefetch_clideploy(['show health down-reason 15', 'show health down-reason 31'])
+        assert not device.batch_clideploy
+        assert device.pending_clideploy(['show health down-reason 15', 'show health down-reason 31']) == []
+        assert device.get_health_monitor_reason('31') == {'command output': 'Down reason 31: TCP connection refused'}
+    finally:
+        device.auth_logoff(token)
+        device.close()
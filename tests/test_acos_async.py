@@ -0,0 +1,71 @@
+import asyncio
+import inspect
+
+from Acos import Acos
+from Acos_Async import AsyncAcos, BlockingAcos
+
+# arguments of the getters that take one
+ARGUMENTS = {'get_slb_server_stats': ('rs-shared-1',), 'get_slb_service_group_stats': ('sg-shared-1',),
+             'get_slb_virtual_server_stats': ('vip-shared-1',), 'get_health_monitor_reason': ('15',)}
+# sampled from the wall clock, successive calls differ
+SAMPLED = ('get_performance',)
+# getters that need a partition name, they switch the session out of shared
+PARTITIONED = ('get_partition_config',)
+
+
+def getter_names():
+    return sorted(name for name, member in inspect.getmembers(Acos, inspect.isfunction) if name.startswith('get_'))
+
+
+def sync_results(address, names):
+    device = Acos(address, 'admin', 'a10', 0, protocol='http')
+    token = device.auth()
+    try:
+        return dict((name, getattr(device, name)(*ARGUMENTS.get(name, ()))) for name in names)
+    finally:
+        device.auth_logoff(token)
+        device.close()
+
+
+async def async_results(address, names):
+    device = AsyncAcos(address, 'admin', 'a10', 0, protocol='http')
+    await device.open()
+    token = await device.auth()
+    try:
+        return dict([(name, await getattr(device, name)(*ARGUMENTS.get(name, ()))) for name in names])
+    finally:
+        await device.auth_logoff(token)
+        await device.close()
+
+
+def test_every_getter_is_a_coroutine_on_async_acos():
+    for name in getter_names():
+        assert asyncio.iscoroutinefunction(getattr(AsyncAcos, name)), name
+        assert not asyncio.iscoroutinefunction(getattr(Acos, name)), name
+        assert getattr(AsyncAcos, name).__doc__ == getattr(Acos, name).__doc__
+
+
+def test_async_getters_return_what_the_sync_getters_return(fake):
+    names = [name for name in getter_names() if name not in SAMPLED + PARTITIONED]
+    expected = sync_results(fake, names)
+    assert asyncio.run(async_results(fake, names)) == expected
+    assert expected['get_partition_list'] == ['shared', 'P1', 'P2']
+    assert expected['get_slb_server_stats_bulk']['rs-shared-1'] == expected['get_slb_server_stats']
+
+
+def test_blocking_view_keeps_the_device_address(fake):
+    async def check():
+        device = AsyncAcos(fake, 'admin', 'a10', 0, protocol='http')
+        await device.open()
+        loop = asyncio.get_running_loop()
+        blocking = BlockingAcos(device, loop)
+        await loop.run_in_executor(None, blocking.auth)
+        try:
+            assert blocking.device == fake
+            vrrpa = await loop.run_in_executor(None, blocking.get_vrrpa)
+            assert vrrpa['vrrp-a']['state']['state'] == 'Active'
+            blocking.partition = 'P1'
+            assert device.partition == 'P1'
+        finally:
+            await device.close()
+    asyncio.run(check())
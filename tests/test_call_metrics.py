@@ -0,0 +1,45 @@
+import io
+
+from Call_Metrics import CallMetrics, endpoint_name, percentile
+
+
+def call(endpoint, latency, section='application_services_check', status=200, payload=None, cached=False):
+    return {'device': '10.0.0.1', 'partition': 'shared', 'section': section, 'method': 'GET',
+            'endpoint': endpoint, 'payload': payload, 'status': status, 'latency': latency, 'ttfb': latency / 2,
+            'size': 100, 'timestamp': 0.0, 'cached': cached}
+
+
+def test_object_names_are_folded_out_of_endpoints():
+    assert endpoint_name(call('slb/server/rs-web-1/stats', 0.1)) == 'slb/server/{name}/stats'
+    assert endpoint_name(call('active-partition/P1', 0.1)) == 'active-partition/{partition}'
+    down_reason = call('clideploy', 0.1, payload={'CommandList': ['show health down-reason 15']})
+    assert endpoint_name(down_reason) == 'clideploy:show health down-reason {reason}'
+    assert endpoint_name(call('vrrp-a', 0.1)) == 'vrrp-a'
+
+
+def test_nearest_rank_percentiles():
+    ordered = list(range(1, 101))
+    assert percentile(ordered, 0.50) == 50
+    assert percentile(ordered, 0.95) == 95
+    assert percentile(ordered, 0.99) == 99
+    assert percentile([], 0.5) is None
+
+
+def test_endpoint_and_section_summaries():
+    metrics = CallMetrics(top=2)
+    for n in range(1, 21):
+        metrics.record(call('slb/server/rs-' + str(n) + '/stats', n / 1000.0))
+    metrics.record(call('vrrp-a', 0.5, section=None, status=404))
+    metrics.record(call('vrrp-a', 0.0, cached=True))
+    report = metrics.report()
+    assert report['calls'] == 21 and report['cached'] == 1
+    servers = report['endpoints']['slb/server/{name}/stats']
+    assert (servers['calls'], servers['p50'], servers['p95'], servers['max']) == (20, 0.010, 0.019, 0.020)
+    assert servers['histogram']['0.005'] == 5 and servers['histogram']['0.01'] == 5
+    assert report['endpoints']['vrrp-a']['errors'] == 1
+    # calls made outside a HealthCheck method are reported as setup
+    assert report['sections']['(setup)']['slowest_endpoint'] == 'vrrp-a'
+    assert [slow['latency'] for slow in report['slowest']] == [0.5, 0.020]
+    out = io.StringIO()
+    metrics.print_report(out)
+    assert 'AxAPI calls: 21 sent, 1 served from the response cache' in out.getvalue()
@@ -0,0 +1,35 @@
+import pytest
+
+from Acos import Acos
+from Collection_Writer import CollectionWriter, index_records, load_records
+
+
+@pytest.mark.parametrize('name', ['collection.jsonl', 'collection.jsonl.gz', 'collection.msgpack'])
+def test_call_hook_records_read_back(fake, tmp_path, name):
+    path = str(tmp_path / name)
+    writer = CollectionWriter(path, 'msgpack' if name.endswith('.msgpack') else 'jsonl')
+    device = Acos(fake, 'admin', 'a10', 0, protocol='http')
+    device.call_hooks.append(writer.write)
+    token = device.auth()
+    try:
+        device.section = 'redundancy_check'
+        vrrpa = device.get_vrrpa()
+        device.get_vrrpa()
+        device.change_partition('P1')
+        reason = device.get_health_monitor_reason('15')
+    finally:
+        device.auth_logoff(token)
+        device.close()
+    writer.close()
+    records = list(load_records(path))
+    assert len(records) == writer.records == 6
+    assert [record['endpoint'] for record in records] == ['auth', 'vrrp-a', 'vrrp-a', 'active-partition/P1',
+                                                          'clideploy', 'logoff']
+    assert [record['cached'] for record in records if record['endpoint'] == 'vrrp-a'] == [False, True]
+    assert records[1]['section'] == 'redundancy_check'
+    assert records[1]['status'] == 200
+    # neither the credentials nor the session token are written
+    assert records[0]['payload'] is None and records[0]['response'] is None
+    index = index_records(records)[fake]
+    assert index[('shared', 'vrrp-a')] == vrrpa
+    assert index[('P1', 'clideploy:show health down-reason 15')] == reason
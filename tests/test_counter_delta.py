@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from Counter_Delta import CounterRates, RunningDeltas, Snapshot, compute_deltas
+from conftest import ROOT
+
+
+def servers(stats):
+    return {'server-list': [{'name': name, 'stats': values} for name, values in stats]}
+
+
+def test_only_integers_are_counters():
+    snapshot = Snapshot.from_response(servers([('rs-1', {'total-conn': 7, 'fwd-pkt': 1.9, 'rev-pkt': '5',
+                                                         'up': True})]), 0.0)
+    assert snapshot.counters == ['total-conn']
+    # the same field holding a float in another object is left out instead of being truncated
+    snapshot = Snapshot.from_response(servers([('rs-1', {'total-conn': 7}), ('rs-2', {'total-conn': 8.9})]), 0.0)
+    assert snapshot.values.tolist() == [[7], [0]]
+    assert snapshot.present.tolist() == [[True], [False]]
+
+
+def test_wraps_and_resets_are_told_apart():
+    first = Snapshot.from_response(servers([('rs-1', {'a': 2 ** 32 - 10}), ('rs-2', {'a': 5000})]), 0.0)
+    second = Snapshot.from_response(servers([('rs-1', {'a': 20}), ('rs-2', {'a': 100})]), 10.0)
+    deltas = compute_deltas([first, second])
+    assert deltas.delta[0].tolist() == [[30], [100]]
+    assert deltas.wrapped[0].tolist() == [[True], [False]]
+    assert deltas.reset[0].tolist() == [[False], [True]]
+    assert deltas.rate[0].tolist() == [[3.0], [10.0]]
+
+
+def test_running_deltas_match_the_deltas_of_the_whole_series():
+    snapshots = [Snapshot.from_response(servers([('rs-1', {'a': 10, 'b': 1})]), 0.0),
+                 Snapshot.from_response(servers([('rs-1', {'a': 15, 'b': 2}), ('rs-2', {'a': 1, 'b': 1})]), 1.0),
+                 Snapshot.from_response(servers([('rs-2', {'a': 4, 'b': 3}), ('rs-1', {'a': 3, 'b': 9})]), 3.0)]
+    running = RunningDeltas(snapshots[0])
+    for snapshot in snapshots[1:]:
+        running.add(snapshot)
+    delta, rate = compute_deltas(snapshots).total()
+    assert (running.objects, running.counters) == (['rs-1', 'rs-2'], ['a', 'b'])
+    assert running.delta.tolist() == delta.tolist() == [[8, 8], [3, 2]]
+    assert (running.wrapped, running.reset) == (0, 1)
+    assert running.top(1) == [('rs-1', 'a', 8 / 3.0, 8)]
+
+
+def test_counter_rates_keep_one_series_per_device_partition_and_endpoint():
+    rates = CounterRates()
+    for timestamp, conns in ((0.0, 10), (2.0, 30)):
+        for partition in ('shared', 'P1'):
+            rates.record({'device': '10.0.0.1', 'partition': partition, 'endpoint': 'slb/server/stats',
+                          'status': 200, 'cached': False, 'timestamp': timestamp,
+                          'response': servers([('rs-1', {'total-conn': conns})])})
+    rates.record({'device': '10.0.0.1', 'partition': 'shared', 'endpoint': 'vrrp-a', 'status': 200,
+                  'cached': False, 'timestamp': 0.0, 'response': {}})
+    assert sorted(rates.series) == [('10.0.0.1', 'P1', 'slb/server/stats'), ('10.0.0.1', 'shared', 'slb/server/stats')]
+    assert rates.series[('10.0.0.1', 'P1', 'slb/server/stats')].top(1) == [('rs-1', 'total-conn', 10.0, 20)]
+
+
+def test_collector_lists_the_counter_rates(fake, tmp_path):
+    command = [sys.executable, os.path.join(ROOT, 'Health_Check_Collector.py'), '-d', fake, '--protocol', 'http',
+               '--poll', 'get_slb_server_stats_bulk=0.2', '--duration', '1', '--counter-rates', '2',
+               '--collect-file', str(tmp_path / 'collector.jsonl')]
+    result = subprocess.run(command, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            universal_newlines=True, timeout=60)
+    assert result.returncode == 0, result.stdout
+    assert fake + ' shared slb/server/stats: ' in result.stdout
+    assert ' objects x ' in result.stdout
@@ -0,0 +1,134 @@
+import os
+from urllib.parse import quote
+
+import pytest
+
+
+def test_async_config_store_keeps_the_configs_of_the_device(health_check, fake, tmp_path):
+    store = str(tmp_path / 'configs')
+    first = health_check('--async', '--config-store', store)
+    assert 'FAILED' not in first
+    assert 'Unchanged since' not in first
+    assert quote(fake, safe='') in os.listdir(store)
+    second = health_check('--async', '--config-store', store)
+    assert second.count('Unchanged since') == 3
+
+
+def report_sections(report):
+    """the section headers of a report, which come out in the same order however the report was produced"""
+    return [line for line in report.splitlines() if line.startswith('*****')]
+
+
+def test_async_checkpoint_resumes_an_interrupted_run(health_check, fake, tmp_path):
+    checkpoint = str(tmp_path / 'checkpoint')
+    first = health_check('--async', '--checkpoint', checkpoint)
+    assert 'FAILED' not in first
+    units = os.path.join(checkpoint, quote(fake, safe=''))
+    # as if the run died in the middle of the sessions check: the P2 unit and the whole method never completed
+    os.remove(os.path.join(units, 'sessions_check@P2.json'))
+    os.remove(os.path.join(units, 'sessions_check@.json'))
+    resumed = health_check('--async', '--checkpoint', checkpoint, '--resume')
+    assert 'FAILED' not in resumed
+    assert 'Checkpoint ' + checkpoint + ': 2 units recorded,' in resumed
+    assert report_sections(resumed) == report_sections(first)
+
+
+def test_archive_indexes_the_sections_of_every_partition(health_check, fake, tmp_path):
+    from Report_Archive import extract
+    path = str(tmp_path / 'reports.gz')
+    report = health_check('--archive', path)
+    sections = list(extract(path, fake))
+    # every header of the report starts a section of its own, the ones written in the partitions included
+    headers = [line.strip('*') for line in report_sections(''.join(text for device, name, text in sections))
+               if line.strip('*')]
+    assert [name for device, name, text in sections if name is not None] == headers
+    partition = [text for device, name, text in sections
+                 if name == 'Redundancy Check::Partition::P1::show vrrp-a detail']
+    assert len(partition) == 1
+    assert 'P2' not in partition[0]
+
+
+def device_reports(report):
+    """the section headers of each device report of a run but the one naming the device, by device"""
+    headers = report_sections(report.split('Health Check Script ended')[0])
+    # every report opens with the bars around "A10 Application Devlivery Controller::AxAPIv3.0"
+    starts = [n - 1 for n, header in enumerate(headers) if 'A10 Application Devlivery Controller' in header]
+    reports = {}
+    for start, end in zip(starts, starts[1:] + [len(headers)]):
+        address = headers[start + 4].strip('*').split('::', 1)[1]
+        reports[address] = headers[start:start + 4] + headers[start + 5:end]
+    return reports
+
+
+def test_parallel_devices_write_whole_reports(health_check, fake):
+    from Fake_Axapi import FakeDevice, start_server
+    server = start_server(FakeDevice(partitions=2, latency=0.001))
+    other = '127.0.0.1:' + str(server.server_port)
+    try:
+        expected = device_reports(health_check())[fake]
+        reports = device_reports(health_check('-d', fake + ',' + other, '--workers', '2'))
+    finally:
+        server.shutdown()
+        server.server_close()
+    # no section of one device ends up in the report of the other
+    assert reports == {fake: expected, other: expected}
+
+
+def device_report(report):
+    """the report of the only device of a run, without the lines that depend on timing"""
+    report = report.split('A10 Application Devlivery Controller', 1)[1].split('AxAPI connection reuse')[0]
+    return [line for line in report.splitlines() if not line.startswith(('max lateness ms:', 'offsets:'))]
+
+
+def test_replay_reproduces_the_recorded_report(health_check, fake_device, tmp_path):
+    captures = str(tmp_path / 'captures')
+    recorded = health_check('--record', captures)
+    requests = fake_device.requests
+    replayed = health_check('--replay', captures)
+    assert fake_device.requests == requests
+    assert device_report(replayed) == device_report(recorded)
+
+
+@pytest.mark.parametrize('options', [(), ('--async',)])
+def test_failed_device_logs_off(health_check, fake_device, options):
+    # authenticated, then the partition list fails after every retry
+    fake_device.failing.add('partition')
+    report = health_check('--retries', '0', *options)
+    assert 'FAILED' in report
+    assert fake_device.sessions == {}
+
+
+def test_failed_shared_switch_is_skipped(health_check, fake_device):
+    fake_device.failing.add('active-partition/shared')
+    report = health_check('--retries', '0')
+    assert 'Partition shared skipped' in report
+    assert 'DEGRADED' in report
+
+
+def test_collection_holds_every_endpoint_the_rules_read(health_check, fake, tmp_path):
+    from Collection_Writer import index_records, load_records
+    from Rule_Engine import RuleEngine, collected_data
+    path = str(tmp_path / 'collection.jsonl')
+    report = health_check('--format', 'jsonl', '--collect-file', path)
+    # read for the rules only, the report keeps its sections
+    assert 'show system resource-usage' not in report
+    assert '::P1::show slb server' not in report
+    findings = RuleEngine().evaluate(fake, collected_data(index_records(load_records(path)), fake))
+    assert [finding for finding in findings if finding['message'].startswith('Not checked')] == []
+    # the stand-in has the first real server of every partition down
+    down = [finding['partition'] for finding in findings if finding['rule'] == 'down-servers']
+    assert sorted(down) == ['P1', 'P2', 'shared']
+
+
+def test_sessions_are_logged_off_without_the_token_cache(health_check, fake_device):
+    health_check()
+    assert fake_device.sessions == {}
+
+
+def test_token_cache_hands_the_session_to_the_next_run(health_check, fake_device, tmp_path):
+    tokens = str(tmp_path / 'tokens.json')
+    health_check('--token-cache', tokens)
+    assert len(fake_device.sessions) == 1
+    second = health_check('--token-cache', tokens)
+    assert len(fake_device.sessions) == 1
+    assert 'Token cache ' + tokens + ': 1 sessions reused, 0 authenticated' in second
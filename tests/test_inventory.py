@@ -0,0 +1,84 @@
+import datetime
+import io
+
+import pytest
+
+from Inventory import Progress, load_inventory, lpt_order
+
+YAML_INVENTORY = '''
+defaults:
+  username: monitor
+  password-env: A10_TEST_PASSWORD
+devices:
+  - device: 10.0.1.221
+    tags: [dc1, prod]
+    size: 20000
+  - device: 10.0.1.222
+    username: admin
+    password: secret
+    tags: [dc2]
+  - 10.0.1.223
+'''
+
+
+def entries(count):
+    return [{'device': '10.0.0.' + str(n), 'size': 1} for n in range(1, count + 1)]
+
+
+def finish(progress, device, seconds):
+    progress.finished({'device': device, 'status': 'OK', 'elapsed': datetime.timedelta(seconds=seconds)})
+
+
+def test_eta_shares_the_remaining_work_over_the_workers():
+    progress = Progress(entries(9), workers=4, stream=io.StringIO())
+    finish(progress, '10.0.0.1', 10)
+    # 8 devices of 10 seconds left, 4 at a time
+    assert progress.eta() == 20
+
+
+def test_eta_counts_only_the_workers_still_busy():
+    progress = Progress(entries(3), workers=8, stream=io.StringIO())
+    finish(progress, '10.0.0.1', 10)
+    assert progress.eta() == 10
+    assert 'ETA 0:00:10' in progress.stream.getvalue()
+
+
+def test_yaml_inventory_fills_in_the_defaults(tmp_path, monkeypatch):
+    monkeypatch.setenv('A10_TEST_PASSWORD', 'from-env')
+    path = tmp_path / 'fleet.yaml'
+    path.write_text(YAML_INVENTORY)
+    assert load_inventory(str(path)) == [
+        {'device': '10.0.1.221', 'username': 'monitor', 'password': 'from-env', 'tags': ['dc1', 'prod'],
+         'size': 20000.0},
+        {'device': '10.0.1.222', 'username': 'admin', 'password': 'secret', 'tags': ['dc2'], 'size': 1.0},
+        {'device': '10.0.1.223', 'username': 'monitor', 'password': 'from-env', 'tags': [], 'size': 1.0}]
+    tagged = load_inventory(str(path), tags=['prod', 'dc2'])
+    assert [entry['device'] for entry in tagged] == ['10.0.1.221', '10.0.1.222']
+
+
+def test_csv_inventory_uses_the_command_line_credentials(tmp_path):
+    path = tmp_path / 'fleet.csv'
+    path.write_text('device,username,password,password-env,tags,size\n'
+                    '10.0.1.221,,,,dc1;prod,500\n'
+                    '10.0.1.222,monitor,secret,,dc2,\n')
+    assert load_inventory(str(path), 'admin', 'a10') == [
+        {'device': '10.0.1.221', 'username': 'admin', 'password': 'a10', 'tags': ['dc1', 'prod'], 'size': 500.0},
+        {'device': '10.0.1.222', 'username': 'monitor', 'password': 'secret', 'tags': ['dc2'], 'size': 1.0}]
+
+
+@pytest.mark.parametrize('row, error', [('10.0.1.221,,,,,big', 'line 2: size must be a number'),
+                                        ('10.0.1.221,,,A10_TEST_UNSET,,', 'line 2: environment variable'),
+                                        (',admin,,,,', 'line 2: no device')])
+def test_inventory_errors_name_the_line(tmp_path, monkeypatch, row, error):
+    monkeypatch.delenv('A10_TEST_UNSET', raising=False)
+    path = tmp_path / 'fleet.csv'
+    path.write_text('device,username,password,password-env,tags,size\n' + row + '\n')
+    with pytest.raises(ValueError, match=error):
+        load_inventory(str(path))
+
+
+def test_largest_devices_start_first():
+    fleet = [{'device': 'a', 'size': 1}, {'device': 'b', 'size': 300}, {'device': 'c', 'size': 1},
+             {'device': 'd', 'size': 20}]
+    # equal sizes keep the inventory order
+    assert [entry['device'] for entry in lpt_order(fleet)] == ['b', 'd', 'a', 'c']
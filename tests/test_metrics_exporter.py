@@ -0,0 +1,86 @@
+import urllib.request
+
+import Metrics_Exporter
+from Metrics_Exporter import OpenMetricsExporter
+
+
+def record(endpoint, response, partition='shared', status=200):
+    return {'device': '10.0.0.1', 'partition': partition, 'endpoint': endpoint, 'status': status,
+            'response': response}
+
+
+def servers(*entries):
+    return {'server-list': [{'name': name, 'stats': {'total-conn': conns, 'curr-conn': 1}} for name, conns in entries]}
+
+
+def samples(text, name):
+    return sorted(line for line in text.splitlines() if line.startswith(name + '{'))
+
+
+def test_counters_and_gauges_are_typed():
+    exporter = OpenMetricsExporter()
+    exporter.record(record('slb/server/stats', servers(('rs-1', 10))))
+    exporter.record(record('system/data-cpu/stats', {'data-cpu': {'stats': {'cpu1': 12, 'cpu-count': 1}}}))
+    exporter.record(record('vrrp-a', {'vrrp-a': {}}))
+    text = exporter.render()
+    assert '# TYPE a10_slb_server_total_conn counter' in text
+    assert 'a10_slb_server_total_conn_total{device="10.0.0.1",partition="shared",name="rs-1"} 10' in text
+    assert 'a10_slb_server_curr_conn{device="10.0.0.1",partition="shared",name="rs-1"} 1' in text
+    assert 'a10_data_cpu_usage_percent{device="10.0.0.1",partition="shared",cpu="1"} 12' in text
+    assert text.endswith('# EOF\n')
+    # the 0.0.4 text format types the sample name of a counter
+    assert '# TYPE a10_slb_server_total_conn_total counter' in exporter.render(openmetrics=False)
+
+
+def test_object_stats_replace_the_object_of_the_list():
+    exporter = OpenMetricsExporter()
+    exporter.record(record('slb/server/stats', servers(('rs-1', 10), ('rs-2', 20))))
+    exporter.record(record('slb/server/rs-2/stats', {'server': {'name': 'rs-2', 'stats': {'total-conn': 25}}}))
+    exporter.record(record('slb/server/rs-3/stats', {'server': {'name': 'rs-3', 'stats': {'total-conn': 30}}},
+                           partition='P1'))
+    text = exporter.render()
+    # exported once each, rs-2 with its latest value
+    assert samples(text, 'a10_slb_server_total_conn_total') == [
+        'a10_slb_server_total_conn_total{device="10.0.0.1",partition="P1",name="rs-3"} 30',
+        'a10_slb_server_total_conn_total{device="10.0.0.1",partition="shared",name="rs-1"} 10',
+        'a10_slb_server_total_conn_total{device="10.0.0.1",partition="shared",name="rs-2"} 25']
+    assert 'name="rs-2"' not in ''.join(samples(text, 'a10_slb_server_curr_conn'))
+    # a server that left the list is no longer exported
+    exporter.record(record('slb/server/stats', servers(('rs-1', 11))))
+    assert samples(exporter.render(), 'a10_slb_server_total_conn_total') == [
+        'a10_slb_server_total_conn_total{device="10.0.0.1",partition="P1",name="rs-3"} 30',
+        'a10_slb_server_total_conn_total{device="10.0.0.1",partition="shared",name="rs-1"} 11']
+
+
+def test_failed_responses_keep_the_last_samples():
+    exporter = OpenMetricsExporter()
+    exporter.record(record('slb/server/stats', servers(('rs-1', 10))))
+    exporter.record(record('slb/server/stats', {'response': {'status': 'fail'}}, status=404))
+    assert samples(exporter.render(), 'a10_slb_server_total_conn_total') == [
+        'a10_slb_server_total_conn_total{device="10.0.0.1",partition="shared",name="rs-1"} 10']
+
+
+def test_label_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(Metrics_Exporter, 'LABEL_CACHE_SIZE', 10)
+    exporter = OpenMetricsExporter()
+    for n in range(25):
+        exporter.record(record('slb/server/stats', servers(('rs-' + str(n), n))))
+    assert len(exporter.labels) <= 10
+    assert samples(exporter.render(), 'a10_slb_server_total_conn_total') == [
+        'a10_slb_server_total_conn_total{device="10.0.0.1",partition="shared",name="rs-24"} 24']
+
+
+def test_scrape_listens_on_the_loopback_by_default():
+    exporter = OpenMetricsExporter()
+    exporter.record(record('slb/server/stats', servers(('rs-1', 10))))
+    server = exporter.serve(port=0)
+    try:
+        assert server.server_address[0] == '127.0.0.1'
+        request = urllib.request.Request('http://127.0.0.1:' + str(server.server_port) + '/metrics',
+                                         headers={'Accept': 'application/openmetrics-text'})
+        with urllib.request.urlopen(request) as response:
+            assert response.headers['Content-Type'].startswith('application/openmetrics-text')
+            assert response.read().decode() == exporter.render()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,37 @@
+import logging
+
+import pytest
+
+from Acos import AcosConnectionError, DeviceDegraded
+from Pacer import AdaptivePacer
+
+
+class SampledDevice(object):
+    """the part of Acos the pacer uses, answering the control CPU sample with response or raising it"""
+    def __init__(self, response):
+        self.response = response
+        self.logger = logging.getLogger('SampledDevice')
+
+    def get_control_cpu(self):
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+def test_busy_control_cpu_backs_off():
+    pacer = AdaptivePacer(0.0, max_wait=0.5, sample_interval=0)
+    pacer.pace(SampledDevice({'control-cpu': {'stats': {'cpu-1': 90}}}))
+    assert pacer.wait == 0.5
+
+
+def test_failed_sample_keeps_the_wait():
+    pacer = AdaptivePacer(0.0, sample_interval=0)
+    pacer.pace(SampledDevice(AcosConnectionError('10.0.0.1', 'A connection error occurred')))
+    assert pacer.wait == 0.0
+    assert pacer.decisions == 0
+
+
+def test_degraded_device_still_ends_the_run():
+    pacer = AdaptivePacer(0.0, sample_interval=0)
+    with pytest.raises(DeviceDegraded):
+        pacer.pace(SampledDevice(DeviceDegraded('10.0.0.1', 'circuit breaker open')))
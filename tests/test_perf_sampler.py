@@ -0,0 +1,39 @@
+import time
+
+from Perf_Sampler import perf_series, sample_performance
+
+
+class SlowDevice(object):
+    """answers slb/perf/stats after a fixed delay, with a counter going up by 100 per call"""
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    def get_performance(self):
+        time.sleep(self.delay)
+        self.calls += 1
+        return {'perf': {'stats': {'l4-conns-per-sec': 10, 'total-conns': 100 * self.calls}}}
+
+
+def test_samples_stay_on_the_fixed_clock():
+    series, lateness = sample_performance(SlowDevice(0.02), 5, interval=0.05)
+    offsets = [offset for offset, response in series]
+    # a sleep(interval) loop would drift by the request time on every sample, 0.08s by the last one
+    assert offsets[-1] < 4 * 0.05 + 0.02 + 0.02
+    for k, offset in enumerate(offsets):
+        # stamped at the middle of the request
+        assert k * 0.05 + 0.01 <= offset < k * 0.05 + 0.045
+    assert lateness < 0.025
+
+
+def test_counters_become_rates_and_gauges_are_kept():
+    series = [(0.0, {'perf': {'stats': {'l4-conns-per-sec': 10, 'total-conns': 100}}}),
+              (1.0, {'perf': {'stats': {'l4-conns-per-sec': 30, 'total-conns': 300}}}),
+              (2.0, {'perf': {'stats': {'l4-conns-per-sec': 20, 'total-conns': 50}}}),
+              (2.5, {'perf': {'stats': {'l4-conns-per-sec': 20, 'total-conns': 150}}})]
+    report = perf_series(series, 1.0, 0.0012)
+    assert report['values'] == {'l4-conns-per-sec': [10, 30, 20, 20]}
+    # the counter was cleared between the second and third sample
+    assert report['rates per second'] == {'total-conns': [200.0, None, 200.0]}
+    assert report['summary']['l4-conns-per-sec'] == {'min': 10, 'avg': 20.0, 'max': 30}
+    assert report['max lateness ms'] == 1.2
@@ -0,0 +1,38 @@
+import io
+
+import yaml
+
+import Report_Writer
+from Report_Writer import ReportWriter, dumps
+
+
+def test_header_keeps_the_format_of_build_section_header():
+    stream = io.StringIO()
+    ReportWriter(stream).header('Sessions Check::show system statistics:')
+    lines = stream.getvalue().splitlines()
+    assert lines == ['*' * 100, '{:*^100s}'.format('Sessions Check::show system statistics:'), '*' * 100]
+    assert lines[1].startswith('*' * 30 + 'Sessions Check')
+
+
+def test_command_output_is_written_as_a_yaml_list_of_lines():
+    body = '\r\n'.join(['!Current configuration: 1024 bytes', 'hostname adc-1', 'yes', '1024', '- dash',
+                         '# not a comment', "it's", 'slb template "web"', 'tab\there', 'exit-module', ''])
+    loaded = yaml.safe_load(dumps({'command output': body}))
+    # like pretty_print_json_as_yaml did, ! and exit-module are dropped from every line
+    assert loaded == {'command output': ['Current configuration: 1024 bytes', 'hostname adc-1', 'yes', '1024',
+                                         '- dash', '# not a comment', "it's", 'slb template "web"', 'tab\there',
+                                         '', '']}
+
+
+def test_structured_response_reads_back_in_order():
+    response = {'vrrp-a': {'state': {'state': 'Active', 'priority': 150}, 'vrid-list': [{'vrid': 0}]}}
+    text = dumps(response)
+    assert yaml.safe_load(text) == response
+    assert text.index('state') < text.index('vrid-list')
+
+
+def test_the_libyaml_emitter_is_used_when_available():
+    if hasattr(yaml, 'CSafeDumper'):
+        assert Report_Writer.Dumper is yaml.CSafeDumper
+    else:
+        assert Report_Writer.Dumper is yaml.SafeDumper
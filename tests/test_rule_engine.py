@@ -0,0 +1,10 @@
+from Rule_Engine import RuleEngine, collected_data
+
+
+def test_missing_endpoint_is_reported_not_passed():
+    data = collected_data({'10.0.0.1': {('shared', 'system/session/stats'): {'session': {'stats': {'conn_count': 1}}}}},
+                          '10.0.0.1')
+    findings = RuleEngine().evaluate('10.0.0.1', data)
+    session = [finding for finding in findings if finding['rule'] == 'session-table']
+    assert [finding['severity'] for finding in session] == ['info']
+    assert session[0]['value'] == ['system/resource-usage/oper']
@@ -0,0 +1,29 @@
+from Syslog_Analyzer import UNPARSED_SHOWN, analyze_syslog
+
+
+def syslog(lines):
+    return {'syslog': {'oper': {'lines': [{'line': line} for line in lines]}}}
+
+
+def test_templates_are_counted_once():
+    report = analyze_syslog(syslog(['Feb 26 2018 14:20:03 Error [HMON]:Server rs-shared-2 is down.',
+                                    'Feb 26 2018 14:05:12 Error [HMON]:Server rs-shared-1 is down.',
+                                    'Feb 26 2018 14:02:31 Info [SYSTEM]:The system is ready.']))
+    assert report['by severity'] == {'Error': 2}
+    assert report['templates'][0]['template'] == 'Server <*> is down.'
+    assert report['templates'][0]['first'] == 'Feb 26 2018 14:05:12'
+    assert 'unparsed' not in report
+
+
+def test_a_few_unparsed_lines_are_listed_raw():
+    lines = ['garbled', 'Feb 26 14:02:31 Error hmon: server down']
+    report = analyze_syslog(syslog(lines))
+    assert report['unparsed'] == 2
+    assert report['unparsed lines'] == lines
+
+
+def test_many_unparsed_lines_are_listed_raw():
+    lines = ['2018-02-26T14:02:31 err hmon: line ' + str(n) for n in range(UNPARSED_SHOWN + 5)]
+    report = analyze_syslog(syslog(lines))
+    assert report['unparsed'] == len(lines)
+    assert report['unparsed lines'] == lines[:UNPARSED_SHOWN]
@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+from Token_Cache import TokenCache
+
+
+def test_key_depends_on_the_credentials_and_the_file_salt(tmp_path):
+    url = 'https://10.0.0.1/axapi/v3/'
+    cache = TokenCache(str(tmp_path / 'tokens.json'))
+    key = cache.key(url, 'admin', 'a10')
+    assert key == TokenCache(str(tmp_path / 'tokens.json')).key(url, 'admin', 'a10')
+    assert key != cache.key(url, 'admin', 'changed')
+    assert key != TokenCache(str(tmp_path / 'other.json')).key(url, 'admin', 'a10')
+    credentials = key.split('|', 2)[2]
+    assert 'a10' not in credentials
+    assert credentials not in hashlib.sha256(b'admin\na10').hexdigest()
+    with open(str(tmp_path / 'tokens.json')) as f:
+        assert len(json.load(f)['salt']) == 32
+
+
+def test_unsalted_tokens_are_dropped(tmp_path):
+    path = str(tmp_path / 'tokens.json')
+    with open(path, 'w') as f:
+        json.dump({'version': 1, 'tokens': {'old': [{'token': 't', 'created': 0, 'last_used': 4e9,
+                                                     'leased': False}]}}, f)
+    cache = TokenCache(path)
+    cache.key('https://10.0.0.1/axapi/v3/', 'admin', 'a10')
+    assert cache.acquire('old') is None
+
+
+def test_released_token_is_handed_out_once(tmp_path):
+    cache = TokenCache(str(tmp_path / 'tokens.json'))
+    cache.add('key', 'token')
+    assert cache.acquire('key') is None
+    assert cache.release('key', 'token')
+    assert cache.acquire('key') == 'token'
+    assert cache.acquire('key') is None